@@ -0,0 +1,112 @@
+"""
+PostgreSQL and SQLite backends comparison
+-----------------------------------------
+
+Loads the CSV files of `data/` into a scratch PostgreSQL database and into an
+in-memory SQLite database through the same `create_db`, `table_creation` and
+`data_insertion` calls, then runs `query_1` ... `query_14` on both with
+`sql_query`, checks that the results are identical and prints the median time
+of every query.
+
+PostgreSQL returns `numeric` values such as the rounded averages as `Decimal`,
+so numbers are compared as floats.
+
+Usage:
+    python benchmarks/bench_backends.py --repeat 5
+"""
+
+# Path configuration for custom module imports
+# -----------------------------------------------------------------------
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import statistics
+import time
+from decimal import Decimal
+import pandas as pd
+
+from src import support_db
+from src import support_queries
+from src.support_backends import CSV_TABLES, SQLiteBackend
+from src.support_db import create_db, data_insertion, set_backend, sql_query, table_creation
+from src.support_queries import columns_insertion, queries_creation
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+# Scratch database, so the benchmark never touches the real one
+BENCH_DB = 'formula_one_backends'
+
+QUERIES = [f'query_{i}' for i in range(1, 15)]
+
+
+def load_data():
+    """
+    Creates the tables and inserts the CSV files in the selected backend, like the database notebook.
+    """
+    create_db(BENCH_DB)
+    table_creation([f'DROP TABLE IF EXISTS {table};' for table in ['laps', *reversed(CSV_TABLES)]] + queries_creation)
+
+    for table, file in CSV_TABLES.items():
+        columns = columns_insertion[table]
+        df = pd.read_csv(os.path.join(DATA_DIR, file)).reindex(columns=columns)
+        values = list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))});"
+        data_insertion(query, values)
+
+
+def normalize(rows: list):
+    return [tuple(float(value) if isinstance(value, Decimal) else value for value in row) for row in rows]
+
+
+def run_queries(repeat: int):
+    """
+    Runs every query without the result cache.
+
+    Parameters:
+    - repeat (int): Number of runs of every query. The median time is reported.
+
+    Returns:
+    - (dict): Median time in milliseconds and normalized rows keyed by query name.
+    """
+    report = {}
+
+    for name in QUERIES:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = sql_query(getattr(support_queries, name), use_cache=False)
+            times.append((time.perf_counter() - start) * 1000)
+
+        report[name] = {'time': statistics.median(times), 'rows': normalize(rows)}
+
+    return report
+
+
+def main(repeat: int):
+    support_db.DB_NAME = BENCH_DB
+
+    set_backend(None)
+    load_data()
+    postgres = run_queries(repeat)
+
+    set_backend(SQLiteBackend())
+    load_data()
+    sqlite = run_queries(repeat)
+
+    set_backend(None)
+
+    print(f"\n{'Query':<10}{'Rows':>6}{'PostgreSQL (ms)':>18}{'SQLite (ms)':>14}  Results")
+    for name in QUERIES:
+        same = postgres[name]['rows'] == sqlite[name]['rows']
+        print(f"{name:<10}{len(postgres[name]['rows']):>6}{postgres[name]['time']:>18.2f}{sqlite[name]['time']:>14.2f}  {'identical' if same else 'DIFFERENT'}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs of every query.')
+    args = parser.parse_args()
+
+    main(args.repeat)
@@ -0,0 +1,109 @@
+"""
+Driver of the Day parsing benchmark
+-----------------------------------
+
+Parses a saved multi-season "Driver of the Day" page with `get_df_dotd`, which
+concatenates one DataFrame per season, and with `get_df_dotd_fast`, which walks
+the tables once and builds the DataFrame at the end. Both must produce identical
+frames.
+
+The fixture is built from `data/dotd.csv`, repeating its races over several
+seasons with random winners, and wrapped in some page markup so the parser has
+more than the tables to go through. Rebuild it with `--build-fixture`.
+
+Usage:
+    python benchmarks/bench_dotd.py --repeat 5
+    python benchmarks/bench_dotd.py --build-fixture --seasons 9
+"""
+
+# Path configuration for custom module imports
+# -----------------------------------------------------------------------
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import random
+import time
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from src.support_extraction import get_df_dotd, get_df_dotd_fast, get_html_parser
+
+
+DOTD_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'dotd.csv')
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'dotd_multi_season.html')
+
+# Driver of the Day exists since 2016
+FIRST_SEASON = 2016
+
+
+def build_fixture(seasons: int, path: str = FIXTURE, seed: int = 0):
+    """
+    Builds a "Driver of the Day" page with one table per season, latest season first like the real page.
+
+    Parameters:
+    - seasons (int): Number of seasons in the page.
+    - path (str, optional): Where the page is saved. Defaults to `FIXTURE`.
+    - seed (int, optional): Seed of the random generator. Defaults to 0.
+    """
+    rng = random.Random(seed)
+    df = pd.read_csv(DOTD_CSV)
+    winners = df[['driver', 'team']].drop_duplicates().values.tolist()
+
+    blocks = []
+    for year in range(FIRST_SEASON + seasons - 1, FIRST_SEASON - 1, -1):
+        rows = [f'<tr><th colspan="3">{year} Driver of the Day</th></tr>']
+        for race in df['race']:
+            driver, team = rng.choice(winners)
+            rows.append(f'<tr class="f1-table-row"><td class="f1-text">{race}</td>'
+                        f'<td class="f1-text"><span class="driver">{driver}</span></td>'
+                        f'<td class="f1-text">{team}</td></tr>')
+
+        # Markup around every table, like the navigation and cards of the real page
+        filler = ''.join(f'<div class="card"><a href="/en/latest/{year}/{i}">News {i}</a><p>Story {i} of {year}</p></div>' for i in range(40))
+        blocks.append(f'<section><h2>{year}</h2>{filler}<table class="f1-table"><tbody>{"".join(rows)}</tbody></table></section>')
+
+    html = f'<!DOCTYPE html><html><head><title>Awards</title><script>var config = {{}};</script></head><body>{"".join(blocks)}</body></html>'
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+    print(f"Fixture with {seasons} seasons saved in {path} ({len(html) / 1024:.0f} KB)")
+
+
+def best_of(function, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main(repeat: int):
+    with open(FIXTURE, encoding='utf-8') as f:
+        html = f.read()
+
+    legacy_time, df_legacy = best_of(lambda: get_df_dotd(BeautifulSoup(html, 'html.parser')), repeat)
+    fast_time, df_fast = best_of(lambda: get_df_dotd_fast(html), repeat)
+
+    pd.testing.assert_frame_equal(df_legacy, df_fast)
+
+    print(f"Rows: {len(df_fast)} in {df_fast['year'].nunique()} seasons. Frames are identical.")
+    print(f"get_df_dotd:      {legacy_time * 1000:>8.1f} ms (html.parser)")
+    print(f"get_df_dotd_fast: {fast_time * 1000:>8.1f} ms ({get_html_parser()}, {legacy_time / fast_time:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Runs of every parser, the best one is reported.')
+    parser.add_argument('--build-fixture', action='store_true', help='Rebuild the HTML fixture instead of running the benchmark.')
+    parser.add_argument('--seasons', type=int, default=9, help='Seasons in the rebuilt fixture.')
+    args = parser.parse_args()
+
+    if args.build_fixture:
+        build_fixture(args.seasons)
+    else:
+        main(args.repeat)
@@ -0,0 +1,137 @@
+"""
+EXPLAIN ANALYZE benchmark for the analytical queries
+----------------------------------------------------
+
+Loads the 2023 data replicated over several seasons into a scratch database, runs
+`query_2` ... `query_14` before and after applying `queries_migration`, and prints
+the median execution time of every query together with both plans.
+
+Usage:
+    python benchmarks/bench_indexes.py --seasons 30 --repeat 5
+"""
+
+# Path configuration for custom module imports
+# -----------------------------------------------------------------------
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import re
+import statistics
+import pandas as pd
+
+from src import support_db
+from src import support_queries
+from src.support_db import bulk_insertion, create_db, explain_query, table_creation
+from src.support_queries import queries_creation, queries_migration
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+# Scratch database, so the benchmark never touches the real one
+BENCH_DB = 'formula_one_bench'
+
+QUERIES = [f'query_{i}' for i in range(2, 15)]
+
+
+def build_dataset(seasons: int):
+    """
+    Replicates the 2023 season to build a multi-season dataset.
+
+    Parameters:
+    - seasons (int): Number of seasons to generate, ending in 2023.
+
+    Returns:
+    - (dict): DataFrames keyed by table name.
+    """
+    df_circuit = pd.read_csv(os.path.join(DATA_DIR, 'circuit.csv'))
+    df_drivers = pd.read_csv(os.path.join(DATA_DIR, 'drivers.csv'))
+    df_constructors = pd.read_csv(os.path.join(DATA_DIR, 'constructors.csv'))
+    df_races = pd.read_csv(os.path.join(DATA_DIR, 'races.csv'))
+    df_results = pd.read_csv(os.path.join(DATA_DIR, 'results.csv'))
+
+    races_list = []
+    results_list = []
+
+    for season in range(2023 - seasons + 1, 2024):
+        df_season = df_races.copy()
+        df_season['race_id'] = str(season) + '_' + df_season['round'].astype(str)
+        df_season['season'] = season
+        df_season['date'] = df_season['date'].str.replace('2023', str(season), n=1)
+        races_list.append(df_season)
+
+        df_season_results = df_results.copy()
+        df_season_results['race_id'] = df_season_results['race_id'].str.replace('2023', str(season), n=1)
+        results_list.append(df_season_results)
+
+    return {
+        'circuits': df_circuit,
+        'races': pd.concat(races_list),
+        'drivers': df_drivers,
+        'constructors': df_constructors,
+        'results': pd.concat(results_list)
+    }
+
+
+def run_queries(repeat: int):
+    """
+    Runs EXPLAIN ANALYZE for every benchmarked query.
+
+    Parameters:
+    - repeat (int): Number of runs of every query. The median execution time is reported.
+
+    Returns:
+    - (dict): Median execution time in milliseconds and plan lines of the last run keyed by query name.
+    """
+    report = {}
+
+    for name in QUERIES:
+        times = []
+        for _ in range(repeat):
+            plan = explain_query(getattr(support_queries, name))
+            execution = re.search(r'Execution Time: ([\d.]+) ms', plan[-1])
+            times.append(float(execution.group(1)))
+
+        report[name] = {'time': statistics.median(times), 'plan': plan}
+
+    return report
+
+
+def main(seasons: int, repeat: int):
+    support_db.DB_NAME = BENCH_DB
+    create_db(BENCH_DB)
+
+    # Start from the original schema: primary keys only and dates stored as text
+    table_creation(['DROP TABLE IF EXISTS load_log, laps, results, races, drivers, constructors, circuits CASCADE;'])
+    table_creation(queries_creation + ['ALTER TABLE races ALTER COLUMN date TYPE VARCHAR(50);'])
+
+    for table, df in build_dataset(seasons).items():
+        bulk_insertion(table, df)
+
+    table_creation([support_queries.query_analyze])
+    before = run_queries(repeat)
+
+    table_creation(queries_migration)
+    after = run_queries(repeat)
+
+    print(f"\n{'Query':<10}{'Before (ms)':>14}{'After (ms)':>14}{'Speedup':>10}")
+    for name in QUERIES:
+        speedup = before[name]['time'] / after[name]['time'] if after[name]['time'] else float('inf')
+        print(f"{name:<10}{before[name]['time']:>14.2f}{after[name]['time']:>14.2f}{speedup:>9.1f}x")
+
+    for name in QUERIES:
+        print(f"\n=== {name} ===")
+        print("--- Before ---")
+        print('\n'.join(before[name]['plan']))
+        print("--- After ---")
+        print('\n'.join(after[name]['plan']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', type=int, default=30, help='Number of seasons to generate.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs of every query.')
+    args = parser.parse_args()
+
+    main(args.seasons, args.repeat)
@@ -0,0 +1,73 @@
+"""
+Typed schema memory benchmark
+-----------------------------
+
+Builds a full-history sized dataset by replicating the 2023 season, shaped like
+the untyped output of the extraction functions (text columns as returned by the
+Ergast API), and compares its memory usage with the same frames after
+`apply_schema`.
+
+Usage:
+    python benchmarks/bench_schema.py --seasons 75
+"""
+
+# Path configuration for custom module imports
+# -----------------------------------------------------------------------
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import pandas as pd
+
+from bench_indexes import build_dataset
+from src.support_schema import apply_schema
+
+
+# Columns the extraction functions already returned as integers
+INTEGER_COLUMNS = {'results': ['position', 'grid', 'delta_pos']}
+
+
+def to_raw(df: pd.DataFrame, table: str):
+    """
+    Turns a DataFrame into the untyped shape returned by the Ergast API: text values and NaN for the missing ones.
+    """
+    raw = df.astype(str).where(df.notna(), None).astype(object)
+    raw = raw.where(raw.notna(), float('nan'))
+
+    for column in INTEGER_COLUMNS.get(table, []):
+        raw[column] = df[column]
+
+    return raw
+
+
+def main(seasons: int):
+    data = build_dataset(seasons)
+
+    # Race duration in milliseconds for the results with a time
+    results = data['results']
+    data['results'] = results.assign(time_ms=results['time'].notna().map({True: '5617736', False: float('nan')}))
+
+    total_before = total_after = 0
+    print(f"{'Table':<14}{'Rows':>8}{'Before (MB)':>14}{'After (MB)':>13}{'Saving':>9}")
+
+    for table, df in data.items():
+        raw = to_raw(df, table)
+        typed = apply_schema(raw, table)
+
+        before = raw.memory_usage(deep=True).sum()
+        after = typed.memory_usage(deep=True).sum()
+        total_before += before
+        total_after += after
+
+        print(f"{table:<14}{len(df):>8}{before / 1024 ** 2:>14.2f}{after / 1024 ** 2:>13.2f}{1 - after / before:>9.0%}")
+
+    print(f"{'Total':<14}{'':>8}{total_before / 1024 ** 2:>14.2f}{total_after / 1024 ** 2:>13.2f}{1 - total_after / total_before:>9.0%}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', type=int, default=75, help='Number of seasons to generate.')
+    args = parser.parse_args()
+
+    main(args.seasons)
@@ -0,0 +1,96 @@
+"""
+Standings tables benchmark
+--------------------------
+
+Loads the 2023 data replicated over several seasons into a scratch database, builds
+the standings tables and compares every original select query with its fast
+version: results must match and the median execution time of both is printed.
+
+Usage:
+    python benchmarks/bench_standings.py --seasons 70 --repeat 5
+"""
+
+# Path configuration for custom module imports
+# -----------------------------------------------------------------------
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import statistics
+import time
+from collections import Counter
+
+from bench_indexes import BENCH_DB, build_dataset
+from src import support_db
+from src import support_queries
+from src.support_db import bulk_insertion, create_db, refresh_standings, sql_query, table_creation
+from src.support_queries import queries_creation, queries_migration, queries_standings_creation
+
+
+QUERIES = ['query_2', 'query_3', 'query_7', 'query_8', 'query_9', 'query_13', 'query_14']
+
+
+def time_query(query: str, repeat: int):
+    """
+    Runs a query several times.
+
+    Parameters:
+    - query (str): The SQL query.
+    - repeat (int): Number of runs.
+
+    Returns:
+    - (tuple): Median wall-clock time in milliseconds and the rows of the last run.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = sql_query(query, use_cache=False)
+        times.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(times), rows
+
+
+def same_rows(query: str, rows: list, fast_rows: list):
+    """
+    Checks that two results are equivalent. Rows are compared as multisets, except for the top 10 of `query_2` where ties may pick different drivers and only the points are compared.
+    """
+    if query == 'query_2':
+        return [row[1] for row in rows] == [row[1] for row in fast_rows]
+    return Counter(rows) == Counter(fast_rows)
+
+
+def main(seasons: int, repeat: int):
+    support_db.DB_NAME = BENCH_DB
+    create_db(BENCH_DB)
+
+    table_creation(['DROP TABLE IF EXISTS load_log, driver_standings, constructor_standings, driver_totals, constructor_totals, laps, results, races, drivers, constructors, circuits CASCADE;'])
+    table_creation(queries_creation)
+
+    for table, df in build_dataset(seasons).items():
+        bulk_insertion(table, df)
+
+    table_creation(queries_migration + queries_standings_creation)
+
+    start = time.perf_counter()
+    refresh_standings()
+    print(f"Full standings refresh: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    refresh_standings(['2023_22'])
+    print(f"Incremental refresh of one race: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    print(f"\n{'Query':<10}{'Original (ms)':>15}{'Fast (ms)':>12}{'Speedup':>10}{'Same rows':>11}")
+    for name in QUERIES:
+        original_time, rows = time_query(getattr(support_queries, name), repeat)
+        fast_time, fast_rows = time_query(getattr(support_queries, f'{name}_fast'), repeat)
+        print(f"{name:<10}{original_time:>15.2f}{fast_time:>12.2f}{original_time / fast_time:>9.1f}x{str(same_rows(name, rows, fast_rows)):>11}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', type=int, default=70, help='Number of seasons to generate.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs of every query.')
+    args = parser.parse_args()
+
+    main(args.seasons, args.repeat)
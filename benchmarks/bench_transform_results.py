@@ -0,0 +1,113 @@
+"""
+transform_df_results micro-benchmark
+------------------------------------
+
+Builds a synthetic list of 25k race results, split in races of 20 drivers with some
+retirements lacking 'Time' and 'FastestLap', and compares the current
+`transform_df_results` with the previous implementation based on
+`apply(pd.Series)`. Both must produce identical frames.
+
+Usage:
+    python benchmarks/bench_transform_results.py --rows 25000
+"""
+
+# Path configuration for custom module imports
+# -----------------------------------------------------------------------
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import random
+import time
+import pandas as pd
+
+from src.support_extraction import transform_df_results
+
+
+DRIVERS_PER_RACE = 20
+
+
+def transform_df_results_legacy(results: list, race_id: str):
+    """
+    Previous implementation of `transform_df_results`, expanding every nested dictionary into a Series.
+    """
+    df = pd.DataFrame(results)
+    df.insert(1, 'race_id', race_id)
+    df['position'] = df['position'].astype(int)
+    df['grid'] = df['grid'].astype(int)
+    df['driver_id'] = df['Driver'].apply(pd.Series)['driverId']
+    df['constructor_id'] = df['Constructor'].apply(pd.Series)['constructorId']
+    df['delta_pos'] = df['grid'] - df['position']
+    df['time'] = df['Time'].apply(pd.Series)['time']
+    df.drop(columns=['number', 'Driver', 'Constructor', 'Time', 'FastestLap'], inplace=True)
+    return df
+
+
+def build_results(rows: int, seed: int = 0):
+    """
+    Builds synthetic race results shaped like the Ergast API ones.
+
+    Parameters:
+    - rows (int): Total number of results.
+    - seed (int, optional): Seed of the random generator. Defaults to 0.
+
+    Returns:
+    - (list of list): Results of every race.
+    """
+    rng = random.Random(seed)
+    races = []
+
+    for start in range(0, rows, DRIVERS_PER_RACE):
+        race = []
+        # Make sure the winner always has a time, like in real races
+        for position in range(1, min(DRIVERS_PER_RACE, rows - start) + 1):
+            result = {
+                'number': str(rng.randint(1, 99)),
+                'position': str(position),
+                'positionText': str(position),
+                'points': str(max(0, 26 - position * 2)),
+                'Driver': {'driverId': f'driver_{rng.randint(1, 40)}', 'code': 'XXX', 'givenName': 'A', 'familyName': 'B'},
+                'Constructor': {'constructorId': f'team_{rng.randint(1, 12)}', 'name': 'Team'},
+                'grid': str(rng.randint(1, 20)),
+                'laps': str(rng.randint(40, 70)),
+                'status': 'Finished'
+            }
+            if position == 1 or rng.random() < 0.7:
+                result['Time'] = {'millis': str(rng.randint(5_000_000, 7_000_000)), 'time': f'+{rng.uniform(1, 90):.3f}'}
+            else:
+                result['status'] = 'Engine'
+            if position == 1 or rng.random() < 0.8:
+                result['FastestLap'] = {'rank': str(position), 'lap': '50'}
+            race.append(result)
+        races.append(race)
+
+    return races
+
+
+def run(function, races: list):
+    start = time.perf_counter()
+    frames = [function(race, f'2023_{i}') for i, race in enumerate(races)]
+    return time.perf_counter() - start, pd.concat(frames)
+
+
+def main(rows: int):
+    races = build_results(rows)
+
+    legacy_time, df_legacy = run(transform_df_results_legacy, races)
+    current_time, df_current = run(transform_df_results, races)
+
+    # The legacy implementation did not keep the time in milliseconds
+    pd.testing.assert_frame_equal(df_legacy, df_current.drop(columns='time_ms'))
+
+    print(f"Rows: {rows} in {len(races)} races. Frames are identical.")
+    print(f"apply(pd.Series): {legacy_time * 1000:>8.1f} ms")
+    print(f"Vectorized:       {current_time * 1000:>8.1f} ms ({legacy_time / current_time:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=25000, help='Number of synthetic results.')
+    args = parser.parse_args()
+
+    main(args.rows)
@@ -0,0 +1,181 @@
+# Embedded Database Backend
+# -----------------------------------------------------------------------
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+import os
+import re
+import numpy as np
+import pandas as pd
+
+# Table definitions
+# -----------------------------------------------------------------------
+from src.support_queries import columns_insertion, queries_creation
+
+
+# Default folder of the CSV files, relative to the notebooks folder
+DATA_DIR = '../data'
+
+# CSV file of every table, in insertion order so foreign keys are satisfied
+CSV_TABLES = {
+    'circuits': 'circuit.csv',
+    'races': 'races.csv',
+    'drivers': 'drivers.csv',
+    'constructors': 'constructors.csv',
+    'results': 'results.csv'
+}
+
+# SQLite does not know numpy integers
+sqlite3.register_adapter(np.int64, int)
+sqlite3.register_adapter(np.int32, int)
+
+
+@lru_cache(maxsize=256)
+def translate_query(query: str):
+    """
+    Translates a PostgreSQL query of `support_queries` to the SQLite dialect.
+
+    Placeholders `%s` become `?` and `SERIAL` columns become `INTEGER`, which SQLite fills automatically when they are the primary key. The rest of the syntax used by the project is shared by both engines.
+
+    Parameters:
+    - query (str): The PostgreSQL query.
+
+    Returns:
+    - (str): The SQLite query.
+    """
+    query = query.replace('%s', '?')
+    return re.sub(r'\bSERIAL\b', 'INTEGER', query, flags=re.IGNORECASE)
+
+
+def _concat(*values):
+    # PostgreSQL concat skips NULL arguments
+    return ''.join(str(value) for value in values if value is not None)
+
+
+class SQLiteCursor:
+    """
+    Cursor of a `SQLiteConnection`, usable as a context manager like psycopg2 cursors.
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self._cursor = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def execute(self, query: str, params=()):
+        self._cursor.execute(translate_query(query), params or ())
+
+    def executemany(self, query: str, values):
+        self._cursor.executemany(translate_query(query), values)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+
+class SQLiteConnection:
+    """
+    Wrapper of a `sqlite3` connection exposing the subset of the psycopg2 connection interface used by `support_db`.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def cursor(self):
+        return SQLiteCursor(self._connection.cursor())
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+
+class SQLiteBackend:
+    """
+    Embedded SQLite database used by `support_db` instead of PostgreSQL, so the project runs without a database server.
+
+    Queries of `support_queries` are translated to SQLite on the fly (see `translate_query`), and a `concat` function behaving like the PostgreSQL one is registered. A single connection is shared and serialized with a lock, which also makes in-memory databases visible to every caller.
+
+    Parameters:
+    - database (str, optional): Path of the database file, or ':memory:' for an in-memory database. Defaults to ':memory:'.
+    - data_dir (str, optional): Folder with the CSV files to load when the backend is created. Defaults to None, which leaves the database as it is.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, database: str = ':memory:', data_dir: str = None):
+        self.database = database
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(database, check_same_thread=False)
+        self._connection.create_function('concat', -1, _concat, deterministic=True)
+
+        if data_dir:
+            self.load_csv(data_dir)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that yields the shared connection. Uncommitted changes are rolled back on exit.
+
+        Yields:
+        - (SQLiteConnection): The connection.
+        """
+        with self._lock:
+            try:
+                yield SQLiteConnection(self._connection)
+            finally:
+                if self._connection.in_transaction:
+                    self._connection.rollback()
+
+    def create_db(self, database_name: str):
+        """
+        Reports the database in use. SQLite creates the database file when it is opened.
+
+        Parameters:
+        - database_name (str): Ignored, kept for compatibility with `support_db.create_db`.
+        """
+        print(f"Using SQLite database {self.database}.")
+
+    def load_csv(self, data_dir: str = DATA_DIR):
+        """
+        Creates the tables and loads them from the CSV files written by the extraction notebook.
+
+        Parameters:
+        - data_dir (str, optional): Folder with the CSV files. Defaults to `DATA_DIR`.
+
+        Returns:
+        - (dict): Number of rows loaded per table.
+        """
+        loaded = {}
+
+        with self.connection() as connection:
+            with connection.cursor() as cursor:
+                for query in queries_creation:
+                    cursor.execute(query)
+
+                for table, file in CSV_TABLES.items():
+                    columns = columns_insertion[table]
+                    # Columns missing from older files are left empty
+                    df = pd.read_csv(os.path.join(data_dir, file)).reindex(columns=columns)
+                    # Missing values become NULL
+                    values = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+                    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+                    cursor.executemany(query, values)
+                    loaded[table] = len(df)
+
+            connection.commit()
+
+        return loaded
@@ -0,0 +1,323 @@
+# Resumable Multi-Season Backfill
+# -----------------------------------------------------------------------
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from tqdm import tqdm
+
+# Columnar Storage
+# -----------------------------------------------------------------------
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Project modules
+# -----------------------------------------------------------------------
+from src.support_extraction import DOTD_FIRST_SEASON, ERGAST_URL, build_df_races_results, fetch_race_results, get_df_circuit, get_df_constructors, get_df_dotd_seasons, get_df_drivers, get_number_of_races_in_season
+from src.support_schema import apply_schema
+from src.support_storage import write_atomic
+
+
+# Default folder of the backfill checkpoints, next to the CSV files
+BACKFILL_DIR = '../data/backfill'
+
+MANIFEST_FILE = '_manifest.json'
+
+# Units extracted once per season, as name -> (table, extraction function)
+SEASON_UNITS = {
+    'circuits': ('circuits', get_df_circuit),
+    'drivers': ('drivers', get_df_drivers),
+    'constructors': ('constructors', get_df_constructors)
+}
+
+# Key of every table, used to keep one row per entity when seasons are put together
+ENTITY_KEYS = {
+    'circuits': 'circuitId',
+    'drivers': 'driverId',
+    'constructors': 'constructorId'
+}
+
+# Default number of seasons extracted at once
+MAX_WORKERS = 4
+
+
+class Backfill:
+    """
+    Resumable extraction of several seasons.
+
+    Every season is split in units: its circuits, drivers, constructors, Driver of the Day awards (from `DOTD_FIRST_SEASON` on) and the results of every round. A unit is written to its own Parquet file as soon as it is extracted, and then recorded in a manifest, both atomically, so a restart skips the units already done and resumes exactly where the previous run stopped. Seasons are extracted in parallel, while the shared HTTP client of `support_http` keeps the request rate polite.
+
+    Parameters:
+    - root (str, optional): Folder of the checkpoints. Defaults to `BACKFILL_DIR`.
+    - dotd (bool, optional): Whether to scrape the Driver of the Day awards, which needs Chrome. Defaults to True.
+    - snapshot_dir (str, optional): Folder of the HTML snapshots of the Driver of the Day pages, see `get_df_dotd_seasons`. Defaults to None.
+    - base_url (str, optional): Root URL of the Ergast API. Defaults to `ERGAST_URL`.
+    """
+
+    def __init__(self, root: str = BACKFILL_DIR, dotd: bool = True, snapshot_dir: str = None, base_url: str = ERGAST_URL):
+        self.root = root
+        self.dotd = dotd
+        self.snapshot_dir = snapshot_dir
+        self.base_url = base_url
+
+        self._lock = threading.Lock()
+        self.manifest = self.read_manifest()
+
+    def read_manifest(self):
+        """
+        Reads the manifest of the checkpoints.
+
+        Returns:
+        - (dict): The manifest, with the number of rounds of every season and the units done.
+        """
+        try:
+            with open(os.path.join(self.root, MANIFEST_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'seasons': {}, 'units': {}}
+
+    def _save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+
+        def dump(tmp_path):
+            with open(tmp_path, 'w') as f:
+                json.dump(self.manifest, f, indent=2)
+
+        write_atomic(os.path.join(self.root, MANIFEST_FILE), dump)
+
+    def is_done(self, unit: str):
+        """
+        Checks whether a unit was completed and its files are still there.
+
+        Parameters:
+        - unit (str): Name of the unit, such as '2023/drivers' or '2023/round_05'.
+
+        Returns:
+        - (bool): Whether the unit can be skipped.
+        """
+        with self._lock:
+            entry = self.manifest['units'].get(unit)
+
+        return entry is not None and all(os.path.exists(os.path.join(self.root, file)) for file in entry['files'])
+
+    def _complete(self, unit: str, frames: dict, seconds: float):
+        # Write the files first, a crash before the manifest is updated only repeats the unit
+        files = []
+        for table, df in frames.items():
+            file = f"{unit}.{table}.parquet"
+            path = os.path.join(self.root, file)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+            write_atomic(path, lambda tmp_path: pq.write_table(arrow_table, tmp_path))
+            files.append(file)
+
+        rows = sum(len(df) for df in frames.values())
+
+        with self._lock:
+            self.manifest['units'][unit] = {'files': files, 'rows': rows, 'seconds': round(seconds, 3), 'completed_at': time.time()}
+            self._save_manifest()
+
+        return rows
+
+    def get_rounds(self, year: int):
+        """
+        Gets the number of rounds of a season, from the manifest when it is known.
+
+        Parameters:
+        - year (int): The season.
+
+        Returns:
+        - (int): The number of rounds.
+        """
+        with self._lock:
+            rounds = self.manifest['seasons'].get(str(year))
+
+        if rounds is None:
+            rounds = get_number_of_races_in_season(year, base_url=self.base_url)
+
+            with self._lock:
+                self.manifest['seasons'][str(year)] = rounds
+                self._save_manifest()
+
+        return rounds
+
+    def get_units(self, year: int):
+        """
+        Lists the units of a season, with the function that extracts each of them.
+
+        Parameters:
+        - year (int): The season.
+
+        Returns:
+        - (list of tuple): Name of every unit and a function returning its DataFrames keyed by table, or `None` if the extraction fails.
+        """
+        units = []
+
+        for name, (table, extract) in SEASON_UNITS.items():
+            units.append((f'{year}/{name}', lambda table=table, extract=extract: {table: extract(year, base_url=self.base_url)}))
+
+        # The award does not exist before its first season
+        if self.dotd and year >= DOTD_FIRST_SEASON:
+            units.append((f'{year}/dotd', lambda: {'dotd': get_df_dotd_seasons([year], self.snapshot_dir)}))
+
+        def extract_round(rnd):
+            race = fetch_race_results(year, rnd, base_url=self.base_url)
+            if race is None:
+                return
+
+            df_results, df_races = build_df_races_results([race[0]], [race[1]])
+            return {'results': df_results, 'races': df_races}
+
+        for rnd in range(1, self.get_rounds(year) + 1):
+            units.append((f'{year}/round_{rnd:02d}', lambda rnd=rnd: extract_round(rnd)))
+
+        return units
+
+    def run_unit(self, unit: str, extract):
+        """
+        Extracts and saves a unit, unless it is already done.
+
+        Parameters:
+        - unit (str): Name of the unit.
+        - extract (callable): Function returning the DataFrames of the unit keyed by table.
+
+        Returns:
+        - (dict): Record of the unit with its status ('done', 'skipped' or 'error'), rows and seconds.
+        """
+        year, name = unit.split('/')
+        record = {'season': int(year), 'unit': name, 'status': 'skipped', 'rows': 0, 'seconds': 0.0}
+
+        if self.is_done(unit):
+            return record
+
+        start = time.perf_counter()
+        try:
+            frames = extract()
+            # Extraction functions return None when a request fails
+            if frames is None or any(df is None for df in frames.values()):
+                raise ValueError('no data')
+
+            record['rows'] = self._complete(unit, frames, time.perf_counter() - start)
+            record['status'] = 'done'
+
+        except Exception as e:
+            record['status'] = 'error'
+            print(f"Error extracting {unit}: {e}")
+
+        record['seconds'] = round(time.perf_counter() - start, 3)
+        return record
+
+    def run(self, years, max_workers: int = MAX_WORKERS):
+        """
+        Extracts every unit of some seasons that is not done yet.
+
+        Parameters:
+        - years (int | list of int): Season year or list of season years.
+        - max_workers (int, optional): Number of seasons extracted at once. Defaults to `MAX_WORKERS`.
+
+        Returns:
+        - (pd.DataFrame): Report with one row per unit: season, unit, status, rows and seconds.
+        """
+        if isinstance(years, int):
+            years = [years]
+
+        start = time.perf_counter()
+        records = []
+
+        with tqdm(desc='Backfill', unit='unit') as progress:
+
+            def run_season(year):
+                season_records = []
+
+                try:
+                    units = self.get_units(year)
+                except Exception as e:
+                    print(f"Error listing the units of {year}: {e}")
+                    return [{'season': year, 'unit': 'rounds', 'status': 'error', 'rows': 0, 'seconds': 0.0}]
+
+                progress.total = (progress.total or 0) + len(units)
+                progress.refresh()
+
+                for unit, extract in units:
+                    season_records.append(self.run_unit(unit, extract))
+                    progress.update()
+
+                return season_records
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(run_season, year) for year in years]
+
+                for future in as_completed(futures):
+                    records.extend(future.result())
+
+        report = pd.DataFrame(records, columns=['season', 'unit', 'status', 'rows', 'seconds'])
+        report = report.sort_values(['season', 'unit'], ignore_index=True)
+
+        elapsed = time.perf_counter() - start
+        done = report[report['status'] == 'done']
+        print(f"{len(done)} units done, {(report['status'] == 'skipped').sum()} skipped, {(report['status'] == 'error').sum()} errors "
+              f"in {elapsed:.1f} s ({len(done) / elapsed if elapsed else 0:.2f} units/s, {done['rows'].sum() / elapsed if elapsed else 0:.0f} rows/s).")
+
+        return report
+
+    def load(self, years: list = None):
+        """
+        Puts together the checkpoints of the units done into one DataFrame per table.
+
+        Races and results are sorted by season and round. Circuits, drivers and constructors keep one row per entity, taken from its latest season.
+
+        Parameters:
+        - years (list of int, optional): Seasons to load. Defaults to None, which loads all of them.
+
+        Returns:
+        - (dict): DataFrames keyed by table: 'circuits', 'drivers', 'constructors', 'dotd', 'races' and 'results'.
+        """
+        with self._lock:
+            units = dict(self.manifest['units'])
+
+        frames = {}
+        # Unit names sort by season and round
+        for unit in sorted(units):
+            if years is not None and int(unit.split('/')[0]) not in years:
+                continue
+
+            for file in units[unit]['files']:
+                table = file.split('.')[-2]
+                frames.setdefault(table, []).append(pd.read_parquet(os.path.join(self.root, file)))
+
+        data = {}
+        for table, tables in frames.items():
+            # Categories differ between units, so they are set again on the whole table
+            df = pd.concat(tables, ignore_index=True)
+
+            if table in ENTITY_KEYS:
+                df = df.drop_duplicates(subset=ENTITY_KEYS[table], keep='last').reset_index(drop=True)
+
+            data[table] = apply_schema(df, table)
+
+        return data
+
+
+def run_backfill(years, root: str = BACKFILL_DIR, max_workers: int = MAX_WORKERS, dotd: bool = True, snapshot_dir: str = None):
+    """
+    Runs a resumable backfill of some seasons and puts together its checkpoints.
+
+    Parameters:
+    - years (int | list of int): Season year or list of season years.
+    - root (str, optional): Folder of the checkpoints. Defaults to `BACKFILL_DIR`.
+    - max_workers (int, optional): Number of seasons extracted at once. Defaults to `MAX_WORKERS`.
+    - dotd (bool, optional): Whether to scrape the Driver of the Day awards. Defaults to True.
+    - snapshot_dir (str, optional): Folder of the HTML snapshots of the Driver of the Day pages. Defaults to None.
+
+    Returns:
+    - (tuple): A tuple containing:
+        - dict: DataFrames keyed by table, see `Backfill.load`.
+        - pd.DataFrame: Report of the units, see `Backfill.run`.
+    """
+    backfill = Backfill(root, dotd=dotd, snapshot_dir=snapshot_dir)
+    report = backfill.run(years, max_workers=max_workers)
+
+    return backfill.load(), report
@@ -0,0 +1,291 @@
+# HTTP Response Cache
+# -----------------------------------------------------------------------
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date
+
+# Shared HTTP client
+# -----------------------------------------------------------------------
+from src.support_http import http_get
+
+
+# Default location of the cache, relative to the notebooks folder like the data and images folders
+CACHE_DIR = '../cache/http'
+
+# Default maximum size of the stored responses (500 MB)
+MAX_CACHE_SIZE = 500 * 1024 ** 2
+
+# Time to live in seconds for every class of endpoint. `None` means the entry never expires.
+DEFAULT_TTLS = {
+    'historical': None,         # Ergast data of finished seasons does not change anymore
+    'current': 60 * 60,         # Ergast data of the ongoing season
+    'wikipedia': 30 * 24 * 60 * 60,
+    'default': 24 * 60 * 60
+}
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for `requests.Response` returned when a URL is served from the cache.
+
+    Parameters:
+    - url (str): The requested URL.
+    - content (bytes): The body of the response.
+    - status_code (int, optional): HTTP status code of the stored response. Defaults to 200.
+    """
+
+    from_cache = True
+
+    def __init__(self, url: str, content: bytes, status_code: int = 200):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def endpoint_class(url: str):
+    """
+    Classifies a URL into one of the endpoint classes used to pick its time to live.
+
+    Parameters:
+    - url (str): The URL to classify.
+
+    Returns:
+    - (str): One of 'historical', 'current', 'wikipedia' or 'default'.
+    """
+    if 'wikipedia.org' in url:
+        return 'wikipedia'
+
+    season = re.search(r'/f1/(\d{4})(?:/|\.json)', url)
+    if season:
+        return 'historical' if int(season.group(1)) < date.today().year else 'current'
+
+    return 'default'
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of HTTP responses keyed by URL.
+
+    Bodies are stored once per content hash, so identical responses share the same file. An SQLite index keeps, for every URL, the hash of its body, when it was stored and when it was last read, which is used for expiration and for least recently used eviction once the cache grows over `max_size` bytes.
+
+    Parameters:
+    - cache_dir (str, optional): Folder where the cache is stored. Defaults to `CACHE_DIR`.
+    - max_size (int, optional): Maximum size in bytes of the stored bodies. Defaults to `MAX_CACHE_SIZE`.
+    - ttls (dict, optional): Time to live in seconds per endpoint class, overriding `DEFAULT_TTLS`.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_size: int = MAX_CACHE_SIZE, ttls: dict = None):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.enabled = True
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _index(self):
+        # Open the index lazily so importing the module does not touch the disk
+        if self._db is None:
+            os.makedirs(os.path.join(self.cache_dir, 'bodies'), exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(self.cache_dir, 'index.sqlite'), check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    url TEXT primary key,
+                    digest TEXT not null,
+                    size INTEGER not null,
+                    created REAL not null,
+                    last_access REAL not null
+                )""")
+            self._db.commit()
+        return self._db
+
+    def _body_path(self, digest: str):
+        return os.path.join(self.cache_dir, 'bodies', digest[:2], digest)
+
+    def get(self, url: str):
+        """
+        Looks up a URL in the cache.
+
+        Parameters:
+        - url (str): The URL to look up.
+
+        Returns:
+        - (CachedResponse | None): The stored response, or `None` if it is missing or expired.
+        """
+        with self._lock:
+            db = self._index()
+            row = db.execute("SELECT digest, created FROM entries WHERE url = ?", (url,)).fetchone()
+
+            if row:
+                digest, created = row
+                ttl = self.ttls[endpoint_class(url)]
+
+                if ttl is None or time.time() - created < ttl:
+                    try:
+                        with open(self._body_path(digest), 'rb') as f:
+                            content = f.read()
+                    except FileNotFoundError:
+                        content = None
+
+                    if content is not None:
+                        db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+                        db.commit()
+                        self.hits += 1
+                        return CachedResponse(url, content)
+
+                # Expired or broken entry
+                self._remove(url, digest)
+
+            self.misses += 1
+            return None
+
+    def put(self, url: str, content: bytes):
+        """
+        Stores the body of a successful response.
+
+        Parameters:
+        - url (str): The requested URL.
+        - content (bytes): The body of the response.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._body_path(digest)
+
+        with self._lock:
+            db = self._index()
+
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write to a temporary file first so a crash never leaves a truncated body
+                tmp_path = f'{path}.{threading.get_ident()}.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+
+            # Drop the previous body of the URL if it is refreshed with new content
+            previous = db.execute("SELECT digest FROM entries WHERE url = ?", (url,)).fetchone()
+            if previous and previous[0] != digest:
+                self._remove(url, previous[0])
+
+            now = time.time()
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", (url, digest, len(content), now, now))
+            db.commit()
+            self.stores += 1
+
+            self._evict()
+
+    def _remove(self, url: str, digest: str):
+        db = self._index()
+        db.execute("DELETE FROM entries WHERE url = ?", (url,))
+        db.commit()
+
+        # Bodies are shared between URLs with the same content
+        if not db.execute("SELECT 1 FROM entries WHERE digest = ?", (digest,)).fetchone():
+            try:
+                os.remove(self._body_path(digest))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        db = self._index()
+        total = self._total_size()
+
+        while total > self.max_size:
+            url, digest = db.execute("SELECT url, digest FROM entries ORDER BY last_access LIMIT 1").fetchone()
+            self._remove(url, digest)
+            self.evictions += 1
+            total = self._total_size()
+
+    def _total_size(self):
+        # Size of the distinct bodies, since they are shared between URLs
+        query = "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM entries)"
+        return self._index().execute(query).fetchone()[0]
+
+    def clear(self):
+        """
+        Removes every entry from the cache and resets the counters.
+        """
+        with self._lock:
+            db = self._index()
+            for url, digest in db.execute("SELECT url, digest FROM entries").fetchall():
+                self._remove(url, digest)
+
+            self.hits = self.misses = self.stores = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns usage statistics of the cache.
+
+        Returns:
+        - (dict): Hits, misses, hit rate, stores, evictions, number of entries and total size in bytes.
+        """
+        with self._lock:
+            db = self._index()
+            entries = db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            size = self._total_size()
+
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size': size
+        }
+
+
+# Cache shared by all the extraction functions
+http_cache = ResponseCache()
+
+
+def cached_get(url: str, timeout: float = None, cache: ResponseCache = None, use_cache: bool = True, offline: bool = False):
+    """
+    Performs a GET request, serving it from the response cache when possible.
+
+    Requests that miss the cache go through the shared HTTP client of `support_http`, which limits the request rate per host and retries throttled and failed requests. Only responses with a 200 status code are stored.
+
+    Parameters:
+    - url (str): The URL to request.
+    - timeout (float, optional): Timeout in seconds for the request. Defaults to None, which uses the timeout of the HTTP client.
+    - cache (ResponseCache, optional): Cache to use. Defaults to the shared `http_cache`.
+    - use_cache (bool, optional): Whether to look the URL up in the cache. When `False` the request always hits the network and the stored response is refreshed. Defaults to True.
+    - offline (bool, optional): Whether to serve the request from the cache only, for instance to replay recorded fixtures. URLs missing from the cache get an empty response with a 504 status code, like an HTTP `only-if-cached` request. Defaults to False.
+
+    Returns:
+    - (requests.Response | CachedResponse): The response of the request.
+    """
+    cache = cache or http_cache
+
+    if cache.enabled and use_cache:
+        cached = cache.get(url)
+        if cached is not None:
+            return cached
+
+    if offline:
+        return CachedResponse(url, b'', status_code=504)
+
+    response = http_get(url, timeout=timeout)
+
+    if cache.enabled and response.status_code == 200:
+        cache.put(url, response.content)
+
+    return response
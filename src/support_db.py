@@ -2,38 +2,392 @@
 # -----------------------------------------------------------------------
 import psycopg2
 from psycopg2 import OperationalError, errorcodes
+from psycopg2.pool import PoolError
+from psycopg2.extras import execute_values
 
+# Connection Pooling
+# -----------------------------------------------------------------------
+from contextlib import contextmanager
+import threading
+import time
 
-def create_db(database_name: str = 'formula_one'):
+# Bulk Loading
+# -----------------------------------------------------------------------
+import csv
+import io
+from itertools import islice
+import math
+import pandas as pd
+import uuid
+
+# Query result cache
+# -----------------------------------------------------------------------
+from src.support_query_cache import QueryCache, tables_in_query
+
+# Table definitions
+# -----------------------------------------------------------------------
+from src.support_queries import columns_insertion, queries_upsert
+from src.support_queries import (query_affected_constructors, query_affected_drivers, query_affected_since, query_refresh_constructor_standings,
+                                 query_refresh_constructor_totals, query_refresh_driver_standings, query_refresh_driver_totals)
+
+
+# Database used by the query and insertion functions
+DB_NAME = 'formula_one'
+
+# Cache of sql_query results, invalidated whenever a function of this module writes a table
+query_cache = QueryCache()
+
+# Connection parameters shared by every database
+DB_CONFIG = {
+    'user': 'my_user',
+    'password': 'admin',
+    'host': 'localhost',
+    'port': '5432'
+}
+
+# Default pool settings
+POOL_CONFIG = {
+    'minconn': 1,
+    'maxconn': 10,
+    'timeout': 30,                  # Seconds to wait for a free connection
+    'health_check_interval': 30     # Idle seconds after which a connection is checked before reuse
+}
+
+
+class ConnectionPool:
     """
-    Creates a PostgreSQL database with the provided name if it does not already exist.
+    Thread-safe pool of PostgreSQL connections to a single database.
+
+    Connections are opened lazily up to `maxconn` and kept open between calls. Once the pool is exhausted, callers wait until a connection is released or `timeout` seconds pass. Connections that have been idle for more than `health_check_interval` seconds are checked with a trivial query before being handed out, and replaced if they are broken.
 
     Parameters:
-    - database_name (str): The name of the database to be created.
+    - database (str): Name of the database to connect to.
+    - minconn (int, optional): Number of connections opened when the pool is created. Defaults to 1.
+    - maxconn (int, optional): Maximum number of open connections. Defaults to 10.
+    - timeout (float, optional): Maximum seconds to wait for a free connection. Defaults to 30.
+    - health_check_interval (float, optional): Idle seconds after which a connection is checked. Defaults to 30.
     """
-    connection = None
-    try:
-        # Establish connection to the default 'postgres' database
-        connection = psycopg2.connect(
-            database='postgres',
-            user='my_user',
-            password='admin',
-            host='localhost',
-            port='5432'
-        )
-        connection.autocommit = True  # Ensure CREATE DATABASE runs outside of a transaction block
-
-        with connection.cursor() as cursor:
-            # Check if the database already exists
-            cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", (database_name,))
-            db_exists = cursor.fetchone()
-
-            if not db_exists:
-                # Create the database if it does not exist
-                cursor.execute(f"CREATE DATABASE {database_name};")
-                print(f"Database {database_name} created successfully.")
+
+    def __init__(self, database: str, minconn: int = 1, maxconn: int = 10, timeout: float = 30, health_check_interval: float = 30):
+        self.database = database
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle = []         # List of (connection, released_at)
+        self._in_use = set()
+        self._prepared = {}     # Prepared statements of every connection: id -> {name: query}
+        self._condition = threading.Condition()
+
+        # Statistics
+        self.checkouts = 0
+        self.wait_time = 0.0
+        self.opened = 0
+        self.discarded = 0
+
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+
+    def _connect(self):
+        connection = psycopg2.connect(database=self.database, **DB_CONFIG)
+        self.opened += 1
+        return connection
+
+    @property
+    def open_connections(self):
+        return len(self._idle) + len(self._in_use)
+
+    def _is_healthy(self, connection, released_at: float):
+        if connection.closed:
+            return False
+
+        if time.monotonic() - released_at < self.health_check_interval:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _take_idle(self):
+        # Reuse idle connections, most recently released first
+        while self._idle:
+            connection, released_at = self._idle.pop()
+            if self._is_healthy(connection, released_at):
+                return connection
+            self._close(connection)
+
+        return None
+
+    def getconn(self):
+        """
+        Checks out a connection from the pool, opening a new one if needed.
+
+        Returns:
+        - (psycopg2.extensions.connection): A healthy connection.
+
+        Raises:
+        - PoolError: If no connection is released within `timeout` seconds.
+        """
+        start = time.monotonic()
+
+        with self._condition:
+            while True:
+                connection = self._take_idle()
+
+                if connection is None and self.open_connections < self.maxconn:
+                    connection = self._connect()
+
+                if connection is not None:
+                    break
+
+                # Pool exhausted, wait for a connection to be released
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    self.wait_time += time.monotonic() - start
+                    raise PoolError(f"No connection available after {self.timeout} seconds")
+
+                self._condition.wait(remaining)
+
+            self._in_use.add(connection)
+            self.checkouts += 1
+            self.wait_time += time.monotonic() - start
+
+        return connection
+
+    def putconn(self, connection, discard: bool = False):
+        """
+        Returns a connection to the pool.
+
+        Parameters:
+        - connection (psycopg2.extensions.connection): The connection checked out with `getconn`.
+        - discard (bool, optional): Whether to close the connection instead of keeping it for reuse. Defaults to False.
+        """
+        with self._condition:
+            self._in_use.discard(connection)
+
+            if not discard and not connection.closed:
+                try:
+                    # Leave the connection clean for the next caller
+                    connection.rollback()
+                    connection.autocommit = False
+                except psycopg2.Error:
+                    discard = True
+
+            if discard or connection.closed:
+                self._close(connection)
             else:
-                print("The database already exists.")
+                self._idle.append((connection, time.monotonic()))
+
+            self._condition.notify()
+
+    def prepared_statements(self, connection):
+        """
+        Returns the registry of statements prepared on a connection, which lives as long as the connection.
+
+        Parameters:
+        - connection (psycopg2.extensions.connection): A connection of the pool.
+
+        Returns:
+        - (dict): Query text of every prepared statement keyed by statement name.
+        """
+        with self._condition:
+            return self._prepared.setdefault(id(connection), {})
+
+    def _close(self, connection):
+        self._prepared.pop(id(connection), None)
+        self.discarded += 1
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+    def closeall(self):
+        """
+        Closes every idle connection of the pool. Connections in use are closed when they are returned.
+        """
+        with self._condition:
+            while self._idle:
+                connection, _ = self._idle.pop()
+                self._close(connection)
+
+    def stats(self):
+        """
+        Returns usage statistics of the pool.
+
+        Returns:
+        - (dict): Number of checkouts, accumulated and average wait time in seconds, open, idle and in use connections, and connections opened and discarded over the pool lifetime.
+        """
+        with self._condition:
+            return {
+                'checkouts': self.checkouts,
+                'wait_time': self.wait_time,
+                'avg_wait_time': self.wait_time / self.checkouts if self.checkouts else 0.0,
+                'open_connections': self.open_connections,
+                'idle_connections': len(self._idle),
+                'in_use_connections': len(self._in_use),
+                'opened': self.opened,
+                'discarded': self.discarded
+            }
+
+
+# One pool per database, created on first use
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def configure_pool(minconn: int = None, maxconn: int = None, timeout: float = None, health_check_interval: float = None):
+    """
+    Changes the settings used to create connection pools. Existing pools are closed so the new settings apply to every database.
+
+    Parameters:
+    - minconn (int, optional): Number of connections opened when a pool is created.
+    - maxconn (int, optional): Maximum number of open connections per database.
+    - timeout (float, optional): Maximum seconds to wait for a free connection.
+    - health_check_interval (float, optional): Idle seconds after which a connection is checked before reuse.
+    """
+    settings = {
+        'minconn': minconn,
+        'maxconn': maxconn,
+        'timeout': timeout,
+        'health_check_interval': health_check_interval
+    }
+    POOL_CONFIG.update({key: value for key, value in settings.items() if value is not None})
+
+    close_pools()
+
+
+def get_pool(database: str = None):
+    """
+    Returns the connection pool of a database, creating it if needed.
+
+    Parameters:
+    - database (str, optional): Name of the database. Defaults to `DB_NAME`.
+
+    Returns:
+    - (ConnectionPool): The pool of the database.
+    """
+    database = database or DB_NAME
+
+    with _pools_lock:
+        if database not in _pools:
+            _pools[database] = ConnectionPool(database, **POOL_CONFIG)
+        return _pools[database]
+
+
+def get_pool_stats():
+    """
+    Returns usage statistics of every connection pool.
+
+    Returns:
+    - (dict): Statistics of every pool keyed by database name.
+    """
+    with _pools_lock:
+        return {database: pool.stats() for database, pool in _pools.items()}
+
+
+def close_pools():
+    """
+    Closes every connection pool.
+    """
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+
+
+@contextmanager
+def pooled_connection(database: str = None, autocommit: bool = False):
+    """
+    Context manager that checks out a connection from the pool and returns it on exit.
+
+    Connections that fail with a connection level error are discarded instead of being reused.
+
+    Parameters:
+    - database (str, optional): Name of the database. Defaults to `DB_NAME`.
+    - autocommit (bool, optional): Whether to run the connection in autocommit mode. Defaults to False.
+
+    Yields:
+    - (psycopg2.extensions.connection): The checked out connection.
+    """
+    pool = get_pool(database)
+    connection = pool.getconn()
+    discard = False
+
+    try:
+        connection.autocommit = autocommit
+        yield connection
+
+    except (OperationalError, psycopg2.InterfaceError):
+        discard = True
+        raise
+
+    finally:
+        pool.putconn(connection, discard=discard)
+
+
+# Embedded backend used by create_db, table_creation, data_insertion and sql_query instead of PostgreSQL
+_backend = None
+
+
+def set_backend(backend=None):
+    """
+    Selects the database engine used by `create_db`, `table_creation`, `data_insertion` and `sql_query`.
+
+    The query result cache is cleared, since its results belong to the previous engine.
+
+    Parameters:
+    - backend (optional): Embedded backend such as `support_backends.SQLiteBackend`. Defaults to None, which goes back to PostgreSQL.
+    """
+    global _backend
+    _backend = backend
+    query_cache.clear()
+
+
+def get_backend():
+    """
+    Returns the embedded backend in use.
+
+    Returns:
+    - (SQLiteBackend | None): The backend, or `None` when PostgreSQL is used.
+    """
+    return _backend
+
+
+@contextmanager
+def backend_connection(database: str = None, autocommit: bool = False):
+    """
+    Context manager that yields a connection of the selected engine: the embedded backend if one is set, or a pooled PostgreSQL connection otherwise.
+
+    Parameters:
+    - database (str, optional): Name of the PostgreSQL database. Defaults to `DB_NAME`.
+    - autocommit (bool, optional): Whether to run the PostgreSQL connection in autocommit mode. Defaults to False.
+
+    Yields:
+    - The connection.
+    """
+    if _backend is not None:
+        with _backend.connection() as connection:
+            yield connection
+
+    else:
+        with pooled_connection(database, autocommit=autocommit) as connection:
+            yield connection
+
+
+@contextmanager
+def handle_db_errors():
+    """
+    Context manager that reports the errors of a database operation instead of raising them.
+
+    Connection errors are described by their PostgreSQL error code, and any other error is printed as unexpected. The functions of this module that use it return `None` when an error occurs.
+    """
+    try:
+        yield
 
     except OperationalError as e:
         if e.pgcode == errorcodes.INVALID_PASSWORD:
@@ -48,14 +402,33 @@ def create_db(database_name: str = 'formula_one'):
     except Exception as e:
         print(f"Unexpected error: {e}")
 
-    finally:
-        # Ensure connection closure
-        if connection:
-            try:
-                connection.close()
-                print("Database connection closed.")
-            except Exception as e:
-                print(f"Error closing connection: {e}")
+
+def create_db(database_name: str = 'formula_one'):
+    """
+    Creates a PostgreSQL database with the provided name if it does not already exist.
+
+    Parameters:
+    - database_name (str): The name of the database to be created.
+    """
+    if _backend is not None:
+        _backend.create_db(database_name)
+        return
+
+    with handle_db_errors():
+        # Use a connection to the default 'postgres' database
+        # Ensure CREATE DATABASE runs outside of a transaction block
+        with pooled_connection('postgres', autocommit=True) as connection:
+            with connection.cursor() as cursor:
+                # Check if the database already exists
+                cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", (database_name,))
+                db_exists = cursor.fetchone()
+
+                if not db_exists:
+                    # Create the database if it does not exist
+                    cursor.execute(f"CREATE DATABASE {database_name};")
+                    print(f"Database {database_name} created successfully.")
+                else:
+                    print("The database already exists.")
 
 
 def table_creation(queries: list):
@@ -65,43 +438,18 @@ def table_creation(queries: list):
     Parameters:
     - queries (list of str): List of SQL queries to execute, each defining a table structure.
     """
-    # Set connection
-    try:
-        connection = psycopg2.connect(
-            database='formula_one',
-            user='my_user',
-            password='admin',
-            host='localhost',
-            port='5432'
-        )
-
-        # Queries execution
-        with connection.cursor() as cursor:
-            for query in queries:
-                cursor.execute(query)
-        
-        # Commit the transaction
-        connection.commit()
-        print("Tables created successfully.")
+    with handle_db_errors():
+        with backend_connection() as connection:
+            # Queries execution
+            with connection.cursor() as cursor:
+                for query in queries:
+                    cursor.execute(query)
 
-    except OperationalError as e:
-        if e.pgcode == errorcodes.INVALID_PASSWORD:
-            print('Incorrect password')
-        elif e.pgcode == errorcodes.CONNECTION_EXCEPTION:
-            print('Connection error')
-        elif e.pgcode == errorcodes.INVALID_CATALOG_NAME:
-            print('Database does not exist')
-        else:
-            print(f"Database error: {e}")
-            
-    except Exception as e:
-        print(f"Unexpected error: {e}")
+            # Commit the transaction
+            connection.commit()
+            print("Tables created successfully.")
 
-    finally:
-        # Ensure connection closure
-        if connection:
-            connection.close()
-            print("Database connection closed.")
+        query_cache.invalidate(set().union(*map(tables_in_query, queries)))
 
 
 def data_insertion(query: str, values: list):
@@ -112,96 +460,388 @@ def data_insertion(query: str, values: list):
     - query (str): SQL query to execute, typically an INSERT statement with placeholders for data.
     - values (list of tuple): List of tuples containing values to insert, each tuple representing a row.
     """
-    # Set connection
-    try:
-        connection = psycopg2.connect(
-            database='formula_one',
-            user='my_user',
-            password='admin',
-            host='localhost',
-            port='5432'
-        )
-
-        # Queries execution
-        with connection.cursor() as cursor:
-            cursor.executemany(query, values)
-        
-        # Commit the transaction
-        connection.commit()
-        print("Data inserted successfully.")
+    with handle_db_errors():
+        with backend_connection() as connection:
+            # Queries execution
+            with connection.cursor() as cursor:
+                cursor.executemany(query, values)
 
-    except OperationalError as e:
-        if e.pgcode == errorcodes.INVALID_PASSWORD:
-            print('Incorrect password')
-        elif e.pgcode == errorcodes.CONNECTION_EXCEPTION:
-            print('Connection error')
-        elif e.pgcode == errorcodes.INVALID_CATALOG_NAME:
-            print('Database does not exist')
-        else:
-            print(f"Database error: {e}")
-            
-    except Exception as e:
-        print(f"Unexpected error: {e}")
+            # Commit the transaction
+            connection.commit()
+            print("Data inserted successfully.")
 
-    finally:
-        # Ensure connection closure
-        if connection:
-            connection.close()
-            print("Database connection closed.")
+        query_cache.invalidate(tables_in_query(query))
 
 
-def sql_query(query: str):
+def sql_query(query: str, use_cache: bool = True):
     """
     Executes a given SQL query on a PostgreSQL database and retrieves all results.
 
+    Results are served from `query_cache` while none of the tables read by the query has been written since.
+
     Parameters:
     - query (str): The SQL query to be executed on the database.
+    - use_cache (bool, optional): Whether to use the query result cache. Defaults to True.
 
     Returns:
     - result (list of tuples | None): A list of tuples containing the query results if the execution is successful, or `None` if an error occurs.
     """
 
+    if use_cache and query_cache.enabled:
+        found, result = query_cache.get(query)
+        if found:
+            return list(result)
+
+        # Read before running the query, a write made meanwhile must make the result stale
+        versions = query_cache.versions(query)
+
     # Initialize result to avoid returning undefined variable
     result = None
-    connection = None
     
-    try:
-        # Establish the connection
-        connection = psycopg2.connect(
-            database='formula_one',
-            user='my_user',
-            password='admin',
-            host='localhost',
-            port='5432'
-        )
-
-        # Query execution
-        with connection.cursor() as cursor:
-            cursor.execute(query)
-            result = cursor.fetchall()
-        
+    with handle_db_errors():
+        with backend_connection() as connection:
+            # Query execution
+            with connection.cursor() as cursor:
+                cursor.execute(query)
+                result = cursor.fetchall()
+
         print("Query performed successfully.")
 
-    except OperationalError as e:
-        if e.pgcode == errorcodes.INVALID_PASSWORD:
-            print('Incorrect password')
-        elif e.pgcode == errorcodes.CONNECTION_EXCEPTION:
-            print('Connection error')
-        elif e.pgcode == errorcodes.INVALID_CATALOG_NAME:
-            print('Database does not exist')
-        else:
-            print(f"Database error: {e}")
-            
-    except Exception as e:
-        print(f"Unexpected error: {e}")
+        if use_cache and query_cache.enabled:
+            query_cache.put(query, result, versions=versions)
 
-    finally:
-        # Closing connection
-        if connection:
-            try:
-                connection.close()
-                print("Database connection closed.")
-            except Exception as e:
-                print(f"Error closing connection: {e}")
-
-    return result
\ No newline at end of file
+    return result
+
+
+def _iter_chunks(data, columns: list, chunk_size: int):
+    """
+    Splits a DataFrame or an iterable of rows into lists of plain Python tuples ready to be sent to the database.
+
+    Missing values are turned into `None` and integral floats into integers, since a column holding missing values is stored as float by pandas but may target an integer column.
+
+    Parameters:
+    - data (pd.DataFrame | iterable of tuple): The rows to split.
+    - columns (list of str): Columns to take from the DataFrame, in order. If the DataFrame only has some of them, such as files written before a column was added, the missing ones are left empty. If it has none of them, its columns are taken by position.
+    - chunk_size (int): Number of rows per chunk.
+
+    Yields:
+    - (list of tuple): The rows of every chunk.
+    """
+    if isinstance(data, pd.DataFrame):
+        if set(columns).issubset(data.columns):
+            data = data[columns]
+        elif set(data.columns).issubset(columns):
+            data = data.reindex(columns=columns)
+
+        for start in range(0, len(data), chunk_size):
+            chunk = data.iloc[start:start + chunk_size].astype(object)
+            chunk = chunk.where(chunk.notna(), None)
+            yield [tuple(_clean_value(value) for value in row) for row in chunk.itertuples(index=False, name=None)]
+
+    else:
+        rows = iter(data)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            yield [tuple(_clean_value(value) for value in row) for row in chunk]
+
+
+def _clean_value(value):
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if value.is_integer():
+            return int(value)
+    return value
+
+
+def get_insertion_values(df: pd.DataFrame, table: str):
+    """
+    Converts a DataFrame into the rows expected by the insertion query of a table.
+
+    Columns are taken in the order of `columns_insertion`, columns missing from older files are left empty and missing values become `None`.
+
+    Parameters:
+    - df (pd.DataFrame): The DataFrame.
+    - table (str): Name of the table, as in `columns_insertion`.
+
+    Returns:
+    - (list of tuple): The rows.
+    """
+    return [row for chunk in _iter_chunks(df, columns_insertion[table], max(len(df), 1)) for row in chunk]
+
+
+def bulk_insertion(table: str, data, method: str = 'copy', chunk_size: int = 10000, columns: list = None):
+    """
+    Loads a DataFrame or an iterable of rows into a PostgreSQL table in bulk.
+
+    With the 'copy' method rows are streamed in chunks through an in-memory CSV buffer into `COPY ... FROM STDIN`, so memory stays bounded for large loads. The 'values' method is a fallback that sends batched multi-row `INSERT ... VALUES` statements with `execute_values`. Everything is loaded in a single transaction.
+
+    Parameters:
+    - table (str): Name of the table, as in `columns_insertion`.
+    - data (pd.DataFrame | iterable of tuple): Rows to insert. DataFrames are matched by column name when possible, otherwise by position.
+    - method (str, optional): Either 'copy' or 'values'. Defaults to 'copy'.
+    - chunk_size (int, optional): Number of rows sent per chunk. Defaults to 10000.
+    - columns (list of str, optional): Columns to fill. Defaults to the columns of the table in `columns_insertion`.
+
+    Returns:
+    - (dict | None): Number of rows inserted, elapsed seconds and rows per second, or `None` if an error occurs.
+    """
+    if method not in ('copy', 'values'):
+        raise ValueError(f"Unknown method {method}. Use 'copy' or 'values'.")
+
+    columns = columns or columns_insertion[table]
+    column_list = ', '.join(columns)
+    rows = 0
+    start = time.perf_counter()
+
+    with handle_db_errors():
+        with pooled_connection() as connection:
+            with connection.cursor() as cursor:
+                for chunk in _iter_chunks(data, columns, chunk_size):
+
+                    if method == 'copy':
+                        text = io.StringIO()
+                        csv.writer(text).writerows(chunk)
+                        # Send bytes with an explicit encoding, independent of the client encoding
+                        buffer = io.BytesIO(text.getvalue().encode('utf-8'))
+                        cursor.copy_expert(f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv, ENCODING 'UTF8')", buffer)
+
+                    else:
+                        execute_values(cursor, f"INSERT INTO {table} ({column_list}) VALUES %s", chunk, page_size=chunk_size)
+
+                    rows += len(chunk)
+
+            # Commit the transaction
+            connection.commit()
+
+        query_cache.invalidate([table])
+
+        elapsed = time.perf_counter() - start
+        rows_per_second = rows / elapsed if elapsed else float('inf')
+        print(f"{rows} rows inserted into {table} in {elapsed:.2f} s ({rows_per_second:.0f} rows/s).")
+
+        return {'rows': rows, 'seconds': elapsed, 'rows_per_second': rows_per_second}
+
+
+def upsert_data(data: dict, statements: list = None, chunk_size: int = 1000):
+    """
+    Inserts or updates rows of several tables in a single transaction using the queries in `queries_upsert`.
+
+    Rows that already exist with the same values are left untouched, so only new or changed rows are written.
+
+    Parameters:
+    - data (dict): Rows to upsert keyed by table name, as DataFrames or iterables of tuples. Tables are processed in the order of the dictionary, which must respect foreign keys.
+    - statements (list of tuple, optional): Extra `(query, params)` statements executed after the upserts in the same transaction. Defaults to None.
+    - chunk_size (int, optional): Number of rows sent per statement. Defaults to 1000.
+
+    Returns:
+    - (dict | None): Number of rows inserted or updated per table, or `None` if an error occurs.
+    """
+    written = {}
+
+    with handle_db_errors():
+        with pooled_connection() as connection:
+            with connection.cursor() as cursor:
+                for table, rows in data.items():
+                    written[table] = 0
+
+                    for chunk in _iter_chunks(rows, columns_insertion[table], chunk_size):
+                        execute_values(cursor, queries_upsert[table], chunk, page_size=chunk_size)
+                        written[table] += cursor.rowcount
+
+                for query, params in statements or []:
+                    cursor.execute(query, params)
+
+            # Commit the transaction
+            connection.commit()
+            print(f"Data upserted successfully: {written}")
+
+        query_cache.invalidate(set(data).union(*(tables_in_query(query) for query, _ in statements or [])))
+
+        return written
+
+
+def explain_query(query: str, analyze: bool = True):
+    """
+    Retrieves the execution plan of a query.
+
+    Parameters:
+    - query (str): The SQL query to explain.
+    - analyze (bool, optional): Whether to actually run the query to get real timings and buffer usage (EXPLAIN ANALYZE). Defaults to True.
+
+    Returns:
+    - (list of str | None): The lines of the plan, or `None` if an error occurs.
+    """
+    options = 'ANALYZE, BUFFERS' if analyze else 'COSTS'
+
+    with handle_db_errors():
+        with pooled_connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN ({options}) {query}")
+                return [row[0] for row in cursor.fetchall()]
+
+
+def refresh_standings(race_ids: list = None):
+    """
+    Updates the standings and totals tables after some races are loaded.
+
+    Only the drivers and constructors that took part in the given races are recomputed, and only from the date of the earliest given race on, so a new race rewrites about thirty rows instead of the full tables.
+
+    Parameters:
+    - race_ids (list of str, optional): Races that were inserted or changed. Defaults to None, which refreshes every race.
+
+    Returns:
+    - (dict | None): Number of drivers and constructors refreshed, or `None` if an error occurs.
+    """
+    with handle_db_errors():
+        with pooled_connection() as connection:
+            with connection.cursor() as cursor:
+                if race_ids is None:
+                    cursor.execute("SELECT race_id FROM races;")
+                    race_ids = [row[0] for row in cursor.fetchall()]
+
+                race_ids = list(race_ids)
+
+                cursor.execute(query_affected_since, (race_ids,))
+                since = cursor.fetchone()[0]
+                cursor.execute(query_affected_drivers, (race_ids,))
+                drivers = [row[0] for row in cursor.fetchall()]
+                cursor.execute(query_affected_constructors, (race_ids,))
+                constructors = [row[0] for row in cursor.fetchall()]
+
+                cursor.execute(query_refresh_driver_standings, {'ids': drivers, 'since': since})
+                cursor.execute(query_refresh_driver_totals, {'ids': drivers})
+                cursor.execute(query_refresh_constructor_standings, {'ids': constructors, 'since': since})
+                cursor.execute(query_refresh_constructor_totals, {'ids': constructors})
+
+            # Commit the transaction
+            connection.commit()
+            print(f"Standings refreshed for {len(drivers)} drivers and {len(constructors)} constructors.")
+
+        query_cache.invalidate(['driver_standings', 'constructor_standings', 'driver_totals', 'constructor_totals'])
+
+        return {'drivers': len(drivers), 'constructors': len(constructors)}
+
+
+# Pandas dtypes for the PostgreSQL type codes returned in cursor descriptions
+PG_DTYPES = {
+    16: 'boolean',                                  # bool
+    20: 'Int64', 21: 'Int16', 23: 'Int32',          # int8, int2, int4
+    700: 'float32', 701: 'float64', 1700: 'float64',  # float4, float8, numeric
+    1082: 'datetime64[ns]', 1114: 'datetime64[ns]',   # date, timestamp
+    18: 'string', 19: 'string', 25: 'string', 1042: 'string', 1043: 'string'  # char, name, text, bpchar, varchar
+}
+
+
+def _rows_to_df(rows: list, description):
+    """
+    Builds a DataFrame out of fetched rows, naming and typing the columns from the cursor description so that every chunk of a query gets the same dtypes.
+    """
+    columns = [column.name for column in description]
+    df = pd.DataFrame.from_records(rows, columns=columns)
+
+    for column, (name, type_code, *_) in zip(df.columns, description):
+        dtype = PG_DTYPES.get(type_code)
+        if dtype:
+            df[column] = df[column].astype(dtype)
+
+    return df
+
+
+def sql_query_chunks(query: str, params=None, chunksize: int = 10000):
+    """
+    Executes a SQL query with a server-side cursor and yields the results as DataFrame chunks.
+
+    Rows are transferred from the server `chunksize` at a time, so memory stays bounded regardless of the size of the result. Columns are named after the query and typed from the PostgreSQL column types.
+
+    Parameters:
+    - query (str): The SQL query to be executed on the database.
+    - params (tuple | dict, optional): Parameters bound to the placeholders of the query. Defaults to None.
+    - chunksize (int, optional): Number of rows per chunk. Defaults to 10000.
+
+    Yields:
+    - (pd.DataFrame): The next chunk of results.
+    """
+    with handle_db_errors():
+        with pooled_connection() as connection:
+            # Named cursors live on the server until the transaction ends
+            with connection.cursor(name=f'sql_query_chunks_{uuid.uuid4().hex}') as cursor:
+                cursor.itersize = chunksize
+                cursor.execute(query, params)
+
+                while True:
+                    rows = cursor.fetchmany(chunksize)
+                    if not rows:
+                        break
+                    yield _rows_to_df(rows, cursor.description)
+
+
+def sql_query_df(query: str, params=None):
+    """
+    Executes a SQL query and returns the results as a single DataFrame with named and typed columns.
+
+    Parameters:
+    - query (str): The SQL query to be executed on the database.
+    - params (tuple | dict, optional): Parameters bound to the placeholders of the query. Defaults to None.
+
+    Returns:
+    - (pd.DataFrame | None): The results of the query, or `None` if an error occurs.
+    """
+    with handle_db_errors():
+        with pooled_connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(query, params)
+                return _rows_to_df(cursor.fetchall(), cursor.description)
+
+
+def sql_query_prepared(name: str, query: str, params: tuple = (), use_cache: bool = True):
+    """
+    Executes a parameterized SQL query as a server-side prepared statement.
+
+    The query, written with $1, $2, ... placeholders, is prepared once per pooled connection under `name` and then only executed with the bound parameters, so running it for many drivers or races plans it once. Results go through `query_cache` like `sql_query`.
+
+    Parameters:
+    - name (str): Name of the prepared statement, such as the keys of `queries_prepared`.
+    - query (str): The SQL query with $1, $2, ... placeholders.
+    - params (tuple, optional): Values bound to the placeholders, in order. Defaults to ().
+    - use_cache (bool, optional): Whether to use the query result cache. Defaults to True.
+
+    Returns:
+    - result (list of tuples | None): A list of tuples containing the query results if the execution is successful, or `None` if an error occurs.
+    """
+    params = tuple(params)
+
+    if use_cache and query_cache.enabled:
+        found, result = query_cache.get(query, params)
+        if found:
+            return list(result)
+
+        versions = query_cache.versions(query)
+
+    result = None
+
+    with handle_db_errors():
+        with pooled_connection() as connection:
+            prepared = get_pool().prepared_statements(connection)
+
+            with connection.cursor() as cursor:
+                # Prepare the statement the first time it is used on this connection
+                if prepared.get(name) != query:
+                    if name in prepared:
+                        cursor.execute(f"DEALLOCATE {name}")
+                        del prepared[name]
+                    cursor.execute(f"PREPARE {name} AS {query.strip().rstrip(';')}")
+                    prepared[name] = query
+
+                if params:
+                    cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+                else:
+                    cursor.execute(f"EXECUTE {name}")
+                result = cursor.fetchall()
+
+        if use_cache and query_cache.enabled:
+            query_cache.put(query, result, params, versions)
+
+    return result
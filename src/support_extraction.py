@@ -4,74 +4,220 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
+from bs4 import BeautifulSoup, SoupStrainer
 
 # Utility and Helper Libraries
 # -----------------------------------------------------------------------
-from time import sleep
-import random
+import numpy as np
 import pandas as pd
 import re
 import requests
 from tqdm import tqdm
+import os
+from urllib.parse import quote, unquote, urljoin, urlsplit
+
+# Shared response cache
+# -----------------------------------------------------------------------
+from src.support_cache import ResponseCache, cached_get
+from src.support_schema import SCHEMA, apply_schema
+
+# Shared FastF1 session provider
+# -----------------------------------------------------------------------
+from src.support_sessions import get_session
+
+# Concurrency
+# -----------------------------------------------------------------------
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+
+
+# Root of the Ergast API. Can be pointed to a local server for testing.
+ERGAST_URL = 'http://ergast.com/api/f1'
+
+# Maximum number of results per page accepted by the Ergast API
+ERGAST_PAGE_LIMIT = 1000
+
+# Formula 1 awards page, which links to the "Driver of the Day" page of every season
+DOTD_URL = "https://www.formula1.com/en/results/awards"
+# The "Driver of the Day" award was introduced in 2016
+DOTD_FIRST_SEASON = 2016
+DOTD_COOKIES_IFRAME = '//*[@id="sp_message_iframe_1149950"]'
+DOTD_COOKIES_BUTTON = '#notice > div.message-component.message-row.unstack > button.message-component.message-button.no-children.focusable.sp_choice_type_11'
+
+# Root of the English Wikipedia, where the circuit pages live
+WIKIPEDIA_ROOT = 'https://en.wikipedia.org'
 
 
-def get_dotd(current_year = '2024'):
+class DotdScraper:
     """
-    Fetches and returns the HTML content of the "Driver of the Day" page.
+    Browser session on the Formula 1 "Driver of the Day" page, reused to scrape many seasons.
 
-    This function uses a web driver to navigate to the Formula 1 "Driver of the Day" page. It handles cookie acceptance by interacting with the cookie iframe, navigates to the desired section, and retrieves the HTML content of the page.
+    The browser is only launched when the first season has to be scraped, and cookies are accepted once per session. Every step waits explicitly for the element it needs instead of sleeping a fixed time. Use it as a context manager so the browser is always closed.
 
     Parameters:
-    - current_year (str, optional): Year for which to retrieve the "Driver of the Day" page content. Default is '2024' but it should be current year since it's the only way to get into the data.
-
-    Returns:
-    - BeautifulSoup or None: Parsed HTML content of the "Driver of the Day" page if successful, otherwise `None` if an error occurs.
+    - headless (bool, optional): Whether to run the browser without a window. Defaults to True.
+    - timeout (float, optional): Maximum seconds to wait for every element of the page. Defaults to 10.
     """
 
-    url = "https://www.formula1.com/en/results/awards"
+    def __init__(self, headless: bool = True, timeout: float = 10):
+        self.headless = headless
+        self.timeout = timeout
+        self.driver = None
 
-    # Open browser and get url
-    driver = webdriver.Chrome()
+    def __enter__(self):
+        return self
 
-    try:
-        driver.get(url)
-        driver.maximize_window()
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        """
+        Launches the browser, opens the page and accepts cookies, unless the session is already started.
+        """
+        if self.driver is not None:
+            return
+
+        options = Options()
+        if self.headless:
+            options.add_argument('--headless=new')
+            options.add_argument('--window-size=1920,1080')
+        # Do not wait for images and other resources, only for the document
+        options.page_load_strategy = 'eager'
 
-        sleep(random.uniform(1,2))
+        self.driver = webdriver.Chrome(options=options)
+        if not self.headless:
+            self.driver.maximize_window()
 
-        # We need to locate an iframe to accept cookies
-        iframe = WebDriverWait(driver, 10).until(EC.presence_of_element_located(('xpath', '//*[@id="sp_message_iframe_1149950"]')))
-        driver.switch_to.frame(iframe)
-        # Accept cookies
+        self.driver.get(DOTD_URL)
+        self._accept_cookies()
+
+    def _accept_cookies(self):
         try:
-            driver.find_element('css selector', '#notice > div.message-component.message-row.unstack > button.message-component.message-button.no-children.focusable.sp_choice_type_11').click()
-        except Exception as e:
+            # The cookies banner lives in an iframe
+            WebDriverWait(self.driver, self.timeout).until(EC.frame_to_be_available_and_switch_to_it(('xpath', DOTD_COOKIES_IFRAME)))
+            WebDriverWait(self.driver, self.timeout).until(EC.element_to_be_clickable(('css selector', DOTD_COOKIES_BUTTON))).click()
+        except TimeoutException as e:
             print("Can't find cookies:", e)
+        finally:
+            # Come back to default content
+            self.driver.switch_to.default_content()
 
-        # Come back to default content
-        driver.switch_to.default_content()
+    def get_page_source(self, year):
+        """
+        Opens the "Driver of the Day" page of a season and returns its HTML content.
 
-        # Go to driver of the day page
-        sleep(random.uniform(1,2))
-        driver.find_element(By.XPATH, f"//p[text()='Driver of the Day {current_year}']").click()
+        Parameters:
+        - year (int | str): Season year.
 
-        # Get content
-        sleep(random.uniform(1,2))
-        page_source = driver.page_source
+        Returns:
+        - (str): HTML content of the page.
+        """
+        self.start()
+        link_xpath = f"//p[text()='Driver of the Day {year}']"
+
+        # Go back to the awards page if the link is not in the current one
+        if not self.driver.find_elements(By.XPATH, link_xpath):
+            self.driver.get(DOTD_URL)
+
+        wait = WebDriverWait(self.driver, self.timeout)
+        link = wait.until(EC.element_to_be_clickable((By.XPATH, link_xpath)))
+        current_url = self.driver.current_url
+        link.click()
+
+        # Wait until the season page replaces the awards page and its table is rendered
+        wait.until(EC.any_of(EC.staleness_of(link), EC.url_changes(current_url)))
+        wait.until(EC.presence_of_element_located((By.XPATH, f"//table[.//th[starts-with(normalize-space(.), '{year}')]]")))
+
+        return self.driver.page_source
+
+    def close(self):
+        """
+        Closes the browser, if it was launched.
+        """
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+
+def get_dotd(current_year = '2024', snapshot: str = None, headless: bool = False):
+    """
+    Fetches and returns the HTML content of the "Driver of the Day" page.
+
+    This function uses a web driver to navigate to the Formula 1 "Driver of the Day" page. It handles cookie acceptance by interacting with the cookie iframe, navigates to the desired section, and retrieves the HTML content of the page. When a static HTML snapshot of the page is given, it is read instead and no browser is launched.
+
+    Parameters:
+    - current_year (str, optional): Year for which to retrieve the "Driver of the Day" page content. Default is '2024' but it should be current year since it's the only way to get into the data.
+    - snapshot (str, optional): Path of a saved HTML copy of the page. Defaults to None.
+    - headless (bool, optional): Whether to run the browser without a window. Defaults to False.
+
+    Returns:
+    - BeautifulSoup or None: Parsed HTML content of the "Driver of the Day" page if successful, otherwise `None` if an error occurs.
+    """
+    if snapshot:
+        with open(snapshot, encoding='utf-8') as f:
+            return BeautifulSoup(f.read(), 'html.parser')
+
+    try:
+        with DotdScraper(headless=headless) as scraper:
+            page_source = scraper.get_page_source(current_year)
         soup = BeautifulSoup(page_source, 'html.parser')
 
     except Exception as e:
         print("An error occurred while trying to scrape the page:", e)
         soup = None
 
-    finally:
-        # Close driver
-        driver.close()
-
     return soup
 
 
+def get_df_dotd_seasons(years, snapshot_dir: str = None, headless: bool = True):
+    """
+    Scrapes the "Driver of the Day" data of many seasons with a single browser session.
+
+    Seasons with a saved snapshot `dotd_{year}.html` in `snapshot_dir` are read from it, and the others are scraped and saved there, so the browser is not launched at all when every season has its snapshot.
+
+    Parameters:
+    - years (list of int): Season years to get.
+    - snapshot_dir (str, optional): Folder with the HTML snapshots of the seasons. Defaults to None, which always scrapes and saves nothing.
+    - headless (bool, optional): Whether to run the browser without a window. Defaults to True.
+
+    Returns:
+    - pd.DataFrame: DataFrame like the one of `get_df_dotd`, with the rows of the requested seasons in the given order.
+    """
+    frames = []
+
+    with DotdScraper(headless=headless) as scraper:
+        for year in tqdm(years):
+            path = os.path.join(snapshot_dir, f'dotd_{year}.html') if snapshot_dir else None
+
+            if path and os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    html = f.read()
+
+            else:
+                try:
+                    html = scraper.get_page_source(year)
+                except Exception as e:
+                    print(f"An error occurred while trying to scrape season {year}:", e)
+                    continue
+
+                if path:
+                    os.makedirs(snapshot_dir, exist_ok=True)
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(html)
+
+            # Pages may contain the tables of other seasons too
+            df = get_df_dotd_fast(html)
+            frames.append(df[df['year'] == int(year)])
+
+    if not frames:
+        return
+
+    # Categories of every season are merged again
+    return apply_schema(pd.concat(frames, ignore_index=True), 'dotd')
+
+
 def get_df_dotd(soup: BeautifulSoup):
     """
     Parses HTML content to extract race data and returns a formatted DataFrame.
@@ -118,30 +264,99 @@ def get_df_dotd(soup: BeautifulSoup):
     df_final['year'] = df_final['year'].astype(int)
     df_final['race_id'] = df_final['year'].astype(str) + '_' + df_final['round'].astype(str)
 
-    return df_final
+    return apply_schema(df_final, 'dotd')
 
 
-def get_add_circuit_info(url: str):
+def get_html_parser():
     """
-    Fetches and extracts specific information about a circuit from a given URL.
+    Returns the fastest HTML parser available for BeautifulSoup.
+
+    Returns:
+    - (str): 'lxml' if it is installed, otherwise the built-in 'html.parser'.
+    """
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+
+def get_df_dotd_fast(html):
+    """
+    Parses the "Driver of the Day" page and returns the same DataFrame as `get_df_dotd`, faster.
+
+    When raw HTML is given, only the tables are parsed, using the fastest parser available. Tables are walked once collecting plain Python lists, and the DataFrame is built once at the end instead of concatenating one DataFrame per season.
 
     Parameters:
-    - url (str): The URL of the web page to scrape for circuit information.
+    - html (str | bytes | BeautifulSoup): HTML content of the page, or the page already parsed.
 
     Returns:
-    - (tuple): A tuple containing:
-        - capacity (str): The seating capacity of the circuit or 'NA' if not found.
-        - website (str): The official website of the circuit or 'NA' if not found.
-        - architect (str): The name of the architect or 'NA' if not found.
+    - pd.DataFrame: DataFrame with columns 'round', 'race', 'driver', 'team', 'year' and 'race_id', containing race data across multiple seasons.
     """
-    response = requests.get(url)
+    if isinstance(html, BeautifulSoup):
+        soup = html
+    else:
+        soup = BeautifulSoup(html, get_html_parser(), parse_only=SoupStrainer('table'))
 
-    if response.status_code == 200:
-        soup = BeautifulSoup(response.content, 'html.parser')
+    rounds = []
+    rows = []
+    years = []
 
-    else:
-        print(f"Error: {response.status_code}")
-        return
+    # Latest tables go first, like in get_df_dotd
+    for table in reversed(soup.find_all("table")):
+        year = int(re.match(r'\d+', table.find("th").text).group())
+
+        for rnd, race in enumerate(table.find_all("tr")):
+            # The first row of every table is the header
+            if rnd == 0:
+                continue
+
+            rows.append([value.text for value in race.find_all("td")])
+            rounds.append(rnd)
+            years.append(year)
+
+    df = pd.DataFrame(rows).rename(columns={0: 'race', 1: 'driver', 2: 'team'})
+    df.insert(0, 'round', rounds)
+    df['year'] = years
+    df['race_id'] = df['year'].astype(str) + '_' + df['round'].astype(str)
+
+    return apply_schema(df, 'dotd')
+
+
+def canonical_wiki_url(url: str):
+    """
+    Normalizes a Wikipedia URL so that every spelling of the same page gets the same URL.
+
+    Relative links are resolved against `WIKIPEDIA_ROOT`, Wikipedia pages are requested over https from the desktop site, the title is percent-encoded consistently with spaces as underscores, and the query and fragment are removed.
+
+    Parameters:
+    - url (str): The URL or relative link to normalize.
+
+    Returns:
+    - (str): The canonical URL.
+    """
+    parts = urlsplit(urljoin(WIKIPEDIA_ROOT, url))
+    host = parts.netloc.lower().replace('.m.wikipedia.org', '.wikipedia.org')
+    scheme = 'https' if host.endswith('wikipedia.org') else parts.scheme
+    path = quote(unquote(parts.path).replace(' ', '_'), safe="/:@!$&'()*+,;=-._~")
+
+    return f'{scheme}://{host}{path}'
+
+
+def parse_circuit_page(content: bytes, parser: str = 'html.parser'):
+    """
+    Parses the Wikipedia page of a circuit.
+
+    Parameters:
+    - content (bytes): HTML content of the page.
+    - parser (str, optional): BeautifulSoup parser to use. Defaults to 'html.parser'.
+
+    Returns:
+    - (tuple): A tuple containing:
+        - (tuple | None): Capacity, website and architect of the circuit, with 'NA' for the missing ones, or `None` if the page has no circuit infobox.
+        - (str | None): When there is no infobox, the link to the page that should have it, or `None` if there is none.
+    """
+    soup = BeautifulSoup(content, parser)
 
     # Find table
     table = soup.find("table", {"class": "infobox vcard"})
@@ -171,36 +386,153 @@ def get_add_circuit_info(url: str):
                 elif text == 'architect':
                     architect = row.find("td").text
 
-        return capacity, website, architect
-    
+        return (capacity, website, architect), None
+
     # If table was not found, look for proper link
+    link = soup.find('a', string=re.compile('Circuit', re.IGNORECASE))
+    if link is None:
+        return None, None
+
+    url = link.get("href")
+    root = 'https://en.wikipedia.org'
+    # Add link root in case it's not added
+    if root not in url:
+        url = root + url
+
+    return None, url
+
+
+def get_add_circuit_info(url: str):
+    """
+    Fetches and extracts specific information about a circuit from a given URL.
+
+    Parameters:
+    - url (str): The URL of the web page to scrape for circuit information.
+
+    Returns:
+    - (tuple): A tuple containing:
+        - capacity (str): The seating capacity of the circuit or 'NA' if not found.
+        - website (str): The official website of the circuit or 'NA' if not found.
+        - architect (str): The name of the architect or 'NA' if not found.
+    """
+    response = cached_get(url)
+
+    if response.status_code == 200:
+        info, link = parse_circuit_page(response.content)
+
     else:
-        # Find link
-        url = soup.find('a', string=re.compile('Circuit', re.IGNORECASE)).get("href")
-        root = 'https://en.wikipedia.org'
-        # Add link root in case it's not added
-        if root not in url:
-            url = root + url
-
-        # Call function again with corrected link
-        return get_add_circuit_info(url)
-    
+        print(f"Error: {response.status_code}")
+        return
 
-def transform_df_circuits(df: pd.DataFrame):
+    if info:
+        return info
+
+    if link is None:
+        print(f"Circuit information not found in {url}")
+        return
+
+    # Call function again with corrected link
+    return get_add_circuit_info(link)
+
+
+# Parsed circuit information keyed by canonical URL, shared by all the batch enrichments
+circuit_info_cache = {}
+circuit_info_lock = threading.Lock()
+
+# Maximum number of links followed from a page without circuit infobox
+MAX_CIRCUIT_LINKS = 5
+
+
+def resolve_circuit_info(url: str, cache: ResponseCache = None, offline: bool = False):
+    """
+    Fetches the information of a circuit, following links from pages without circuit infobox.
+
+    Every URL of the chain is resolved once: the parsed information is stored in `circuit_info_cache` under the canonical URL of every page in the chain, so circuits linking to an already resolved page do not fetch it again.
+
+    Parameters:
+    - url (str): Wikipedia URL of the circuit.
+    - cache (ResponseCache, optional): Response cache to use. Defaults to the shared `http_cache`.
+    - offline (bool, optional): Whether to serve the pages from the response cache only. Defaults to False.
+
+    Returns:
+    - (tuple | None): Capacity, website and architect of the circuit, or `None` if they could not be found.
+    """
+    current = canonical_wiki_url(url)
+    chain = []
+    info = None
+
+    while len(chain) <= MAX_CIRCUIT_LINKS and current not in chain:
+        with circuit_info_lock:
+            if current in circuit_info_cache:
+                info = circuit_info_cache[current]
+                break
+
+        chain.append(current)
+        response = cached_get(current, timeout=10, cache=cache, offline=offline)
+
+        if response.status_code != 200:
+            print(f"Error: {response.status_code} for {current}")
+            return
+
+        info, link = parse_circuit_page(response.content, get_html_parser())
+        if info or link is None:
+            break
+
+        current = canonical_wiki_url(link)
+
+    if info is None:
+        print(f"Circuit information not found in {url}")
+        return
+
+    with circuit_info_lock:
+        for page in chain:
+            circuit_info_cache[page] = info
+
+    return info
+
+
+def get_circuits_info(urls, max_workers: int = 8, cache: ResponseCache = None, offline: bool = False):
+    """
+    Fetches the information of many circuits concurrently.
+
+    Pages are requested in parallel with a bounded pool of threads, and every distinct page is parsed once (see `resolve_circuit_info`). The request rate is limited by the shared HTTP client of `support_http`. The results are the same as calling `get_add_circuit_info` on every URL.
+
+    To work offline, record the pages once with a dedicated cache, for instance `ResponseCache('fixtures/wikipedia', ttls={'wikipedia': None})`, and replay them later passing the same cache and `offline=True`.
+
+    Parameters:
+    - urls (iterable of str): Wikipedia URLs of the circuits.
+    - max_workers (int, optional): Maximum number of concurrent requests. Defaults to 8.
+    - cache (ResponseCache, optional): Response cache to use. Defaults to the shared `http_cache`.
+    - offline (bool, optional): Whether to serve the pages from the response cache only. Defaults to False.
+
+    Returns:
+    - (dict): Capacity, website and architect tuples keyed by the given URLs, with `None` for the circuits that could not be resolved.
+    """
+    urls = list(dict.fromkeys(urls))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        infos = executor.map(lambda url: resolve_circuit_info(url, cache, offline), urls)
+        return dict(zip(urls, infos))
+
+
+def transform_df_circuits(df: pd.DataFrame, max_workers: int = 8, cache: ResponseCache = None, offline: bool = False):
     """
     Transforms the input DataFrame by extracting and formatting additional information from circuit URLs and the location column.
 
     Parameters:
     - df (pd.DataFrame): The original DataFrame containing circuit data with columns including 'url' and 'Location'.
+    - max_workers (int, optional): Maximum number of concurrent Wikipedia requests. Defaults to 8.
+    - cache (ResponseCache, optional): Response cache to use. Defaults to the shared `http_cache`.
+    - offline (bool, optional): Whether to serve the Wikipedia pages from the response cache only. Defaults to False.
 
     Returns:
     - (pd.DataFrame): The transformed DataFrame with additional columns for 'capacity', 'website', 'architect', and separate location information, while removing the original 'Location' column.
     """
     # Get additional info from circuit Wikipedia link
-    df_add_info = df['url'].apply(get_add_circuit_info).apply(pd.Series)
+    infos = get_circuits_info(df['url'], max_workers=max_workers, cache=cache, offline=offline)
+    df_add_info = pd.DataFrame([infos[url] or ('NA', 'NA', 'NA') for url in df['url']],
+                               index=df.index, columns=['capacity', 'website', 'architect'])
 
-    # Renaming columns
-    df_add_info = df_add_info.rename(columns={0: 'capacity', 1: 'website', 2: 'architect'})
     # Formatting values properly
     df_add_info['capacity'] = df_add_info['capacity'].apply(lambda x: int(re.sub(r'[^0-9]', '', re.sub(r'\[.*?\]', '', x.split('(')[0]))) if re.search(r'\d+', x) else None)
     df_add_info['website'] = df_add_info['website'].apply(lambda x: re.search(r'http[s]?://\S+|www\.\S+', x).group(0) if re.search(r'http[s]?://\S+|www\.\S+', x) else None)
@@ -217,49 +549,58 @@ def transform_df_circuits(df: pd.DataFrame):
     return df
 
 
-def get_df_circuit(year: int):
+def get_df_circuit(year: int, circuit_ids: list = None, max_workers: int = 8, base_url: str = ERGAST_URL):
     """
     Fetches circuit data for a specified Formula 1 season and returns it as a transformed DataFrame.
 
     Parameters:
     - year (int): The year of the Formula 1 season to retrieve circuit data for.
+    - circuit_ids (list of str, optional): Only enrich and return these circuits. Defaults to None, which returns every circuit of the season.
+    - max_workers (int, optional): Maximum number of concurrent Wikipedia requests. Defaults to 8.
+    - base_url (str, optional): Root URL of the Ergast API. Defaults to `ERGAST_URL`.
 
     Returns:
     - (pd.DataFrame): A DataFrame containing the transformed circuit data for the specified year.
     """
 
     # Get F1 circuit information from ergast API
-    url = f'http://ergast.com/api/f1/{str(year)}/circuits.json'
+    url = f'{base_url}/{str(year)}/circuits.json'
 
-    response = requests.get(url)
+    response = cached_get(url)
 
     if response.status_code == 200:
 
         content = response.json()
         circuits = content['MRData']['CircuitTable']['Circuits']
         df_circ = pd.DataFrame(circuits)
-        df = transform_df_circuits(df_circ)
-        return df
+
+        # Skip the Wikipedia enrichment of circuits that are not needed
+        if circuit_ids is not None:
+            df_circ = df_circ[df_circ['circuitId'].isin(circuit_ids)].reset_index(drop=True)
+
+        df = transform_df_circuits(df_circ, max_workers=max_workers)
+        return apply_schema(df, 'circuits')
 
     else:
         print(f"Error: {response.status_code}")
         return
 
 
-def get_df_drivers(year:int):
+def get_df_drivers(year:int, base_url: str = ERGAST_URL):
     """
     Fetches driver data for a specified Formula 1 season and returns it as a DataFrame with renamed columns.
 
     Parameters:
     - year (int): The year of the Formula 1 season to retrieve driver data for.
+    - base_url (str, optional): Root URL of the Ergast API. Defaults to `ERGAST_URL`.
 
     Returns:
     - (pd.DataFrame): A DataFrame containing driver data with columns 'first_name' and 'last_name'.
     """
 
-    url = f"http://ergast.com/api/f1/{str(year)}/drivers.json"
+    url = f"{base_url}/{str(year)}/drivers.json"
 
-    response = requests.get(url)
+    response = cached_get(url)
 
     if response.status_code == 200:
 
@@ -267,34 +608,35 @@ def get_df_drivers(year:int):
         drivers = content['MRData']['DriverTable']['Drivers']
         df_drivers = pd.DataFrame(drivers)
         df_drivers.rename(columns={'givenName': 'first_name', 'familyName': 'last_name'}, inplace=True)
-        return df_drivers
+        return apply_schema(df_drivers, 'drivers')
 
     else:
         print(f"Error: {response.status_code}")
         return
     
 
-def get_df_constructors(year:int):
+def get_df_constructors(year:int, base_url: str = ERGAST_URL):
     """
     Fetches constructor data for a specified Formula 1 season and returns it as a DataFrame.
 
     Parameters:
     - year (int): The year of the Formula 1 season to retrieve constructor data for.
+    - base_url (str, optional): Root URL of the Ergast API. Defaults to `ERGAST_URL`.
 
     Returns:
     - (pd.DataFrame): A DataFrame containing the constructor data for the specified year.
     """
    
-    url = f"http://ergast.com/api/f1/{str(year)}/constructors.json"
+    url = f"{base_url}/{str(year)}/constructors.json"
 
-    response = requests.get(url)
+    response = cached_get(url)
 
     if response.status_code == 200:
 
         content = response.json()
         constructors = content['MRData']['ConstructorTable']['Constructors']
         df_constructors = pd.DataFrame(constructors)
-        return df_constructors
+        return apply_schema(df_constructors, 'constructors')
 
     else:
         print(f"Error: {response.status_code}")
@@ -305,42 +647,51 @@ def transform_df_results(results: list, race_id: str):
     """
     Transforms a list of race results into a structured DataFrame with additional derived columns.
 
+    Columns are built directly from the list of results and the DataFrame is created once, which is much faster than expanding the nested driver, constructor and time dictionaries row by row into Series. Results without 'Time' or 'FastestLap', such as retirements, get a missing time.
+
     Parameters:
     - results (list): List of race result data, where each entry is a dictionary representing a race result.
     - race_id (str): Identifier for the race, added as a column in the DataFrame.
 
     Returns:
-    - (pd.DataFrame): A DataFrame containing the processed race results, with additional columns such as driver ID, constructor ID, delta position, and time.
+    - (pd.DataFrame): A DataFrame containing the processed race results, with additional columns such as driver ID, constructor ID, delta position, time and time in milliseconds.
     """
 
-    # Create a dataframe out of the list of results
-    df = pd.DataFrame(results)
+    # Nested columns that are replaced by plain ones
+    nested = {'number', 'Driver', 'Constructor', 'Time', 'FastestLap'}
 
-    # Create a race_id column
-    df.insert(1, 'race_id', race_id)
+    # Every key found in the results, in order of appearance like pd.DataFrame does
+    keys = list(dict.fromkeys(key for result in results for key in result))
+
+    # Build every column at once, with the race_id column in second place
+    columns = {}
+    for i, key in enumerate(keys):
+        if i == 1:
+            columns['race_id'] = [race_id] * len(results)
+        if key not in nested:
+            columns[key] = [result.get(key, np.nan) for result in results]
 
     # Set integer types for operation
-    df['position'] = df['position'].astype(int)
-    df['grid'] = df['grid'].astype(int)
+    columns['position'] = [int(position) for position in columns['position']]
+    columns['grid'] = [int(grid) for grid in columns['grid']]
 
     # Create relevant columns
-    df['driver_id'] = df['Driver'].apply(pd.Series)['driverId']
-    df['constructor_id'] = df['Constructor'].apply(pd.Series)['constructorId']
-    df['delta_pos'] = df['grid'] - df['position']
-    df['time'] = df['Time'].apply(pd.Series)['time']
-
-    # Drop unnecesary columns
-    df.drop(columns=['number', 'Driver', 'Constructor', 'Time', 'FastestLap'], inplace=True)
+    columns['driver_id'] = [result['Driver']['driverId'] for result in results]
+    columns['constructor_id'] = [result['Constructor']['constructorId'] for result in results]
+    columns['delta_pos'] = [grid - position for grid, position in zip(columns['grid'], columns['position'])]
+    columns['time'] = [result['Time'].get('time', np.nan) if 'Time' in result else np.nan for result in results]
+    columns['time_ms'] = [result['Time'].get('millis', np.nan) if 'Time' in result else np.nan for result in results]
 
-    return df
+    return pd.DataFrame(columns)
 
 
-def get_number_of_races_in_season(year: int):
+def get_number_of_races_in_season(year: int, base_url: str = ERGAST_URL):
     """
     Fetches the number of races in the specified Formula 1 season.
 
     Parameters:
     year (int): The year of the F1 season to check.
+    base_url (str, optional): Root URL of the Ergast API. Defaults to `ERGAST_URL`.
 
     Returns:
     int: The number of races in the season.
@@ -348,8 +699,8 @@ def get_number_of_races_in_season(year: int):
     Raises:
     Exception: If the API request fails with a non-200 status code.
     """
-    url = f"http://ergast.com/api/f1/{str(year)}.json"
-    response = requests.get(url, timeout=5)
+    url = f"{base_url}/{str(year)}.json"
+    response = cached_get(url, timeout=5)
 
     if response.status_code == 200:
         content = response.json()
@@ -357,14 +708,86 @@ def get_number_of_races_in_season(year: int):
         return number_of_races
     else:
         raise Exception(f"Error: {response.status_code}")
-    
 
-def get_df_races_results(year:int):
+
+def transform_race_content(content: dict, race_id: str):
+    """
+    Splits the JSON content of a single race results response into a results DataFrame and a race metadata Series.
+
+    Parameters:
+    - content (dict): JSON content returned by the `/{year}/{round}/results.json` endpoint.
+    - race_id (str): Identifier for the race, with format `{year}_{round}`.
+
+    Returns:
+    - (tuple): A tuple containing:
+        - pd.DataFrame: DataFrame with the race results.
+        - pd.Series: Series with the race metadata.
+    """
+    # Pop results
+    results = content['MRData']['RaceTable']['Races'][0].pop('Results')
+    # Build a dataframe for results
+    df_result = transform_df_results(results, race_id)
+
+    # Build a dataframe for races
+    df_race = pd.DataFrame(content['MRData']['RaceTable']['Races'][0]).loc['circuitId']
+    df_race['race_id'] = race_id
+
+    return df_result, df_race
+
+
+def merge_shared_drives(df: pd.DataFrame):
+    """
+    Keeps one result per driver and race.
+
+    Until the 1960s a driver could take part in a race with several cars, sharing them with other drivers, so the same driver can appear more than once in a race. The database keeps one result per driver and race (see `query_results_unique`): the entry with the best position is kept, with the points of all the entries of the driver.
+
+    Parameters:
+    - df (pd.DataFrame): Results, with the dtypes of `support_schema`.
+
+    Returns:
+    - (pd.DataFrame): The results with one row per driver and race, in the same order.
+    """
+    key = ['race_id', 'driver_id']
+    if not df.duplicated(key).any():
+        return df
+
+    groups = df.groupby(key, observed=True, sort=False)
+    df = df.assign(points=groups['points'].transform('sum'))
+    df = df[df['position'] == groups['position'].transform('min')]
+
+    return df[~df.duplicated(key)]
+
+
+def build_df_races_results(results_list: list, races_list: list):
+    """
+    Puts together the per race results and metadata into the final results and races DataFrames, with the dtypes of `support_schema`. Drivers with several entries in a race are merged into one result (see `merge_shared_drives`).
+
+    Parameters:
+    - results_list (list of pd.DataFrame): Results DataFrames, one per race.
+    - races_list (list of pd.Series): Race metadata Series, one per race.
+
+    Returns:
+    - (tuple): A tuple containing:
+        - pd.DataFrame: DataFrame with race results.
+        - pd.DataFrame: DataFrame with race metadata.
+    """
+    # Put together all races
+    df_results = pd.concat(results_list)
+    df_races = pd.concat(races_list, axis=1).T.reset_index(drop=True)
+    # Rename and sort columns
+    df_races.rename(columns={'Circuit': 'circuit_id'}, inplace=True)
+    df_races = df_races[['race_id', 'circuit_id', 'raceName', 'season', 'round', 'url', 'date']]
+
+    return merge_shared_drives(apply_schema(df_results, 'results')), apply_schema(df_races, 'races')
+
+
+def get_df_races_results(year:int, base_url: str = ERGAST_URL):
     """
     Fetches and processes Formula 1 race results and race information for a given season year.
 
     Parameters:
     - year (int): The season year for which race results and details are to be fetched.
+    - base_url (str, optional): Root URL of the Ergast API. Defaults to `ERGAST_URL`.
 
     Returns:
     - (tuple): A tuple containing:
@@ -372,7 +795,7 @@ def get_df_races_results(year:int):
         - pd.DataFrame: DataFrame with race metadata.
     """
 
-    number_of_races = get_number_of_races_in_season(year)
+    number_of_races = get_number_of_races_in_season(year, base_url=base_url)
     results_list = []
     races_list = []
 
@@ -380,34 +803,269 @@ def get_df_races_results(year:int):
 
         race_id = str(year) + '_' + str(rnd)
 
-        url = f"http://ergast.com/api/f1/{str(year)}/{str(rnd)}/results.json"
-        response = requests.get(url)
+        url = f"{base_url}/{str(year)}/{str(rnd)}/results.json"
+        response = cached_get(url)
 
         if response.status_code == 200:
 
             content = response.json()
 
-            # Pop results
-            results = content['MRData']['RaceTable']['Races'][0].pop('Results')
-            # Build a dataframe for results
-            df_result = transform_df_results(results, race_id)
-            # Store dataframe
-            results_list.append(df_result)
+            # Rounds of the calendar that are not held yet have no race
+            if not content['MRData']['RaceTable']['Races']:
+                print(f"No results for {race_id}")
+                continue
+
+            df_result, df_race = transform_race_content(content, race_id)
 
-            # Build a dataframe for races
-            df_race = pd.DataFrame(content['MRData']['RaceTable']['Races'][0]).loc['circuitId']
-            df_race['race_id'] = race_id
-            # Store dataframe
+            # Store dataframes
+            results_list.append(df_result)
             races_list.append(df_race)
 
         else:
             print(f"Error: {response.status_code}")
 
-    # Put together all races
-    df_results = pd.concat(results_list)
-    df_races = pd.concat(races_list, axis=1).T.reset_index(drop=True)
-    # Rename and sort columns
-    df_races.rename(columns={'Circuit': 'circuit_id'}, inplace=True)
-    df_races = df_races[['race_id', 'circuit_id', 'raceName', 'season', 'round', 'url', 'date']]
+    return build_df_races_results(results_list, races_list)
+
+
+def transform_df_laps(laps: pd.DataFrame, race_id: str):
+    """
+    Normalizes the laps of a FastF1 session into the compact columns of the `laps` table.
+
+    Parameters:
+    - laps (pd.DataFrame): The laps of a loaded session, as in `fastf1.core.Session.laps`.
+    - race_id (str): Identifier for the race, with format `{year}_{round}`.
+
+    Returns:
+    - (pd.DataFrame): DataFrame with race ID, driver code, lap number, lap time in milliseconds, compound, stint and position of every lap, with the dtypes of `support_schema`.
+    """
+    laps = laps.dropna(subset=['LapNumber'])
+
+    df_laps = pd.DataFrame({
+        'race_id': race_id,
+        'driver_code': laps['Driver'].to_numpy(),
+        'lap_number': laps['LapNumber'].to_numpy(),
+        'lap_time_ms': (laps['LapTime'].dt.total_seconds() * 1000).round().to_numpy(),
+        'compound': laps['Compound'].to_numpy(),
+        'stint': laps['Stint'].to_numpy(),
+        'position': laps['Position'].to_numpy()
+    })
+
+    return apply_schema(df_laps, 'laps')
+
+
+def get_df_laps(year: int, rounds: list = None, base_url: str = ERGAST_URL):
+    """
+    Extracts the laps of every race of a season from FastF1.
+
+    Sessions are loaded through `support_sessions`, with the lap data only, so the downloads are kept in the FastF1 cache. Races that can't be loaded are skipped.
+
+    Parameters:
+    - year (int): The season year.
+    - rounds (list of int, optional): Rounds to extract. Defaults to None, which extracts every race of the season.
+    - base_url (str, optional): Root URL of the Ergast API, used to get the number of races. Defaults to `ERGAST_URL`.
+
+    Returns:
+    - (pd.DataFrame): The laps of every race, see `transform_df_laps`.
+    """
+    if rounds is None:
+        rounds = range(1, get_number_of_races_in_season(year, base_url=base_url) + 1)
+
+    laps_list = []
+
+    for rnd in tqdm(rounds):
+        race_id = str(year) + '_' + str(rnd)
+
+        try:
+            session = get_session(year, rnd, 'R')
+            laps_list.append(transform_df_laps(session.laps, race_id))
+
+        except Exception as e:
+            print(f"Error loading the laps of {race_id}: {e}")
+
+    if not laps_list:
+        return apply_schema(pd.DataFrame(columns=list(SCHEMA['laps']['columns'])), 'laps')
+
+    # Categories differ between races, so they are set again on the whole season
+    return apply_schema(pd.concat(laps_list, ignore_index=True), 'laps')
+
+
+def get_df_laps_seasons(years):
+    """
+    Extracts the laps of every race of one or more seasons from FastF1.
+
+    Parameters:
+    - years (int | list of int): Season year or list of season years.
+
+    Returns:
+    - (pd.DataFrame): The laps of every race, see `transform_df_laps`.
+    """
+    if isinstance(years, int):
+        years = [years]
+
+    return apply_schema(pd.concat([get_df_laps(year) for year in years], ignore_index=True), 'laps')
+
+
+def fetch_season_races(year: int, limit: int = ERGAST_PAGE_LIMIT, base_url: str = ERGAST_URL, timeout: float = 10, use_cache: bool = True):
+    """
+    Fetches the results of every race of a season from the bulk `/{year}/results.json` endpoint, page by page.
+
+    Pages are cut by number of results, not races, so a race split between two pages is put back together.
+
+    Parameters:
+    - year (int): The season year.
+    - limit (int, optional): Results per page. The API may lower it. Defaults to `ERGAST_PAGE_LIMIT`.
+    - base_url (str, optional): Root URL of the Ergast API. Defaults to `ERGAST_URL`.
+    - timeout (float, optional): Timeout in seconds for every request. Defaults to 10.
+    - use_cache (bool, optional): Whether cached responses can be used. Defaults to True.
+
+    Returns:
+    - (list of dict | None): The races of the season sorted by round, each with all its 'Results', or `None` if a request fails.
+    """
+    races = {}
+    offset = 0
+    total = None
+
+    while total is None or offset < total:
+        url = f"{base_url}/{str(year)}/results.json?limit={limit}&offset={offset}"
+        response = cached_get(url, timeout=timeout, use_cache=use_cache)
+
+        if response.status_code != 200:
+            print(f"Error: {response.status_code}")
+            return
+
+        content = response.json()['MRData']
+        total = int(content['total'])
+
+        for race in content['RaceTable']['Races']:
+            rnd = int(race['round'])
+            if rnd in races:
+                races[rnd]['Results'].extend(race['Results'])
+            else:
+                races[rnd] = race
+
+        # Use the page size actually applied by the API
+        offset += int(content.get('limit', limit))
+
+    return [races[rnd] for rnd in sorted(races)]
+
+
+def get_df_races_results_bulk(years, limit: int = ERGAST_PAGE_LIMIT, base_url: str = ERGAST_URL):
+    """
+    Fetches and processes Formula 1 race results and race information for one or more seasons using the bulk season endpoint.
+
+    Every season takes a few large paginated requests instead of one request per round. The output is the same as concatenating `get_df_races_results` for every season in the given order.
+
+    Parameters:
+    - years (int | list of int): Season year or list of season years to fetch.
+    - limit (int, optional): Results per page. Defaults to `ERGAST_PAGE_LIMIT`.
+    - base_url (str, optional): Root URL of the Ergast API. Defaults to `ERGAST_URL`.
+
+    Returns:
+    - (tuple): A tuple containing:
+        - pd.DataFrame: DataFrame with race results.
+        - pd.DataFrame: DataFrame with race metadata.
+    """
+    if isinstance(years, int):
+        years = [years]
+
+    results_list = []
+    races_list = []
+
+    for year in tqdm(years):
+        races = fetch_season_races(year, limit=limit, base_url=base_url)
+        if races is None:
+            continue
+
+        for race in races:
+            race_id = f"{race['season']}_{race['round']}"
+            # Same shape as the response of a single race
+            content = {'MRData': {'RaceTable': {'Races': [race]}}}
+            df_result, df_race = transform_race_content(content, race_id)
+
+            results_list.append(df_result)
+            races_list.append(df_race)
+
+    return build_df_races_results(results_list, races_list)
+
+
+def fetch_race_results(year: int, rnd: int, base_url: str = ERGAST_URL, timeout: float = 10, use_cache: bool = True):
+    """
+    Fetches and processes the results of a single race.
+
+    Parameters:
+    - year (int): The season year of the race.
+    - rnd (int): The round number of the race.
+    - base_url (str, optional): Root URL of the Ergast API. Defaults to `ERGAST_URL`.
+    - timeout (float, optional): Timeout in seconds for the request. Defaults to 10.
+    - use_cache (bool, optional): Whether a cached response can be used. Defaults to True.
+
+    Returns:
+    - (tuple | None): A tuple with the results DataFrame and the race metadata Series, or `None` if the request fails or the race has no results yet.
+    """
+    race_id = str(year) + '_' + str(rnd)
+    url = f"{base_url}/{str(year)}/{str(rnd)}/results.json"
+
+    try:
+        response = cached_get(url, timeout=timeout, use_cache=use_cache)
+    except requests.RequestException as e:
+        print(f"Error fetching {race_id}: {e}")
+        return
+
+    if response.status_code == 200:
+        content = response.json()
+
+        # Rounds of the calendar that are not held yet have no race
+        if not content['MRData']['RaceTable']['Races']:
+            print(f"No results for {race_id}")
+            return
+
+        return transform_race_content(content, race_id)
+
+    else:
+        print(f"Error: {response.status_code}")
+        return
+
+
+def get_df_races_results_concurrent(years, max_workers: int = 8, base_url: str = ERGAST_URL):
+    """
+    Fetches and processes Formula 1 race results and race information for one or more seasons concurrently.
+
+    Rounds of every season are requested in parallel using a bounded pool of threads, while the shared HTTP client of `support_http` keeps the request rate under the limit of the API. The output is the same as concatenating `get_df_races_results` for every season in ascending order.
+
+    Parameters:
+    - years (int | list of int): Season year or list of season years to fetch.
+    - max_workers (int, optional): Maximum number of concurrent requests. Defaults to 8.
+    - base_url (str, optional): Root URL of the Ergast API. Defaults to `ERGAST_URL`.
+
+    Returns:
+    - (tuple): A tuple containing:
+        - pd.DataFrame: DataFrame with race results.
+        - pd.DataFrame: DataFrame with race metadata.
+    """
+    if isinstance(years, int):
+        years = [years]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        # Get the number of races of every season
+        seasons = dict(zip(years, executor.map(lambda year: get_number_of_races_in_season(year, base_url), years)))
+
+        # Fetch every round of every season
+        futures = {
+            executor.submit(fetch_race_results, year, rnd, base_url): (year, rnd)
+            for year, number in seasons.items()
+            for rnd in range(1, number + 1)
+        }
+
+        fetched = {}
+        for future in tqdm(as_completed(futures), total=len(futures)):
+            race = future.result()
+            if race is not None:
+                fetched[futures[future]] = race
+
+    # Keep the same order as the sequential version
+    ordered = [fetched[key] for key in sorted(fetched)]
+    results_list = [df_result for df_result, _ in ordered]
+    races_list = [df_race for _, df_race in ordered]
 
-    return df_results, df_races
\ No newline at end of file
+    return build_df_races_results(results_list, races_list)
@@ -0,0 +1,259 @@
+# Shared HTTP Client
+# -----------------------------------------------------------------------
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# Web Requests
+# -----------------------------------------------------------------------
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Default (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (5, 30)
+
+# Requests per second and burst allowed per host. Ergast allows 4 requests per second.
+# Local servers, used to replay fixtures, are not limited.
+DEFAULT_RATE_LIMITS = {
+    'ergast.com': (4, 4),
+    'en.wikipedia.org': (10, 10),
+    'localhost': None,
+    '127.0.0.1': None,
+    'default': (5, 5)
+}
+
+# Status codes worth retrying: throttling and server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Maximum number of error records kept by a client
+MAX_ERRORS = 1000
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: calls are allowed at `rate` per second on average, with bursts of up to `capacity` calls.
+
+    Parameters:
+    - rate (float): Tokens added per second.
+    - capacity (float, optional): Maximum number of tokens stored. Defaults to `rate`.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """
+        Blocks until a token is available and takes it.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            # Take the token now, even if it is not there yet, so callers are served in order
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0
+
+        if delay:
+            time.sleep(delay)
+
+
+def get_retry_after(response):
+    """
+    Reads the delay requested by the server in the `Retry-After` header.
+
+    Parameters:
+    - response (requests.Response): The response.
+
+    Returns:
+    - (float | None): Seconds to wait, or `None` if the header is missing or invalid.
+    """
+    value = response.headers.get('Retry-After')
+    if not value:
+        return
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return
+
+
+class HTTPClient:
+    """
+    HTTP client shared by the extraction functions.
+
+    Requests go through a single keep-alive `requests.Session`, so connections to the same host are reused. A token bucket per host keeps the request rate polite for every caller at once. Throttled (429) and server error responses, timeouts and connection errors are retried with jittered exponential backoff, honouring the `Retry-After` header. Requests that still fail are recorded in `errors` with their URL, status code, number of attempts and reason.
+
+    Parameters:
+    - rate_limits (dict, optional): Requests per second and burst per host, overriding `DEFAULT_RATE_LIMITS`. `None` as a value disables the limit of a host.
+    - timeout (float | tuple, optional): Default timeout of the requests, in seconds. Defaults to `DEFAULT_TIMEOUT`.
+    - max_retries (int, optional): Maximum number of retries of a request. Defaults to 5.
+    - backoff_factor (float, optional): Base delay of the backoff in seconds, doubled on every retry. Defaults to 0.5.
+    - max_backoff (float, optional): Maximum delay between retries in seconds. Defaults to 60.
+    - pool_size (int, optional): Number of connections kept alive per host. Defaults to 16.
+    """
+
+    def __init__(self, rate_limits: dict = None, timeout=DEFAULT_TIMEOUT, max_retries: int = 5, backoff_factor: float = 0.5, max_backoff: float = 60, pool_size: int = 16):
+        self.rate_limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.errors = []
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+
+    def _bucket(self, host: str):
+        with self._lock:
+            if host not in self._buckets:
+                limit = self.rate_limits.get(host, self.rate_limits['default'])
+                self._buckets[host] = TokenBucket(*limit) if limit else None
+            return self._buckets[host]
+
+    def set_rate_limit(self, host: str, rate: float = None, capacity: float = None):
+        """
+        Changes the request rate allowed for a host.
+
+        Parameters:
+        - host (str): Host name, such as 'ergast.com', or 'default' for the hosts without their own limit.
+        - rate (float, optional): Requests per second. Defaults to None, which disables the limit.
+        - capacity (float, optional): Burst of requests allowed. Defaults to `rate`.
+        """
+        with self._lock:
+            self.rate_limits[host] = (rate, capacity) if rate else None
+            # Buckets are built again on the next request
+            self._buckets.clear()
+
+    def _backoff(self, attempt: int, retry_after: float = None):
+        # Full jitter, so workers throttled at once do not retry at once
+        delay = random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        time.sleep(delay)
+
+    def _record_error(self, url: str, status_code: int, attempts: int, reason: str):
+        error = {'url': url, 'status_code': status_code, 'attempts': attempts, 'reason': reason, 'time': time.time()}
+
+        with self._lock:
+            self.errors.append(error)
+            del self.errors[:-MAX_ERRORS]
+
+        print(f"Request failed after {attempts} attempts: {url} ({status_code or 'no response'}: {reason})")
+
+    def get(self, url: str, timeout=None, **kwargs):
+        """
+        Performs a GET request with rate limiting and retries.
+
+        Parameters:
+        - url (str): The URL to request.
+        - timeout (float | tuple, optional): Timeout of the request in seconds. Defaults to None, which uses the timeout of the client.
+        - **kwargs: Other arguments of `requests.Session.get`.
+
+        Returns:
+        - (requests.Response): The last response. Its status code is not 200 if every attempt failed.
+
+        Raises:
+        - requests.RequestException: If the last attempt did not get any response.
+        """
+        bucket = self._bucket(urlsplit(url).hostname)
+        timeout = timeout or self.timeout
+
+        for attempt in range(self.max_retries + 1):
+            if bucket:
+                bucket.wait()
+
+            with self._lock:
+                self.requests += 1
+
+            try:
+                response = self.session.get(url, timeout=timeout, **kwargs)
+
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    self._record_error(url, None, attempt + 1, type(e).__name__)
+                    raise
+
+                with self._lock:
+                    self.retries += 1
+                self._backoff(attempt)
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                if response.status_code != 200:
+                    self._record_error(url, response.status_code, attempt + 1, response.reason)
+                return response
+
+            if response.status_code == 429:
+                with self._lock:
+                    self.throttled += 1
+
+            if attempt == self.max_retries:
+                self._record_error(url, response.status_code, attempt + 1, response.reason)
+                return response
+
+            with self._lock:
+                self.retries += 1
+            self._backoff(attempt, get_retry_after(response))
+
+    def clear_errors(self):
+        """
+        Drops the recorded errors.
+        """
+        with self._lock:
+            self.errors.clear()
+
+    def stats(self):
+        """
+        Returns usage statistics of the client.
+
+        Returns:
+        - (dict): Requests sent, retries, throttled responses and failed requests.
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'throttled': self.throttled,
+                'errors': len(self.errors)
+            }
+
+
+# Client shared by all the extraction functions
+http_client = HTTPClient()
+
+
+def http_get(url: str, timeout=None, **kwargs):
+    """
+    Performs a GET request with the shared `http_client`.
+
+    Parameters:
+    - url (str): The URL to request.
+    - timeout (float | tuple, optional): Timeout of the request in seconds. Defaults to None, which uses the timeout of the client.
+    - **kwargs: Other arguments of `requests.Session.get`.
+
+    Returns:
+    - (requests.Response): The response, see `HTTPClient.get`.
+    """
+    return http_client.get(url, timeout=timeout, **kwargs)
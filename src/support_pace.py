@@ -0,0 +1,242 @@
+# Lap Time Aggregates
+# -----------------------------------------------------------------------
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# FastF1 Library
+# -----------------------------------------------------------------------
+import fastf1.plotting
+
+# Shared session provider
+# -----------------------------------------------------------------------
+from src.support_sessions import MAX_SESSIONS, get_session
+
+
+# Quantiles of the lap times kept for every driver and compound
+PACE_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Number of points of the density grids
+KDE_POINTS = 128
+
+# Bandwidths added at both ends of a density grid, like the `cut` of seaborn's violin plots
+KDE_CUT = 2
+
+# Compounds drawn in the plots, in order
+COMPOUNDS = ['SOFT', 'MEDIUM', 'HARD']
+
+# Label of the aggregates over every compound
+ALL_COMPOUNDS = 'ALL'
+
+# Summaries already computed, keyed by session. Like the loaded sessions, only the `MAX_SESSIONS` most recently used are kept.
+pace_summaries = OrderedDict()
+pace_summaries_lock = threading.Lock()
+
+
+def get_kde_grid(values: np.ndarray, points: int = KDE_POINTS, cut: float = KDE_CUT):
+    """
+    Estimates the density of a sample with a gaussian kernel, on a grid of evenly spaced points.
+
+    The bandwidth follows Scott's rule, as in seaborn's violin plots.
+
+    Parameters:
+    - values (np.ndarray): The sample.
+    - points (int, optional): Number of points of the grid. Defaults to `KDE_POINTS`.
+    - cut (float, optional): Bandwidths the grid extends past the extreme values. Defaults to `KDE_CUT`.
+
+    Returns:
+    - (tuple): The grid and the density at every point, as arrays. Both are empty if the sample has less than two distinct values.
+    """
+    values = np.asarray(values, dtype=float)
+    bandwidth = values.std(ddof=1) * len(values) ** (-1 / 5) if len(values) > 1 else 0
+
+    if not bandwidth:
+        return np.empty(0), np.empty(0)
+
+    grid = np.linspace(values.min() - cut * bandwidth, values.max() + cut * bandwidth, points)
+    z = (grid[:, None] - values[None, :]) / bandwidth
+    density = np.exp(-0.5 * z ** 2).sum(axis=1) / (len(values) * bandwidth * np.sqrt(2 * np.pi))
+
+    return grid, density
+
+
+def compute_pace_summary(session, quantiles: tuple = PACE_QUANTILES, points: int = KDE_POINTS):
+    """
+    Computes the lap time aggregates of every driver of a loaded session.
+
+    Only quick laps are used, as in `plot_drivers_pace`. Quantiles and density grids are computed per driver and compound, and per driver over every compound (compound `ALL_COMPOUNDS`). The lap times and colors are kept too, so plots can be drawn without the session.
+
+    Parameters:
+    - session (fastf1.core.Session): The loaded session.
+    - quantiles (tuple of float, optional): Quantiles to compute. Defaults to `PACE_QUANTILES`.
+    - points (int, optional): Number of points of the density grids. Defaults to `KDE_POINTS`.
+
+    Returns:
+    - (dict): The summary, with keys:
+        - 'event' (str): Name of the event.
+        - 'drivers' (list of str): Abbreviations of the drivers in finishing order.
+        - 'stats' (pd.DataFrame): One row per driver and compound with the number of laps, mean and quantiles in seconds.
+        - 'kde' (dict): Grid and density of every (driver, compound).
+        - 'laps' (pd.DataFrame): Driver, compound and lap time in seconds of every quick lap.
+        - 'driver_colors' (dict), 'compound_colors' (dict): Colors of the drivers and compounds.
+    """
+    laps = session.laps.pick_drivers(session.drivers).pick_quicklaps()
+
+    laps = pd.DataFrame({
+        'Driver': laps['Driver'].to_numpy(),
+        'Compound': laps['Compound'].to_numpy(),
+        'LapTime(s)': laps['LapTime'].dt.total_seconds().to_numpy()
+    }).dropna(subset=['LapTime(s)'])
+
+    drivers = [session.get_driver(number)['Abbreviation'] for number in session.drivers]
+    columns = [f'q{round(q * 100):02d}' for q in quantiles]
+
+    stats = []
+    kde = {}
+    groups = [((driver, ALL_COMPOUNDS), df) for driver, df in laps.groupby('Driver', sort=False)]
+    groups += list(laps.groupby(['Driver', 'Compound'], sort=False))
+
+    for key, df in groups:
+        times = df['LapTime(s)'].to_numpy()
+        stats.append([*key, len(times), times.mean(), *np.quantile(times, quantiles)])
+        kde[key] = get_kde_grid(times, points)
+
+    stats = pd.DataFrame(stats, columns=['Driver', 'Compound', 'laps', 'mean', *columns])
+
+    return {
+        'event': session.event.loc['EventName'],
+        'drivers': drivers,
+        'stats': stats,
+        'kde': kde,
+        'laps': laps,
+        'driver_colors': fastf1.plotting.get_driver_color_mapping(session=session),
+        'compound_colors': fastf1.plotting.get_compound_mapping(session=session)
+    }
+
+
+def get_pace_summary(year: int, rnd, ev: str = 'R'):
+    """
+    Returns the lap time aggregates of a session, computing them only the first time.
+
+    Parameters:
+    - year (int): The year of the session.
+    - rnd (int | str): The round number or event name.
+    - ev (str, optional): The session identifier, such as 'R' for race. Defaults to 'R'.
+
+    Returns:
+    - (dict): The summary, see `compute_pace_summary`.
+    """
+    key = (int(year), rnd, ev)
+
+    with pace_summaries_lock:
+        if key in pace_summaries:
+            pace_summaries.move_to_end(key)
+            return pace_summaries[key]
+
+    summary = compute_pace_summary(get_session(year, rnd, ev))
+
+    with pace_summaries_lock:
+        pace_summaries[key] = summary
+        pace_summaries.move_to_end(key)
+
+        while len(pace_summaries) > MAX_SESSIONS:
+            pace_summaries.popitem(last=False)
+
+    return summary
+
+
+def clear_pace_summaries():
+    """
+    Drops every computed summary.
+    """
+    with pace_summaries_lock:
+        pace_summaries.clear()
+
+
+def draw_pace_summary(summary: dict, ax, drivers: list, swarm_points: int = 0, seed: int = 0):
+    """
+    Draws the lap time distributions of some drivers from a summary, as violins with their quartiles.
+
+    The violins are scaled so all of them have the same area, like seaborn's `density_norm="area"`. Optionally a sample of the laps of every driver is drawn on top, colored by compound.
+
+    Parameters:
+    - summary (dict): The summary, see `compute_pace_summary`.
+    - ax (matplotlib.axes.Axes): Axes to draw on.
+    - drivers (list of str): Abbreviations of the drivers, in drawing order.
+    - swarm_points (int, optional): Maximum laps drawn per driver. Defaults to 0, which draws none.
+    - seed (int, optional): Seed of the lap sample, so the figures are reproducible. Defaults to 0.
+    """
+    stats = summary['stats'].set_index(['Driver', 'Compound'])
+
+    densities = [summary['kde'][(driver, ALL_COMPOUNDS)][1] for driver in drivers if (driver, ALL_COMPOUNDS) in summary['kde']]
+    peak = max((density.max() for density in densities if len(density)), default=1)
+
+    for x, driver in enumerate(drivers):
+        if (driver, ALL_COMPOUNDS) not in summary['kde']:
+            continue
+
+        grid, density = summary['kde'][(driver, ALL_COMPOUNDS)]
+        color = summary['driver_colors'].get(driver, 'grey')
+
+        if len(grid):
+            width = 0.4 * density / peak
+            ax.fill_betweenx(grid, x - width, x + width, color=color, linewidth=0)
+
+        row = stats.loc[(driver, ALL_COMPOUNDS)]
+        ax.vlines(x, row['q25'], row['q75'], color='white', linewidth=3, zorder=3)
+        ax.scatter(x, row['q50'], color='black', s=12, zorder=4)
+
+    if swarm_points:
+        rng = np.random.default_rng(seed)
+        laps = summary['laps']
+
+        for x, driver in enumerate(drivers):
+            df = laps[laps['Driver'] == driver]
+            if len(df) > swarm_points:
+                df = df.iloc[np.sort(rng.choice(len(df), swarm_points, replace=False))]
+
+            offsets = rng.uniform(-0.15, 0.15, len(df))
+            for compound in COMPOUNDS:
+                mask = (df['Compound'] == compound).to_numpy()
+                if mask.any():
+                    ax.scatter(x + offsets[mask], df['LapTime(s)'].to_numpy()[mask], s=10, linewidths=0,
+                               color=summary['compound_colors'].get(compound), label=compound, zorder=5)
+
+        # One legend entry per compound
+        handles, labels = ax.get_legend_handles_labels()
+        unique = dict(zip(labels, handles))
+        ax.legend([unique[c] for c in COMPOUNDS if c in unique], [c for c in COMPOUNDS if c in unique], title='Compound')
+
+    ax.set_xticks(range(len(drivers)), drivers)
+    ax.set_xlim(-0.6, len(drivers) - 0.4)
+
+
+def get_pace_comparison(year: int, rounds: list, drivers: list = None, compound: str = ALL_COMPOUNDS, ev: str = 'R'):
+    """
+    Gathers the lap time aggregates of several races in a single DataFrame.
+
+    Parameters:
+    - year (int): The season.
+    - rounds (list of int): The round numbers.
+    - drivers (list of str, optional): Abbreviations of the drivers to keep. Defaults to None, which keeps all of them.
+    - compound (str, optional): Compound to keep. Defaults to `ALL_COMPOUNDS`.
+    - ev (str, optional): The session identifier. Defaults to 'R'.
+
+    Returns:
+    - (pd.DataFrame): The aggregates of every race, with its round and event name.
+    """
+    frames = []
+
+    for rnd in rounds:
+        summary = get_pace_summary(year, rnd, ev)
+        stats = summary['stats']
+        stats = stats[stats['Compound'] == compound]
+
+        if drivers is not None:
+            stats = stats[stats['Driver'].isin(drivers)]
+
+        frames.append(stats.assign(round=rnd, event=summary['event']))
+
+    return pd.concat(frames, ignore_index=True)
+
@@ -0,0 +1,147 @@
+# Race Position Matrix
+# -----------------------------------------------------------------------
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Shared session provider
+# -----------------------------------------------------------------------
+from src.support_sessions import MAX_SESSIONS, get_session
+
+
+# Matrices already built, keyed by session, up to `MAX_SESSIONS` evicting the least recently used
+position_matrices = OrderedDict()
+position_matrices_lock = threading.Lock()
+
+
+def build_position_matrix(session):
+    """
+    Builds the position of every driver on every lap of a loaded session, as a drivers x laps array.
+
+    The laps are placed in the array in a single pass. Laps a driver did not complete, such as the ones after retiring, are NaN. Drivers without laps, usually the ones that did not start, are left out.
+
+    Parameters:
+    - session (fastf1.core.Session): The loaded session.
+
+    Returns:
+    - (dict): The matrix, with keys:
+        - 'numbers' (list of str): Car numbers of the drivers, in finishing order.
+        - 'drivers' (list of str): Abbreviations of the drivers, in the same order.
+        - 'laps' (np.ndarray): Lap numbers, one per column.
+        - 'positions' (np.ndarray): Position of every driver (row) on every lap (column).
+    """
+    laps = session.laps[['DriverNumber', 'Driver', 'LapNumber', 'Position']].dropna(subset=['LapNumber'])
+
+    abbreviations = dict(zip(laps['DriverNumber'], laps['Driver']))
+    numbers = [number for number in session.drivers if number in abbreviations]
+
+    for number in session.drivers:
+        if number not in abbreviations:
+            print(f'Driver {number} not found. Probably DNS')
+
+    rows = pd.Categorical(laps['DriverNumber'], categories=numbers).codes
+    columns = laps['LapNumber'].to_numpy(dtype=int) - 1
+    valid = rows >= 0
+
+    n_laps = columns.max() + 1 if len(columns) else 0
+    positions = np.full((len(numbers), n_laps), np.nan)
+    positions[rows[valid], columns[valid]] = laps['Position'].to_numpy(dtype=float)[valid]
+
+    return {
+        'numbers': numbers,
+        'drivers': [abbreviations[number] for number in numbers],
+        'laps': np.arange(1, n_laps + 1),
+        'positions': positions
+    }
+
+
+def get_position_matrix(year: int, rnd, ev: str = 'R'):
+    """
+    Returns the position matrix of a session, building it only the first time.
+
+    Parameters:
+    - year (int): The year of the session.
+    - rnd (int | str): The round number or event name.
+    - ev (str, optional): The session identifier, such as 'R' for race. Defaults to 'R'.
+
+    Returns:
+    - (dict): The matrix, see `build_position_matrix`.
+    """
+    key = (int(year), rnd, ev)
+
+    with position_matrices_lock:
+        if key in position_matrices:
+            position_matrices.move_to_end(key)
+            return position_matrices[key]
+
+    matrix = build_position_matrix(get_session(year, rnd, ev))
+
+    with position_matrices_lock:
+        position_matrices[key] = matrix
+        position_matrices.move_to_end(key)
+
+        while len(position_matrices) > MAX_SESSIONS:
+            position_matrices.popitem(last=False)
+
+    return matrix
+
+
+def clear_position_matrices():
+    """
+    Drops every built matrix.
+    """
+    with position_matrices_lock:
+        position_matrices.clear()
+
+
+def get_position_stats(matrix: dict):
+    """
+    Summarizes the positions of every driver of a position matrix.
+
+    Positions gained and lost are counted lap by lap, only between consecutive laps completed by the driver, so they include the places exchanged in the pit stops.
+
+    Parameters:
+    - matrix (dict): The matrix, see `build_position_matrix`.
+
+    Returns:
+    - (pd.DataFrame): One row per driver with the position of the first and last lap completed, best and worst position, laps completed, laps led, and positions gained and lost.
+    """
+    positions = matrix['positions']
+    completed = ~np.isnan(positions)
+
+    # Index of the first and last lap completed by every driver
+    first = completed.argmax(axis=1)
+    last = positions.shape[1] - 1 - completed[:, ::-1].argmax(axis=1)
+    rows = np.arange(len(positions))
+
+    changes = np.diff(positions, axis=1)
+
+    return pd.DataFrame({
+        'driver': matrix['drivers'],
+        'start_position': positions[rows, first],
+        'final_position': positions[rows, last],
+        'best_position': np.nanmin(positions, axis=1),
+        'worst_position': np.nanmax(positions, axis=1),
+        'laps_completed': completed.sum(axis=1),
+        'laps_led': (positions == 1).sum(axis=1),
+        'positions_gained': np.nansum(np.where(changes < 0, -changes, 0), axis=1),
+        'positions_lost': np.nansum(np.where(changes > 0, changes, 0), axis=1)
+    })
+
+
+def get_season_position_stats(year: int, rounds: list, ev: str = 'R'):
+    """
+    Summarizes the positions of every driver in several races of a season.
+
+    Parameters:
+    - year (int): The season.
+    - rounds (list of int): The round numbers.
+    - ev (str, optional): The session identifier. Defaults to 'R'.
+
+    Returns:
+    - (pd.DataFrame): The summary of every race, see `get_position_stats`, with its round.
+    """
+    frames = [get_position_stats(get_position_matrix(year, rnd, ev)).assign(round=rnd) for rnd in rounds]
+
+    return pd.concat(frames, ignore_index=True)
@@ -2,83 +2,16 @@
 Creation queries
 -----------------
 """
+from src.support_schema import create_table_query
 
 
-# Circuits
-query_creation_circuits = """
-CREATE TABLE IF NOT EXISTS circuits (
-    circuitId VARCHAR(50) primary key,
-    url VARCHAR(200),
-    circuitName VARCHAR(100) not null,
-    capacity INT,
-    website VARCHAR(200),
-    architect VARCHAR(200),
-    lat FLOAT not null,
-    long FLOAT not null,
-    locality VARCHAR(100) not null,
-    country VARCHAR(50) not null
-);
-"""
-
-# Races
-query_creation_races = """
-CREATE TABLE IF NOT EXISTS races (
-    race_id VARCHAR(50) primary key,
-    circuit_id VARCHAR(50) not null,
-    raceName VARCHAR(100) not null,
-    season INT not null,
-    round INT not null,
-    url VARCHAR(200),
-    date VARCHAR(50) not null,
-    driver VARCHAR(100),
-    foreign key (circuit_id) references circuits(circuitId)
-);
-"""
-
-# Drivers
-query_creation_drivers = """
-CREATE TABLE IF NOT EXISTS drivers (
-    driverId VARCHAR(50) primary key,
-    permanentNumber INT unique not null,
-    code CHAR(3) unique not null,
-    url VARCHAR(200),
-    first_name VARCHAR(50) not null,
-    last_name VARCHAR(50) not null,
-    dateOfBirth VARCHAR(50) not null,
-    nationality VARCHAR(50) not null
-);
-"""
-
-# Constructors
-query_creation_constructors = """
-CREATE TABLE IF NOT EXISTS constructors (
-    constructorId VARCHAR(50) primary key,
-    url VARCHAR(200),
-    name VARCHAR(50) not null,
-    nationality VARCHAR(50) not null
-);
-"""
-
-# Results
-query_creation_results = """
-CREATE TABLE IF NOT EXISTS results (
-    id SERIAL primary key,
-    race_id VARCHAR(10),
-    position INT not null,
-    positionText VARCHAR(5) not null,
-    points INT not null,
-    grid INT not null,
-    laps INT not null,
-    status VARCHAR(50) not null,
-    driver_id VARCHAR(50) not null,
-    constructor_id VARCHAR(50) not null,
-    delta_pos INT not null,
-    time VARCHAR(20),
-    foreign key (race_id) references races(race_id),
-    foreign key (driver_id) references drivers(driverId),
-    foreign key (constructor_id) references constructors(constructorId)
-);
-"""
+# Tables are defined in support_schema, together with the dtypes of the DataFrames
+query_creation_circuits = create_table_query('circuits')
+query_creation_races = create_table_query('races')
+query_creation_drivers = create_table_query('drivers')
+query_creation_constructors = create_table_query('constructors')
+query_creation_results = create_table_query('results')
+query_creation_laps = create_table_query('laps')
 
 # List of queries ordered
 queries_creation = [
@@ -86,7 +19,8 @@ queries_creation = [
     query_creation_races, 
     query_creation_drivers, 
     query_creation_constructors, 
-    query_creation_results
+    query_creation_results,
+    query_creation_laps
     ]
 
 
@@ -131,9 +65,9 @@ INSERT INTO constructors (
 # Insert query for results table
 query_insertion_results = """
 INSERT INTO results (
-    race_id, position, positionText, points, grid, laps, status, driver_id, constructor_id, delta_pos, time
+    race_id, position, positionText, points, grid, laps, status, driver_id, constructor_id, delta_pos, time, time_ms
 ) VALUES
-(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
+(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
 """
 
 # List of queries ordered
@@ -145,6 +79,399 @@ queries_insertion = [
     query_insertion_results
     ]
 
+# Columns filled for every table, in the same order as the insertion and upsert queries
+columns_insertion = {
+    'circuits': ['circuitId', 'url', 'circuitName', 'capacity', 'website', 'architect', 'lat', 'long', 'locality', 'country'],
+    'races': ['race_id', 'circuit_id', 'raceName', 'season', 'round', 'url', 'date', 'driver'],
+    'drivers': ['driverId', 'permanentNumber', 'code', 'url', 'first_name', 'last_name', 'dateOfBirth', 'nationality'],
+    'constructors': ['constructorId', 'url', 'name', 'nationality'],
+    'results': ['race_id', 'position', 'positionText', 'points', 'grid', 'laps', 'status', 'driver_id', 'constructor_id', 'delta_pos', 'time', 'time_ms'],
+    'laps': ['race_id', 'driver_code', 'lap_number', 'lap_time_ms', 'compound', 'stint', 'position'],
+    'load_log': ['race_id', 'race_date', 'content_hash']
+    }
+
+
+"""
+Incremental sync queries
+------------------------
+"""
+
+
+# One result per driver and race, needed to upsert results
+query_results_unique = """
+CREATE UNIQUE INDEX IF NOT EXISTS results_race_driver_key ON results (race_id, driver_id);
+"""
+
+# Races already loaded and the hash of their content
+query_creation_load_log = """
+CREATE TABLE IF NOT EXISTS load_log (
+    race_id VARCHAR(10) primary key,
+    race_date DATE not null,
+    content_hash CHAR(64) not null,
+    loaded_at TIMESTAMP not null default now(),
+    foreign key (race_id) references races(race_id)
+);
+"""
+
+# List of queries ordered
+queries_sync_creation = [
+    query_results_unique,
+    query_creation_load_log
+    ]
+
+# Upsert queries for execute_values. Rows are only rewritten when some value changes.
+query_upsert_circuits = """
+INSERT INTO circuits AS t (
+    circuitId, url, circuitName, capacity, website, architect, lat, long, locality, country
+) VALUES %s
+ON CONFLICT (circuitId) DO UPDATE SET
+    url = EXCLUDED.url, circuitName = EXCLUDED.circuitName, capacity = EXCLUDED.capacity,
+    website = EXCLUDED.website, architect = EXCLUDED.architect, lat = EXCLUDED.lat,
+    long = EXCLUDED.long, locality = EXCLUDED.locality, country = EXCLUDED.country
+WHERE (t.url, t.circuitName, t.capacity, t.website, t.architect, t.lat, t.long, t.locality, t.country)
+    IS DISTINCT FROM
+    (EXCLUDED.url, EXCLUDED.circuitName, EXCLUDED.capacity, EXCLUDED.website, EXCLUDED.architect, EXCLUDED.lat, EXCLUDED.long, EXCLUDED.locality, EXCLUDED.country);
+"""
+
+# Driver of the day is kept when the new row does not bring it
+query_upsert_races = """
+INSERT INTO races AS t (
+    race_id, circuit_id, raceName, season, round, url, date, driver
+) VALUES %s
+ON CONFLICT (race_id) DO UPDATE SET
+    circuit_id = EXCLUDED.circuit_id, raceName = EXCLUDED.raceName, season = EXCLUDED.season,
+    round = EXCLUDED.round, url = EXCLUDED.url, date = EXCLUDED.date,
+    driver = COALESCE(EXCLUDED.driver, t.driver)
+WHERE (t.circuit_id, t.raceName, t.season, t.round, t.url, t.date, t.driver)
+    IS DISTINCT FROM
+    (EXCLUDED.circuit_id, EXCLUDED.raceName, EXCLUDED.season, EXCLUDED.round, EXCLUDED.url, EXCLUDED.date, COALESCE(EXCLUDED.driver, t.driver));
+"""
+
+query_upsert_drivers = """
+INSERT INTO drivers AS t (
+    driverId, permanentNumber, code, url, first_name, last_name, dateOfBirth, nationality
+) VALUES %s
+ON CONFLICT (driverId) DO UPDATE SET
+    permanentNumber = EXCLUDED.permanentNumber, code = EXCLUDED.code, url = EXCLUDED.url,
+    first_name = EXCLUDED.first_name, last_name = EXCLUDED.last_name,
+    dateOfBirth = EXCLUDED.dateOfBirth, nationality = EXCLUDED.nationality
+WHERE (t.permanentNumber, t.code, t.url, t.first_name, t.last_name, t.dateOfBirth, t.nationality)
+    IS DISTINCT FROM
+    (EXCLUDED.permanentNumber, EXCLUDED.code, EXCLUDED.url, EXCLUDED.first_name, EXCLUDED.last_name, EXCLUDED.dateOfBirth, EXCLUDED.nationality);
+"""
+
+query_upsert_constructors = """
+INSERT INTO constructors AS t (
+    constructorId, url, name, nationality
+) VALUES %s
+ON CONFLICT (constructorId) DO UPDATE SET
+    url = EXCLUDED.url, name = EXCLUDED.name, nationality = EXCLUDED.nationality
+WHERE (t.url, t.name, t.nationality)
+    IS DISTINCT FROM
+    (EXCLUDED.url, EXCLUDED.name, EXCLUDED.nationality);
+"""
+
+query_upsert_results = """
+INSERT INTO results AS t (
+    race_id, position, positionText, points, grid, laps, status, driver_id, constructor_id, delta_pos, time, time_ms
+) VALUES %s
+ON CONFLICT (race_id, driver_id) DO UPDATE SET
+    position = EXCLUDED.position, positionText = EXCLUDED.positionText, points = EXCLUDED.points,
+    grid = EXCLUDED.grid, laps = EXCLUDED.laps, status = EXCLUDED.status,
+    constructor_id = EXCLUDED.constructor_id, delta_pos = EXCLUDED.delta_pos, time = EXCLUDED.time, time_ms = EXCLUDED.time_ms
+WHERE (t.position, t.positionText, t.points, t.grid, t.laps, t.status, t.constructor_id, t.delta_pos, t.time, t.time_ms)
+    IS DISTINCT FROM
+    (EXCLUDED.position, EXCLUDED.positionText, EXCLUDED.points, EXCLUDED.grid, EXCLUDED.laps, EXCLUDED.status, EXCLUDED.constructor_id, EXCLUDED.delta_pos, EXCLUDED.time, EXCLUDED.time_ms);
+"""
+
+query_upsert_load_log = """
+INSERT INTO load_log (
+    race_id, race_date, content_hash
+) VALUES %s
+ON CONFLICT (race_id) DO UPDATE SET
+    race_date = EXCLUDED.race_date, content_hash = EXCLUDED.content_hash, loaded_at = now();
+"""
+
+# Upsert queries by table, ordered to respect foreign keys
+queries_upsert = {
+    'circuits': query_upsert_circuits,
+    'races': query_upsert_races,
+    'drivers': query_upsert_drivers,
+    'constructors': query_upsert_constructors,
+    'results': query_upsert_results,
+    'load_log': query_upsert_load_log
+    }
+
+# Results of a reloaded race whose driver is no longer classified
+query_delete_stale_results = """
+DELETE FROM results
+WHERE race_id = %s AND NOT (driver_id = ANY(%s));
+"""
+
+
+"""
+Index and migration queries
+---------------------------
+"""
+
+
+# Store race dates as real dates so they sort and filter without casts
+query_migration_races_date = """
+ALTER TABLE races ALTER COLUMN date TYPE DATE USING date::date;
+"""
+
+# Store birth dates as real dates instead of text
+query_migration_drivers_birth_date = """
+ALTER TABLE drivers ALTER COLUMN dateOfBirth TYPE DATE USING dateOfBirth::date;
+"""
+
+# Columns added to the schema after the first version of the tables
+query_migration_results_time_ms = """
+ALTER TABLE results ADD COLUMN IF NOT EXISTS time_ms INT;
+"""
+
+# Half points were awarded in some races
+query_migration_results_points = """
+ALTER TABLE results ALTER COLUMN points TYPE NUMERIC(5,2);
+"""
+
+# Results by driver, covering the columns aggregated by the driver queries
+query_index_results_driver = """
+CREATE INDEX IF NOT EXISTS results_driver_race_idx ON results (driver_id, race_id)
+INCLUDE (points, position, grid, delta_pos, status);
+"""
+
+# Results by constructor, covering the constructor championship queries
+query_index_results_constructor = """
+CREATE INDEX IF NOT EXISTS results_constructor_race_idx ON results (constructor_id, race_id)
+INCLUDE (points);
+"""
+
+# Wins and podiums
+query_index_results_podium = """
+CREATE INDEX IF NOT EXISTS results_podium_idx ON results (driver_id, race_id)
+INCLUDE (position)
+WHERE position <= 3;
+"""
+
+# Did not finish
+query_index_results_dnf = """
+CREATE INDEX IF NOT EXISTS results_dnf_idx ON results (driver_id, race_id)
+WHERE status <> 'Finished';
+"""
+
+# Pole positions
+query_index_results_pole = """
+CREATE INDEX IF NOT EXISTS results_pole_idx ON results (race_id)
+INCLUDE (driver_id, position)
+WHERE grid = 1;
+"""
+
+# Races in chronological order
+query_index_races_date = """
+CREATE INDEX IF NOT EXISTS races_date_idx ON races (date)
+INCLUDE (race_id, round, raceName);
+"""
+
+# Races of a season
+query_index_races_season = """
+CREATE INDEX IF NOT EXISTS races_season_round_idx ON races (season, round);
+"""
+
+# Refresh planner statistics after the changes
+query_analyze = """
+ANALYZE circuits, races, drivers, constructors, results, laps;
+"""
+
+# List of queries ordered. Every query can be run again safely.
+queries_migration = [
+    query_migration_races_date,
+    query_migration_drivers_birth_date,
+    query_migration_results_time_ms,
+    query_migration_results_points,
+    query_creation_laps,
+    query_results_unique,
+    query_index_results_driver,
+    query_index_results_constructor,
+    query_index_results_podium,
+    query_index_results_dnf,
+    query_index_results_pole,
+    query_index_races_date,
+    query_index_races_season,
+    query_analyze
+    ]
+
+
+"""
+Standings queries
+-----------------
+"""
+
+
+# Points of every driver after every race
+query_creation_driver_standings = """
+CREATE TABLE IF NOT EXISTS driver_standings (
+    race_id VARCHAR(10) not null,
+    driver_id VARCHAR(50) not null,
+    season INT not null,
+    round INT not null,
+    date DATE not null,
+    points NUMERIC(5,2) not null,
+    cumulative_points NUMERIC(8,2) not null,
+    season_points NUMERIC(8,2) not null,
+    primary key (race_id, driver_id),
+    foreign key (race_id) references races(race_id),
+    foreign key (driver_id) references drivers(driverId)
+);
+CREATE INDEX IF NOT EXISTS driver_standings_date_idx ON driver_standings (date, driver_id);
+CREATE INDEX IF NOT EXISTS driver_standings_season_idx ON driver_standings (season, round);
+"""
+
+# Points of every constructor after every race. Entries is the number of cars in the race.
+query_creation_constructor_standings = """
+CREATE TABLE IF NOT EXISTS constructor_standings (
+    race_id VARCHAR(10) not null,
+    constructor_id VARCHAR(50) not null,
+    season INT not null,
+    round INT not null,
+    date DATE not null,
+    entries INT not null,
+    points NUMERIC(5,2) not null,
+    cumulative_points NUMERIC(8,2) not null,
+    season_points NUMERIC(8,2) not null,
+    primary key (race_id, constructor_id),
+    foreign key (race_id) references races(race_id),
+    foreign key (constructor_id) references constructors(constructorId)
+);
+CREATE INDEX IF NOT EXISTS constructor_standings_date_idx ON constructor_standings (date, constructor_id);
+CREATE INDEX IF NOT EXISTS constructor_standings_season_idx ON constructor_standings (season, round);
+"""
+
+# Career totals of every driver
+query_creation_driver_totals = """
+CREATE TABLE IF NOT EXISTS driver_totals (
+    driver_id VARCHAR(50) primary key,
+    races INT not null,
+    total_points NUMERIC(8,2) not null,
+    wins INT not null,
+    podiums INT not null,
+    foreign key (driver_id) references drivers(driverId)
+);
+"""
+
+# Career totals of every constructor
+query_creation_constructor_totals = """
+CREATE TABLE IF NOT EXISTS constructor_totals (
+    constructor_id VARCHAR(50) primary key,
+    total_points NUMERIC(8,2) not null,
+    foreign key (constructor_id) references constructors(constructorId)
+);
+"""
+
+# Points columns of tables created before half points were supported
+query_migration_standings_points = """
+ALTER TABLE driver_standings ALTER COLUMN points TYPE NUMERIC(5,2),
+    ALTER COLUMN cumulative_points TYPE NUMERIC(8,2), ALTER COLUMN season_points TYPE NUMERIC(8,2);
+ALTER TABLE constructor_standings ALTER COLUMN points TYPE NUMERIC(5,2),
+    ALTER COLUMN cumulative_points TYPE NUMERIC(8,2), ALTER COLUMN season_points TYPE NUMERIC(8,2);
+ALTER TABLE driver_totals ALTER COLUMN total_points TYPE NUMERIC(8,2);
+ALTER TABLE constructor_totals ALTER COLUMN total_points TYPE NUMERIC(8,2);
+"""
+
+# List of queries ordered
+queries_standings_creation = [
+    query_creation_driver_standings,
+    query_creation_constructor_standings,
+    query_creation_driver_totals,
+    query_creation_constructor_totals,
+    query_migration_standings_points
+    ]
+
+# Drivers and constructors that took part in some races
+query_affected_drivers = """
+SELECT DISTINCT driver_id FROM results WHERE race_id = ANY(%s);
+"""
+
+query_affected_constructors = """
+SELECT DISTINCT constructor_id FROM results WHERE race_id = ANY(%s);
+"""
+
+# First date of some races
+query_affected_since = """
+SELECT MIN(date::date) FROM races WHERE race_id = ANY(%s);
+"""
+
+# Refresh queries for the given drivers or constructors. Only rows from the first changed date on are rewritten.
+query_refresh_driver_standings = """
+DELETE FROM driver_standings WHERE driver_id = ANY(%(ids)s) AND date >= %(since)s;
+INSERT INTO driver_standings (race_id, driver_id, season, round, date, points, cumulative_points, season_points)
+SELECT * FROM (
+    SELECT
+        res.race_id,
+        res.driver_id,
+        r.season,
+        r.round,
+        r.date::date AS date,
+        res.points,
+        SUM(res.points) OVER (PARTITION BY res.driver_id ORDER BY r.date),
+        SUM(res.points) OVER (PARTITION BY res.driver_id, r.season ORDER BY r.date)
+    FROM results res
+    INNER JOIN races r ON res.race_id = r.race_id
+    WHERE res.driver_id = ANY(%(ids)s)
+) history
+WHERE date >= %(since)s;
+"""
+
+query_refresh_constructor_standings = """
+DELETE FROM constructor_standings WHERE constructor_id = ANY(%(ids)s) AND date >= %(since)s;
+INSERT INTO constructor_standings (race_id, constructor_id, season, round, date, entries, points, cumulative_points, season_points)
+SELECT * FROM (
+    SELECT
+        race_id,
+        constructor_id,
+        season,
+        round,
+        date::date AS date,
+        entries,
+        points,
+        SUM(points) OVER (PARTITION BY constructor_id ORDER BY date),
+        SUM(points) OVER (PARTITION BY constructor_id, season ORDER BY date)
+    FROM (
+        SELECT res.race_id, res.constructor_id, r.season, r.round, r.date, COUNT(*) AS entries, SUM(res.points) AS points
+        FROM results res
+        INNER JOIN races r ON res.race_id = r.race_id
+        WHERE res.constructor_id = ANY(%(ids)s)
+        GROUP BY res.race_id, res.constructor_id, r.season, r.round, r.date
+    ) race_points
+) history
+WHERE date >= %(since)s;
+"""
+
+query_refresh_driver_totals = """
+DELETE FROM driver_totals WHERE driver_id = ANY(%(ids)s);
+INSERT INTO driver_totals (driver_id, races, total_points, wins, podiums)
+SELECT
+    res.driver_id,
+    COUNT(*),
+    SUM(res.points),
+    COUNT(*) FILTER (WHERE res.position = 1),
+    COUNT(*) FILTER (WHERE res.position <= 3)
+FROM results res
+INNER JOIN races r ON res.race_id = r.race_id
+WHERE res.driver_id = ANY(%(ids)s)
+GROUP BY res.driver_id;
+"""
+
+query_refresh_constructor_totals = """
+DELETE FROM constructor_totals WHERE constructor_id = ANY(%(ids)s);
+INSERT INTO constructor_totals (constructor_id, total_points)
+SELECT res.constructor_id, SUM(res.points)
+FROM results res
+INNER JOIN races r ON res.race_id = r.race_id
+WHERE res.constructor_id = ANY(%(ids)s)
+GROUP BY res.constructor_id;
+"""
+
 
 """
 Select queries
@@ -156,7 +483,7 @@ query_1 = """
 SELECT r.driver , COUNT(*) AS times_chosen
 FROM races r
 GROUP BY r.driver 
-ORDER BY times_chosen DESC ;
+ORDER BY times_chosen DESC, r.driver ;
 """
 
 # Drivers championship
@@ -166,7 +493,7 @@ FROM results res
 INNER JOIN drivers d ON res.driver_id = d.driverid
 INNER JOIN races r ON res.race_id = r.race_id
 GROUP BY d.driverid
-ORDER BY total_points DESC
+ORDER BY total_points DESC, Driver
 LIMIT 10 ;
 """
 
@@ -177,7 +504,7 @@ FROM results res
 INNER JOIN constructors con ON res.constructor_id = con.constructorid
 INNER JOIN races r ON res.race_id = r.race_id
 GROUP BY con.constructorid
-ORDER BY total_points DESC ;
+ORDER BY total_points DESC, con.name ;
 """
 
 # Alonso's results
@@ -209,7 +536,7 @@ INNER JOIN drivers d ON res.driver_id = d.driverid
 INNER JOIN races r ON res.race_id = r.race_id
 WHERE res.status != 'Finished'
 GROUP BY d.driverid
-ORDER BY dnf_count DESC ;
+ORDER BY dnf_count DESC, Driver ;
 """
 
 # Points per race for every driver
@@ -219,7 +546,7 @@ FROM results res
 INNER JOIN drivers d ON res.driver_id = d.driverid
 INNER JOIN races r ON res.race_id = r.race_id
 GROUP BY d.driverid
-ORDER BY avg_points DESC ;
+ORDER BY avg_points DESC, Driver ;
 """
 
 # Number of wins
@@ -230,7 +557,7 @@ INNER JOIN drivers d ON res.driver_id = d.driverid
 INNER JOIN races r ON res.race_id = r.race_id
 WHERE res.position = 1
 GROUP BY d.driverid
-ORDER BY wins DESC ;
+ORDER BY wins DESC, Driver ;
 """
 
 # Number of podiums
@@ -241,7 +568,7 @@ INNER JOIN drivers d ON res.driver_id = d.driverid
 INNER JOIN races r ON res.race_id = r.race_id
 WHERE res.position <= 3
 GROUP BY d.driverid
-ORDER BY wins DESC ;
+ORDER BY wins DESC, Driver ;
 """
 
 # Gained positions in the whole season
@@ -251,7 +578,7 @@ FROM results res
 INNER JOIN drivers d ON res.driver_id = d.driverid
 INNER JOIN races r ON res.race_id = r.race_id
 GROUP BY d.driverid
-ORDER BY total_positions_gained DESC ;
+ORDER BY total_positions_gained DESC, Driver ;
 """
 
 # Distribution of gain/loss
@@ -293,4 +620,154 @@ SELECT
 FROM results res
 INNER JOIN constructors con ON res.constructor_id = con.constructorid
 INNER JOIN races r ON res.race_id = r.race_id
-ORDER BY r.date, Constructor;"""
\ No newline at end of file
+ORDER BY r.date, Constructor;"""
+
+
+"""
+Parameterized select queries
+----------------------------
+Versions of the select queries with bound parameters ($1, $2, ...), prepared once per connection with `sql_query_prepared`.
+"""
+
+# Results of a driver, like query_4 for any driver. $1: driver_id
+query_driver_results = """
+SELECT r.racename AS Name, res.position AS Position
+FROM results res
+INNER JOIN races r ON res.race_id = r.race_id
+WHERE res.driver_id = $1
+ORDER BY r.date ;
+"""
+
+# Positions gained in a race, like query_5 for any race. $1: race_id
+query_race_positions = """
+SELECT 
+	concat(d.first_name, ' ', d.last_name) AS Driver, 
+	res.grid AS GridPosition, 
+	res.position AS EndPosition, 
+	res.delta_pos AS PositionsGained
+FROM results res
+INNER JOIN drivers d ON res.driver_id = d.driverid
+WHERE res.race_id = $1 ;
+"""
+
+# Drivers championship of a season, like query_2. $1: season
+query_season_drivers_championship = """
+SELECT concat(d.first_name, ' ', d.last_name) AS Driver, SUM(res.points) AS total_points
+FROM results res
+INNER JOIN drivers d ON res.driver_id = d.driverid
+INNER JOIN races r ON res.race_id = r.race_id
+WHERE r.season = $1
+GROUP BY d.driverid
+ORDER BY total_points DESC, Driver
+LIMIT 10 ;
+"""
+
+# Constructors championship of a season, like query_3. $1: season
+query_season_constructors_championship = """
+SELECT con.name, SUM(res.points) AS total_points
+FROM results res
+INNER JOIN constructors con ON res.constructor_id = con.constructorid
+INNER JOIN races r ON res.race_id = r.race_id
+WHERE r.season = $1
+GROUP BY con.constructorid
+ORDER BY total_points DESC, con.name ;
+"""
+
+# Drivers championship evolution of a season, like query_13. $1: season
+query_season_drivers_evolution = """
+SELECT r.round , concat(d.first_name, ' ', d.last_name) AS Driver, 
+       SUM(res.points) OVER (PARTITION BY res.driver_id ORDER BY r.date) AS cumulative_points
+FROM results res
+INNER JOIN drivers d ON res.driver_id = d.driverid
+INNER JOIN races r ON res.race_id = r.race_id
+WHERE r.season = $1
+ORDER BY r.date, Driver ;
+"""
+
+# Constructors championship evolution of a season, like query_14. $1: season
+query_season_constructors_evolution = """
+SELECT 
+    r.round, 
+    con.name AS Constructor, 
+    SUM(res.points) OVER (PARTITION BY res.constructor_id ORDER BY r.date) AS cumulative_points
+FROM results res
+INNER JOIN constructors con ON res.constructor_id = con.constructorid
+INNER JOIN races r ON res.race_id = r.race_id
+WHERE r.season = $1
+ORDER BY r.date, Constructor;"""
+
+# Parameterized queries by statement name
+queries_prepared = {
+    'driver_results': query_driver_results,
+    'race_positions': query_race_positions,
+    'season_drivers_championship': query_season_drivers_championship,
+    'season_constructors_championship': query_season_constructors_championship,
+    'season_drivers_evolution': query_season_drivers_evolution,
+    'season_constructors_evolution': query_season_constructors_evolution
+    }
+
+
+"""
+Fast select queries
+-------------------
+Equivalent versions of the select queries reading from the standings tables.
+"""
+
+# Drivers championship
+query_2_fast = """
+SELECT concat(d.first_name, ' ', d.last_name) AS Driver, t.total_points
+FROM driver_totals t
+INNER JOIN drivers d ON t.driver_id = d.driverid
+ORDER BY t.total_points DESC, Driver
+LIMIT 10 ;
+"""
+
+# Constructors championship
+query_3_fast = """
+SELECT con.name, t.total_points
+FROM constructor_totals t
+INNER JOIN constructors con ON t.constructor_id = con.constructorid
+ORDER BY t.total_points DESC, con.name ;
+"""
+
+# Points per race for every driver
+query_7_fast = """
+SELECT concat(d.first_name, ' ', d.last_name) AS Driver, round(t.total_points::numeric / t.races, 2) AS avg_points
+FROM driver_totals t
+INNER JOIN drivers d ON t.driver_id = d.driverid
+ORDER BY avg_points DESC, Driver ;
+"""
+
+# Number of wins
+query_8_fast = """
+SELECT concat(d.first_name, ' ', d.last_name) AS Driver, t.wins
+FROM driver_totals t
+INNER JOIN drivers d ON t.driver_id = d.driverid
+WHERE t.wins > 0
+ORDER BY t.wins DESC, Driver ;
+"""
+
+# Number of podiums
+query_9_fast = """
+SELECT concat(d.first_name, ' ', d.last_name) AS Driver, t.podiums AS wins
+FROM driver_totals t
+INNER JOIN drivers d ON t.driver_id = d.driverid
+WHERE t.podiums > 0
+ORDER BY wins DESC, Driver ;
+"""
+
+# Drivers championship evolution
+query_13_fast = """
+SELECT s.round, concat(d.first_name, ' ', d.last_name) AS Driver, s.cumulative_points
+FROM driver_standings s
+INNER JOIN drivers d ON s.driver_id = d.driverid
+ORDER BY s.date, Driver ;
+"""
+
+# Constructor championship evolution. One row per car, like the original query.
+query_14_fast = """
+SELECT s.round, con.name AS Constructor, s.cumulative_points
+FROM constructor_standings s
+INNER JOIN constructors con ON s.constructor_id = con.constructorid
+CROSS JOIN LATERAL generate_series(1, s.entries)
+ORDER BY s.date, Constructor;"""
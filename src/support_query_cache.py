@@ -0,0 +1,280 @@
+# Query Result Cache
+# -----------------------------------------------------------------------
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+
+
+# Default memory budget for cached results (256 MB)
+MAX_CACHE_MEMORY = 256 * 1024 ** 2
+
+# Tables referenced after these keywords are read or written by a query
+TABLE_PATTERN = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE|TRUNCATE|TABLE(?:\s+IF\s+(?:NOT\s+)?EXISTS)?)\s+([a-zA-Z_][\w.]*)', re.IGNORECASE)
+
+# String literals, kept untouched when normalizing queries
+LITERAL_PATTERN = re.compile(r"('(?:[^']|'')*')")
+
+
+def normalize_sql(query: str):
+    """
+    Normalizes a SQL query so that formatting differences do not produce different cache keys.
+
+    Whitespace outside string literals is collapsed and the trailing semicolon is removed.
+
+    Parameters:
+    - query (str): The SQL query.
+
+    Returns:
+    - (str): The normalized query.
+    """
+    parts = LITERAL_PATTERN.split(query)
+    # Odd parts are the literals
+    parts = [part if i % 2 else re.sub(r'\s+', ' ', part) for i, part in enumerate(parts)]
+    return ''.join(parts).strip().rstrip(';').strip()
+
+
+def tables_in_query(query: str):
+    """
+    Finds the tables read or written by a SQL query.
+
+    Parameters:
+    - query (str): The SQL query.
+
+    Returns:
+    - (set of str): Lowercase names of the tables.
+    """
+    return {table.lower() for table in TABLE_PATTERN.findall(LITERAL_PATTERN.sub("''", query))}
+
+
+class QueryCache:
+    """
+    Cache of query results invalidated by table versions.
+
+    Every table has a version number that is increased whenever it is written. Cached results remember the versions of the tables they read, and are only served while those versions are unchanged. Results are kept in memory up to `max_memory` bytes, evicting the least recently used ones, and optionally also in a folder on disk so they survive between sessions.
+
+    Parameters:
+    - max_memory (int, optional): Memory budget in bytes for the cached results. Defaults to `MAX_CACHE_MEMORY`.
+    - cache_dir (str, optional): Folder for the on-disk tier. Defaults to None, which keeps results in memory only.
+    """
+
+    def __init__(self, max_memory: int = MAX_CACHE_MEMORY, cache_dir: str = None):
+        self.max_memory = max_memory
+        self.cache_dir = cache_dir
+        self.enabled = True
+
+        self._entries = OrderedDict()   # key -> (result, versions, size)
+        self._versions = {}
+        self._versions_mtime = None
+        self._memory = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(query: str, params=None):
+        """
+        Builds the cache key of a query and its parameters.
+        """
+        return hashlib.sha256(f'{normalize_sql(query)}\n{params!r}'.encode()).hexdigest()
+
+    # Table versions
+    # -------------------------------------------------------------------
+
+    def _versions_path(self):
+        return os.path.join(self.cache_dir, 'versions.json')
+
+    def _sync_versions(self):
+        # Pick up writes made by other sessions sharing the disk tier
+        if not self.cache_dir:
+            return
+        try:
+            mtime = os.path.getmtime(self._versions_path())
+        except FileNotFoundError:
+            return
+        if mtime != self._versions_mtime:
+            with open(self._versions_path()) as f:
+                self._versions = json.load(f)
+            self._versions_mtime = mtime
+
+    def _snapshot(self, tables: set):
+        return {table: self._versions.get(table, 0) for table in tables}
+
+    def _is_current(self, versions: dict):
+        return all(self._versions.get(table, 0) == version for table, version in versions.items())
+
+    def invalidate(self, tables):
+        """
+        Marks some tables as written, dropping every cached result that read them.
+
+        Parameters:
+        - tables (iterable of str): Names of the written tables.
+        """
+        tables = {table.lower() for table in tables}
+        if not tables:
+            return
+
+        with self._lock:
+            self._sync_versions()
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+            for key, (_, versions, size) in list(self._entries.items()):
+                if tables & versions.keys():
+                    del self._entries[key]
+                    self._memory -= size
+                    self.invalidations += 1
+
+            if self.cache_dir:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = f'{self._versions_path()}.{threading.get_ident()}.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(self._versions, f)
+                os.replace(tmp_path, self._versions_path())
+                self._versions_mtime = os.path.getmtime(self._versions_path())
+
+    def versions(self, query: str):
+        """
+        Reads the current versions of the tables of a query.
+
+        Read them before running the query and store the result with them (see `put`), so a write made while the query runs makes the stored result stale instead of current.
+
+        Parameters:
+        - query (str): The SQL query.
+
+        Returns:
+        - (dict): Version of every table read by the query.
+        """
+        with self._lock:
+            self._sync_versions()
+            return self._snapshot(tables_in_query(query))
+
+    # Lookups
+    # -------------------------------------------------------------------
+
+    def get(self, query: str, params=None):
+        """
+        Looks up the result of a query.
+
+        Parameters:
+        - query (str): The SQL query.
+        - params (optional): Parameters of the query. Defaults to None.
+
+        Returns:
+        - (tuple): Whether the result was found and the result itself, or `None` if it was not.
+        """
+        key = self.key(query, params)
+
+        with self._lock:
+            self._sync_versions()
+
+            if key in self._entries:
+                result, versions, _ = self._entries[key]
+                if self._is_current(versions):
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return True, result
+
+            if self.cache_dir:
+                try:
+                    with open(os.path.join(self.cache_dir, f'{key}.pkl'), 'rb') as f:
+                        versions, result = pickle.load(f)
+                except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+                    versions = None
+
+                if versions is not None and self._is_current(versions):
+                    self._store(key, result, versions, len(pickle.dumps(result)))
+                    self.disk_hits += 1
+                    return True, result
+
+            self.misses += 1
+            return False, None
+
+    def put(self, query: str, result, params=None, versions: dict = None):
+        """
+        Stores the result of a query.
+
+        Parameters:
+        - query (str): The SQL query.
+        - result: The result of the query. It must be picklable.
+        - params (optional): Parameters of the query. Defaults to None.
+        - versions (dict, optional): Versions of the tables read before running the query, see `versions`. Defaults to None, which reads them now.
+        """
+        key = self.key(query, params)
+        payload = pickle.dumps(result)
+
+        with self._lock:
+            self._sync_versions()
+            if versions is None:
+                versions = self._snapshot(tables_in_query(query))
+
+            # Some table was written while the query ran, the result may already be stale
+            if not self._is_current(versions):
+                return
+
+            self._store(key, result, versions, len(payload))
+
+            if self.cache_dir:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                path = os.path.join(self.cache_dir, f'{key}.pkl')
+                tmp_path = f'{path}.{threading.get_ident()}.tmp'
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump((versions, result), f)
+                os.replace(tmp_path, path)
+
+    def _store(self, key: str, result, versions: dict, size: int):
+        # Results larger than the whole budget are not kept in memory
+        if size > self.max_memory:
+            return
+
+        if key in self._entries:
+            self._memory -= self._entries.pop(key)[2]
+
+        while self._entries and self._memory + size > self.max_memory:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._memory -= evicted_size
+            self.evictions += 1
+
+        self._entries[key] = (result, versions, size)
+        self._memory += size
+
+    def clear(self):
+        """
+        Removes every cached result from memory and disk.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._memory = 0
+
+            if self.cache_dir and os.path.isdir(self.cache_dir):
+                for name in os.listdir(self.cache_dir):
+                    if name.endswith('.pkl'):
+                        os.remove(os.path.join(self.cache_dir, name))
+
+    def stats(self):
+        """
+        Returns usage statistics of the cache.
+
+        Returns:
+        - (dict): Memory and disk hits, misses, hit rate, evictions, invalidations, number of entries and memory used in bytes.
+        """
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'entries': len(self._entries),
+            'memory': self._memory
+        }
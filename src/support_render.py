@@ -0,0 +1,238 @@
+# Batch Figure Rendering
+# -----------------------------------------------------------------------
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+
+# Plotting
+# -----------------------------------------------------------------------
+import fastf1
+import matplotlib
+
+import src.support_pace as support_pace
+import src.support_positions as support_positions
+import src.support_visuals as support_visuals
+from src.support_sessions import get_session
+from src.support_storage import write_atomic
+from src.support_visuals import IMG_DIR, get_figure_path, plot_drivers_pace, plot_position_changes
+
+
+# Plot types rendered for every round, as name -> plotting function.
+# The name is also the prefix of the image file (see `get_figure_path`).
+PLOT_TYPES = {
+    'driver_pace': plot_drivers_pace,
+    'position_changes': plot_position_changes
+}
+
+# Modules whose code draws the figures. Changing any of them makes every image stale.
+PLOT_MODULES = [support_visuals, support_pace, support_positions]
+
+# Default number of worker processes
+MAX_WORKERS = 4
+
+# Record of the rendered images, stored in the images folder
+RENDER_MANIFEST = '_render_manifest.json'
+
+
+def init_worker():
+    # Non interactive backend, workers have no display and must never block on a window
+    matplotlib.use('Agg', force=True)
+
+
+def get_code_hash():
+    """
+    Hashes the source code of the plotting modules.
+
+    Returns:
+    - (str): SHA-256 of the files of `PLOT_MODULES`.
+    """
+    digest = hashlib.sha256()
+    for module in PLOT_MODULES:
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def get_data_key(year: int, rnd: int, plot: str, ev: str = 'R'):
+    # Data the image is drawn from
+    return f'{year}/{rnd}/{ev}/{plot}'
+
+
+def read_render_manifest(img_dir: str = IMG_DIR):
+    """
+    Reads the record of the rendered images.
+
+    Parameters:
+    - img_dir (str, optional): Folder of the images. Defaults to `IMG_DIR`.
+
+    Returns:
+    - (dict): Code hash of every rendered image, keyed by its data key (see `get_data_key`).
+    """
+    try:
+        with open(os.path.join(img_dir, RENDER_MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def write_render_manifest(manifest: dict, img_dir: str = IMG_DIR):
+    """
+    Writes the record of the rendered images atomically.
+
+    Parameters:
+    - manifest (dict): The record, see `read_render_manifest`.
+    - img_dir (str, optional): Folder of the images. Defaults to `IMG_DIR`.
+    """
+    os.makedirs(img_dir, exist_ok=True)
+
+    def dump(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+    write_atomic(os.path.join(img_dir, RENDER_MANIFEST), dump)
+
+
+def is_up_to_date(path: str, data_key: str, manifest: dict, code_hash: str):
+    """
+    Checks whether an image was rendered by the current plotting code.
+
+    Race data does not change once the race is over, so an image only gets stale when the plotting code changes. Images missing from the render manifest, such as the ones committed before it existed, are stale. File dates are not used since a checkout sets them.
+
+    Parameters:
+    - path (str): Path of the image.
+    - data_key (str): Data key of the image, see `get_data_key`.
+    - manifest (dict): The record of the rendered images, see `read_render_manifest`.
+    - code_hash (str): Hash of the current plotting code, see `get_code_hash`.
+
+    Returns:
+    - (bool): Whether the image can be kept.
+    """
+    return os.path.exists(path) and manifest.get(data_key) == code_hash
+
+
+def get_season_rounds(year: int):
+    """
+    Gets the round numbers of a season, without the testing events.
+
+    Parameters:
+    - year (int): The season.
+
+    Returns:
+    - (list of int): The round numbers.
+    """
+    schedule = fastf1.get_event_schedule(year, include_testing=False)
+    return [int(rnd) for rnd in schedule['RoundNumber']]
+
+
+def render_round(year: int, rnd: int, plots: list = None, img_dir: str = IMG_DIR, force: bool = False, manifest: dict = None):
+    """
+    Renders and saves the figures of a race, without showing them.
+
+    Figures that are already up to date are skipped (see `is_up_to_date`), and the session is only loaded if some figure has to be rendered. The session is loaded before the figures, which then share it through `support_sessions`, so their render times do not include the load.
+
+    Parameters:
+    - year (int): The year of the race.
+    - rnd (int): The race round number.
+    - plots (list of str, optional): Plot types to render, keys of `PLOT_TYPES`. Defaults to None, which renders all of them.
+    - img_dir (str, optional): Folder of the images. Defaults to `IMG_DIR`.
+    - force (bool, optional): Whether to render the figures even if they are up to date. Defaults to False.
+    - manifest (dict, optional): The record of the rendered images. Defaults to None, which reads it from `img_dir`. It is not updated, `render_season` does it with the returned records.
+
+    Returns:
+    - (list of dict): One record per figure with its path, data key, code hash, status ('rendered', 'skipped' or 'error'), session load time and render time in seconds and error message.
+    """
+    manifest = read_render_manifest(img_dir) if manifest is None else manifest
+    code_hash = get_code_hash()
+
+    records = []
+    for plot in plots or list(PLOT_TYPES):
+        path = get_figure_path(year, rnd, plot, img_dir)
+        data_key = get_data_key(year, rnd, plot)
+        status = 'skipped' if not force and is_up_to_date(path, data_key, manifest, code_hash) else None
+        records.append({'year': year, 'round': rnd, 'plot': plot, 'path': path, 'data_key': data_key, 'code_hash': code_hash,
+                        'status': status, 'load_seconds': 0.0, 'seconds': 0.0, 'error': None})
+
+    pending = [record for record in records if record['status'] is None]
+    if not pending:
+        return records
+
+    start = time.perf_counter()
+    try:
+        get_session(year, rnd)
+    except Exception as e:
+        print(f"Error loading round {rnd} of {year}: {e}")
+        for record in pending:
+            record['status'] = 'error'
+            record['error'] = str(e)
+        return records
+    pending[0]['load_seconds'] = round(time.perf_counter() - start, 3)
+
+    for record in pending:
+        plot = record['plot']
+        start = time.perf_counter()
+        try:
+            PLOT_TYPES[plot](year, rnd, save_file=True, show=False, img_dir=img_dir)
+            record['status'] = 'rendered'
+        except Exception as e:
+            record['status'] = 'error'
+            record['error'] = str(e)
+            print(f"Error rendering {plot} of round {rnd} of {year}: {e}")
+        record['seconds'] = round(time.perf_counter() - start, 3)
+
+    return records
+
+
+def render_season(year: int, rounds: list = None, plots: list = None, max_workers: int = MAX_WORKERS, img_dir: str = IMG_DIR, force: bool = False):
+    """
+    Renders the figures of a season, or of some of its rounds, in a pool of processes.
+
+    Every worker uses the non interactive 'Agg' backend and renders whole rounds, so each session is loaded by a single process. Figures are closed as soon as they are saved, so memory does not grow with the number of rounds. The rendered images are recorded in the render manifest of `img_dir` with the hash of the plotting code, which decides when they have to be rendered again.
+
+    Parameters:
+    - year (int): The season.
+    - rounds (list of int, optional): Rounds to render. Defaults to None, which renders every round of the season.
+    - plots (list of str, optional): Plot types to render, keys of `PLOT_TYPES`. Defaults to None, which renders all of them.
+    - max_workers (int, optional): Number of worker processes. Defaults to `MAX_WORKERS`.
+    - img_dir (str, optional): Folder of the images. Defaults to `IMG_DIR`.
+    - force (bool, optional): Whether to render the figures even if they are up to date. Defaults to False.
+
+    Returns:
+    - (pd.DataFrame): Report with one row per figure: year, round, plot, path, status, session load time and render time in seconds and error message. The load time of a round is reported in its first rendered figure.
+    """
+    if rounds is None:
+        rounds = get_season_rounds(year)
+
+    unknown = set(plots or []) - set(PLOT_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown plot types {sorted(unknown)}. Available: {list(PLOT_TYPES)}")
+
+    manifest = read_render_manifest(img_dir)
+
+    records = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker) as executor:
+        futures = {executor.submit(render_round, year, rnd, plots, img_dir, force, manifest): rnd for rnd in rounds}
+
+        for future in as_completed(futures):
+            try:
+                records.extend(future.result())
+            except Exception as e:
+                print(f"Error rendering round {futures[future]} of {year}: {e}")
+
+    # Only the parent process writes the manifest
+    rendered = [record for record in records if record['status'] == 'rendered']
+    if rendered:
+        manifest = read_render_manifest(img_dir)
+        manifest.update({record['data_key']: record['code_hash'] for record in rendered})
+        write_render_manifest(manifest, img_dir)
+
+    report = pd.DataFrame(records, columns=['year', 'round', 'plot', 'path', 'status', 'load_seconds', 'seconds', 'error'])
+    report = report.sort_values(['round', 'plot'], ignore_index=True)
+
+    print(f"{(report['status'] == 'rendered').sum()} figures rendered, {(report['status'] == 'skipped').sum()} skipped, "
+          f"{(report['status'] == 'error').sum()} errors in {report['load_seconds'].sum():.1f} s of loading "
+          f"and {report['seconds'].sum():.1f} s of rendering.")
+
+    return report
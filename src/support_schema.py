@@ -0,0 +1,176 @@
+# Typed Schema of the Extracted Data
+# -----------------------------------------------------------------------
+import pandas as pd
+
+
+# Columns of every table as name -> (pandas dtype, SQL definition).
+# A `None` dtype leaves the column as it is, and a `None` definition keeps the column out of the database.
+# Identifiers and repeated labels are categoricals, counters are the smallest integers that fit and missing values use nullable integers.
+SCHEMA = {
+    'circuits': {
+        'columns': {
+            'circuitId': ('category', 'VARCHAR(50) primary key'),
+            'url': (None, 'VARCHAR(200)'),
+            'circuitName': (None, 'VARCHAR(100) not null'),
+            'capacity': ('Int32', 'INT'),
+            'website': (None, 'VARCHAR(200)'),
+            'architect': (None, 'VARCHAR(200)'),
+            'lat': ('float64', 'FLOAT not null'),
+            'long': ('float64', 'FLOAT not null'),
+            'locality': (None, 'VARCHAR(100) not null'),
+            'country': ('category', 'VARCHAR(50) not null')
+        },
+        'constraints': []
+    },
+    'races': {
+        'columns': {
+            'race_id': ('category', 'VARCHAR(50) primary key'),
+            'circuit_id': ('category', 'VARCHAR(50) not null'),
+            'raceName': (None, 'VARCHAR(100) not null'),
+            'season': ('int16', 'INT not null'),
+            'round': ('int8', 'INT not null'),
+            'url': (None, 'VARCHAR(200)'),
+            'date': ('datetime64[ns]', 'DATE not null'),
+            'driver': ('category', 'VARCHAR(100)')
+        },
+        'constraints': ['foreign key (circuit_id) references circuits(circuitId)']
+    },
+    'drivers': {
+        'columns': {
+            'driverId': ('category', 'VARCHAR(50) primary key'),
+            'permanentNumber': ('Int16', 'INT unique not null'),
+            'code': ('category', 'CHAR(3) unique not null'),
+            'url': (None, 'VARCHAR(200)'),
+            'first_name': (None, 'VARCHAR(50) not null'),
+            'last_name': (None, 'VARCHAR(50) not null'),
+            'dateOfBirth': ('datetime64[ns]', 'DATE not null'),
+            'nationality': ('category', 'VARCHAR(50) not null')
+        },
+        'constraints': []
+    },
+    'constructors': {
+        'columns': {
+            'constructorId': ('category', 'VARCHAR(50) primary key'),
+            'url': (None, 'VARCHAR(200)'),
+            'name': (None, 'VARCHAR(50) not null'),
+            'nationality': ('category', 'VARCHAR(50) not null')
+        },
+        'constraints': []
+    },
+    'results': {
+        'columns': {
+            'id': (None, 'SERIAL primary key'),
+            'race_id': ('category', 'VARCHAR(10)'),
+            'position': ('int8', 'INT not null'),
+            'positionText': ('category', 'VARCHAR(5) not null'),
+            # Half points were awarded in some races
+            'points': ('float32', 'NUMERIC(5,2) not null'),
+            'grid': ('int8', 'INT not null'),
+            'laps': ('int16', 'INT not null'),
+            'status': ('category', 'VARCHAR(50) not null'),
+            'driver_id': ('category', 'VARCHAR(50) not null'),
+            'constructor_id': ('category', 'VARCHAR(50) not null'),
+            'delta_pos': ('int8', 'INT not null'),
+            'time': (None, 'VARCHAR(20)'),
+            # Race duration in milliseconds, missing for drivers not classified on the lead lap
+            'time_ms': ('Int32', 'INT')
+        },
+        'constraints': [
+            'foreign key (race_id) references races(race_id)',
+            'foreign key (driver_id) references drivers(driverId)',
+            'foreign key (constructor_id) references constructors(constructorId)'
+        ]
+    },
+    'laps': {
+        'columns': {
+            'race_id': ('category', 'VARCHAR(10) not null'),
+            'driver_code': ('category', 'CHAR(3) not null'),
+            'lap_number': ('int8', 'INT not null'),
+            # Missing for laps without a valid timing, such as the ones under red flag
+            'lap_time_ms': ('Int32', 'INT'),
+            'compound': ('category', 'VARCHAR(20)'),
+            'stint': ('Int8', 'INT'),
+            'position': ('Int8', 'INT')
+        },
+        'constraints': [
+            'primary key (race_id, driver_code, lap_number)',
+            'foreign key (race_id) references races(race_id)'
+        ]
+    },
+    'dotd': {
+        'columns': {
+            'round': ('int8', None),
+            'race': (None, None),
+            'driver': ('category', None),
+            'team': ('category', None),
+            'year': ('int16', None),
+            'race_id': ('category', None)
+        },
+        'constraints': []
+    }
+}
+
+
+def cast_column(series: pd.Series, dtype: str):
+    """
+    Converts a column to a dtype of the schema.
+
+    Values that can't be converted to a date or a nullable integer become missing.
+
+    Parameters:
+    - series (pd.Series): The column.
+    - dtype (str): Target dtype.
+
+    Returns:
+    - (pd.Series): The converted column.
+    """
+    if dtype.startswith('datetime64'):
+        return pd.to_datetime(series, errors='coerce')
+
+    if dtype[0] == 'I':
+        # Nullable integers
+        return pd.to_numeric(series, errors='coerce').astype(dtype)
+
+    if dtype.startswith(('int', 'float')):
+        return pd.to_numeric(series).astype(dtype)
+
+    return series.astype(dtype)
+
+
+def apply_schema(df: pd.DataFrame, table: str):
+    """
+    Converts the columns of a DataFrame to the dtypes of a table of `SCHEMA`.
+
+    Columns missing from the DataFrame or not in the schema are left as they are.
+
+    Parameters:
+    - df (pd.DataFrame): The DataFrame.
+    - table (str): Name of the table in `SCHEMA`.
+
+    Returns:
+    - (pd.DataFrame): A copy of the DataFrame with the schema dtypes.
+    """
+    df = df.copy()
+
+    for column, (dtype, _) in SCHEMA[table]['columns'].items():
+        if dtype is not None and column in df.columns:
+            df[column] = cast_column(df[column], dtype)
+
+    return df
+
+
+def create_table_query(table: str):
+    """
+    Builds the `CREATE TABLE` query of a table of `SCHEMA`.
+
+    Parameters:
+    - table (str): Name of the table.
+
+    Returns:
+    - (str): The query.
+    """
+    definitions = [f'{column} {definition}' for column, (_, definition) in SCHEMA[table]['columns'].items() if definition]
+    definitions += SCHEMA[table]['constraints']
+    body = ',\n    '.join(definitions)
+
+    return f"\nCREATE TABLE IF NOT EXISTS {table} (\n    {body}\n);\n"
@@ -0,0 +1,166 @@
+# FastF1 Session Provider
+# -----------------------------------------------------------------------
+import fastf1
+
+# Caching
+# -----------------------------------------------------------------------
+from collections import OrderedDict
+import os
+import threading
+
+
+# Default location of the FastF1 cache, next to the HTTP cache
+FASTF1_CACHE_DIR = '../cache/fastf1'
+
+# Default number of loaded sessions kept in memory
+MAX_SESSIONS = 8
+
+# Parts of a session that can be loaded, as in `fastf1.core.Session.load`
+SESSION_PARTS = ('laps', 'telemetry', 'weather', 'messages')
+
+
+class SessionProvider:
+    """
+    Shared provider of loaded FastF1 sessions.
+
+    Downloads are kept in a persistent FastF1 cache folder, so a session is only downloaded once, and loaded sessions are kept in memory up to `max_sessions`, evicting the least recently used, so plotting a race several times only loads it once. Sessions are loaded with the parts that are requested only, and loaded again with the missing parts when a later call needs more. Every session has its own lock for the load, so threads loading different sessions do not wait for each other and threads asking for the same one load it once.
+
+    Parameters:
+    - cache_dir (str, optional): Folder of the FastF1 cache. Defaults to `FASTF1_CACHE_DIR`.
+    - max_sessions (int, optional): Maximum number of loaded sessions kept in memory. Defaults to `MAX_SESSIONS`.
+    """
+
+    def __init__(self, cache_dir: str = FASTF1_CACHE_DIR, max_sessions: int = MAX_SESSIONS):
+        self.cache_dir = cache_dir
+        self.max_sessions = max_sessions
+
+        self._sessions = OrderedDict()   # (year, rnd, ev) -> (session, loaded parts)
+        self._load_locks = {}            # (year, rnd, ev) -> lock held while the session loads, dropped with the session
+        self._lock = threading.Lock()    # guards the dicts and counters only, never held during a load
+        self._cache_enabled = False
+
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def _enable_cache(self):
+        # Enable the cache on first use so importing the module does not touch the disk
+        if not self._cache_enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fastf1.Cache.enable_cache(self.cache_dir)
+            self._cache_enabled = True
+
+    def get_session(self, year: int, rnd, ev: str = 'R', laps: bool = True, telemetry: bool = False, weather: bool = False, messages: bool = False):
+        """
+        Returns a loaded FastF1 session with at least the requested parts.
+
+        Parameters:
+        - year (int): The year of the session.
+        - rnd (int | str): The round number or event name.
+        - ev (str, optional): The session identifier, such as 'R' for race. Defaults to 'R'.
+        - laps (bool, optional): Whether to load lap timing data. Defaults to True.
+        - telemetry (bool, optional): Whether to load car telemetry and position data. Defaults to False.
+        - weather (bool, optional): Whether to load weather data. Defaults to False.
+        - messages (bool, optional): Whether to load race control messages. Defaults to False.
+
+        Returns:
+        - (fastf1.core.Session): The loaded session.
+        """
+        requested = {part for part, wanted in zip(SESSION_PARTS, (laps, telemetry, weather, messages)) if wanted}
+        key = (int(year), rnd, ev)
+
+        with self._lock:
+            self._enable_cache()
+
+            session = self._lookup(key, requested)
+            if session is not None:
+                return session
+
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # Another thread may have loaded it while this one waited
+            with self._lock:
+                session = self._lookup(key, requested)
+                if session is not None:
+                    return session
+
+                if key in self._sessions:
+                    requested |= self._sessions[key][1]
+
+            try:
+                session = fastf1.get_session(year, rnd, ev)
+                session.load(**{part: part in requested for part in SESSION_PARTS})
+            except Exception:
+                # Keep no lock for a session that never made it to memory
+                with self._lock:
+                    if key not in self._sessions:
+                        self._load_locks.pop(key, None)
+                raise
+
+            with self._lock:
+                self.loads += 1
+
+                self._sessions[key] = (session, requested)
+                self._sessions.move_to_end(key)
+
+                while len(self._sessions) > self.max_sessions:
+                    evicted, _ = self._sessions.popitem(last=False)
+                    self._load_locks.pop(evicted, None)
+                    self.evictions += 1
+
+            return session
+
+    def _lookup(self, key: tuple, requested: set):
+        # Called with the lock held. Returns the session if it is loaded with the requested parts.
+        if key not in self._sessions:
+            return
+
+        session, loaded = self._sessions[key]
+        self._sessions.move_to_end(key)
+
+        if requested <= loaded:
+            self.hits += 1
+            return session
+
+    def clear(self):
+        """
+        Drops every loaded session from memory. The FastF1 cache on disk is kept.
+        """
+        with self._lock:
+            self._sessions.clear()
+            self._load_locks.clear()
+
+    def stats(self):
+        """
+        Returns usage statistics of the provider.
+
+        Returns:
+        - (dict): Hits, loads, evictions and number of sessions in memory.
+        """
+        return {
+            'hits': self.hits,
+            'loads': self.loads,
+            'evictions': self.evictions,
+            'sessions': len(self._sessions)
+        }
+
+
+# Provider shared by all the plotting functions
+session_provider = SessionProvider()
+
+
+def get_session(year: int, rnd, ev: str = 'R', **parts):
+    """
+    Returns a loaded FastF1 session from the shared `session_provider`.
+
+    Parameters:
+    - year (int): The year of the session.
+    - rnd (int | str): The round number or event name.
+    - ev (str, optional): The session identifier, such as 'R' for race. Defaults to 'R'.
+    - **parts: Parts of the session to load, see `SessionProvider.get_session`.
+
+    Returns:
+    - (fastf1.core.Session): The loaded session.
+    """
+    return session_provider.get_session(year, rnd, ev, **parts)
@@ -0,0 +1,201 @@
+# Parquet Data Lake
+# -----------------------------------------------------------------------
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+# Columnar Storage
+# -----------------------------------------------------------------------
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# Default location of the data lake, next to the CSV files
+LAKE_DIR = '../data/lake'
+
+# Identifier columns, stored with dictionary encoding since their values repeat a lot
+ID_COLUMNS = ['race_id', 'circuit_id', 'driver_id', 'constructor_id', 'circuitId', 'driverId', 'constructorId', 'driver_code']
+
+MANIFEST_FILE = '_manifest.json'
+
+
+def get_seasons(df: pd.DataFrame):
+    """
+    Finds the season of every row of a DataFrame produced by the extraction functions.
+
+    The season is taken from the 'season' column, the 'year' column or the 'race_id' column, in that order.
+
+    Parameters:
+    - df (pd.DataFrame): The DataFrame.
+
+    Returns:
+    - (pd.Series | None): Season of every row, or `None` if the DataFrame has none of those columns.
+    """
+    if 'season' in df.columns:
+        return df['season'].astype(int)
+
+    if 'year' in df.columns:
+        return df['year'].astype(int)
+
+    if 'race_id' in df.columns:
+        return df['race_id'].astype(str).str.split('_').str[0].astype(int)
+
+    return
+
+
+def read_manifest(table: str, root: str = LAKE_DIR):
+    """
+    Reads the manifest of a table of the data lake.
+
+    The manifest lists the season partitions of the table in the order their rows were written, with their file and number of rows.
+
+    Parameters:
+    - table (str): Name of the table.
+    - root (str, optional): Folder of the data lake. Defaults to `LAKE_DIR`.
+
+    Returns:
+    - (dict | None): The manifest, or `None` if the table does not exist.
+    """
+    try:
+        with open(os.path.join(root, table, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return
+
+
+def write_atomic(path: str, write):
+    # Write to a temporary file first so a crash never leaves a truncated file
+    tmp_path = f'{path}.{threading.get_ident()}.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_table(df: pd.DataFrame, table: str, season: int = None, root: str = LAKE_DIR, row_group_size: int = None):
+    """
+    Writes a DataFrame to the data lake, as one Parquet file per season.
+
+    Only the partitions of the seasons present in the DataFrame are replaced, so a season can be rewritten without touching the others. Identifier columns are stored with dictionary encoding.
+
+    Parameters:
+    - df (pd.DataFrame): The DataFrame to write.
+    - table (str): Name of the table, such as 'results' or 'races'.
+    - season (int, optional): Season of every row, for DataFrames without season information such as the circuits, drivers or constructors of a season. Defaults to None, which takes it from the DataFrame (see `get_seasons`).
+    - root (str, optional): Folder of the data lake. Defaults to `LAKE_DIR`.
+    - row_group_size (int, optional): Maximum rows per row group. Smaller groups let filters skip more data. Defaults to None, which uses the pyarrow default.
+
+    Returns:
+    - (dict): The updated manifest of the table.
+    """
+    seasons = pd.Series(season, index=df.index) if season is not None else get_seasons(df)
+    if seasons is None:
+        raise ValueError(f"Can't find the season of the rows of '{table}'. Pass it with the `season` argument.")
+
+    folder = os.path.join(root, table)
+    os.makedirs(folder, exist_ok=True)
+
+    manifest = read_manifest(table, root) or {'table': table, 'partitions': []}
+    partitions = {partition['season']: partition for partition in manifest['partitions']}
+
+    # A default index is not stored, any other index is kept as a column
+    range_index = df.index.equals(pd.RangeIndex(len(df)))
+    id_columns = [column for column in ID_COLUMNS if column in df.columns]
+
+    # Parquet nulls come back as None in text columns, remember the ones that held NaN like the CSV files
+    nan_columns = [column for column in df.columns
+                   if df[column].dtype == object and df[column].isna().any()
+                   and df[column][df[column].isna()].map(lambda value: isinstance(value, float)).all()]
+
+    # Keep the seasons in the order they appear, and the rows in their order within every season
+    for value, df_season in df.groupby(seasons, sort=False):
+        value = int(value)
+        file = f'season={value}/part-0.parquet'
+        path = os.path.join(folder, file)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        arrow_table = pa.Table.from_pandas(df_season, preserve_index=not range_index)
+        write_atomic(path, lambda tmp_path: pq.write_table(arrow_table, tmp_path, use_dictionary=id_columns, row_group_size=row_group_size))
+
+        partitions[value] = {'season': value, 'file': file, 'rows': len(df_season), 'range_index': range_index, 'nan_columns': nan_columns}
+
+    manifest['partitions'] = list(partitions.values())
+
+    def dump(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    write_atomic(os.path.join(folder, MANIFEST_FILE), dump)
+
+    return manifest
+
+
+def write_tables(data: dict, season: int = None, root: str = LAKE_DIR):
+    """
+    Writes several DataFrames to the data lake.
+
+    Parameters:
+    - data (dict): DataFrames keyed by table name.
+    - season (int, optional): Season of the DataFrames without season information. Defaults to None.
+    - root (str, optional): Folder of the data lake. Defaults to `LAKE_DIR`.
+    """
+    for table, df in data.items():
+        write_table(df, table, season=season if get_seasons(df) is None else None, root=root)
+
+
+def read_table(table: str, columns: list = None, seasons: list = None, filters: list = None, categories: bool = False, root: str = LAKE_DIR):
+    """
+    Reads a table of the data lake.
+
+    Partitions of other seasons are skipped without opening them, only the requested columns are read, and the filters are pushed down to the Parquet reader so row groups that can't match are not read.
+
+    Parameters:
+    - table (str): Name of the table.
+    - columns (list of str, optional): Columns to read. Defaults to None, which reads all of them.
+    - seasons (list of int, optional): Seasons to read. Defaults to None, which reads all of them.
+    - filters (list of tuple, optional): Row filters in pyarrow format, such as `[('position', '<=', 3)]`. Defaults to None.
+    - categories (bool, optional): Whether to read the identifier columns as categoricals instead of strings. Defaults to False.
+    - root (str, optional): Folder of the data lake. Defaults to `LAKE_DIR`.
+
+    Returns:
+    - (pd.DataFrame | None): The table, or `None` if it does not exist.
+    """
+    manifest = read_manifest(table, root)
+    if manifest is None:
+        print(f"Table '{table}' not found in {root}")
+        return
+
+    partitions = manifest['partitions']
+    if seasons is not None:
+        seasons = {int(season) for season in seasons}
+        partitions = [partition for partition in partitions if partition['season'] in seasons]
+
+    if not partitions:
+        return pd.DataFrame(columns=columns)
+
+    frames = []
+    for partition in partitions:
+        path = os.path.join(root, table, partition['file'])
+        read_dictionary = [column for column in ID_COLUMNS if column in pq.read_schema(path).names] if categories else None
+        arrow_table = pq.read_table(path, columns=columns, filters=filters, read_dictionary=read_dictionary,
+                                    use_pandas_metadata=True, partitioning=None)
+        df_partition = arrow_table.to_pandas()
+
+        for column in df_partition.columns.intersection(partition['nan_columns']):
+            df_partition[column] = df_partition[column].where(df_partition[column].notna(), np.nan)
+
+        frames.append(df_partition)
+
+    range_index = all(partition['range_index'] for partition in partitions)
+
+    # Categoricals, such as the ones of `support_schema.apply_schema` or the identifiers read as dictionaries
+    category_columns = {column for df_partition in frames for column in df_partition.select_dtypes('category').columns}
+
+    df = pd.concat(frames, ignore_index=range_index)
+
+    # Categories of every partition only hold their own values, in the order they appear, and pd.concat turns
+    # different ones into objects. Build them again over the whole table, sorted like `astype('category')` does.
+    for column in df.columns.intersection(list(category_columns)):
+        df[column] = df[column].astype(object).astype('category')
+
+    return df
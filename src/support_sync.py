@@ -0,0 +1,217 @@
+# Incremental Database Sync
+# -----------------------------------------------------------------------
+import hashlib
+from datetime import date, timedelta
+import pandas as pd
+from tqdm import tqdm
+
+# Project modules
+# -----------------------------------------------------------------------
+from src.support_cache import cached_get
+from src.support_db import refresh_standings, sql_query, upsert_data
+from src.support_extraction import ERGAST_URL, build_df_races_results, fetch_race_results, get_df_circuit, get_df_constructors, get_df_drivers
+from src.support_queries import query_delete_stale_results
+
+
+# Days after a race during which its results may still change because of penalties or appeals
+SETTLE_DAYS = 7
+
+
+def get_season_schedule(year: int, base_url: str = ERGAST_URL):
+    """
+    Fetches the calendar of a Formula 1 season.
+
+    Parameters:
+    - year (int): The season year.
+    - base_url (str, optional): Root URL of the Ergast API. Defaults to `ERGAST_URL`.
+
+    Returns:
+    - (pd.DataFrame | None): DataFrame with columns 'race_id', 'round' and 'date', or `None` if the request fails.
+    """
+    url = f"{base_url}/{str(year)}.json?limit=100"
+    response = cached_get(url, timeout=10)
+
+    if response.status_code == 200:
+        races = response.json()['MRData']['RaceTable']['Races']
+        df = pd.DataFrame(races)[['season', 'round', 'date']]
+        df['race_id'] = df['season'] + '_' + df['round']
+        df['round'] = df['round'].astype(int)
+        df['date'] = pd.to_datetime(df['date']).dt.date
+        return df[['race_id', 'round', 'date']]
+
+    else:
+        print(f"Error: {response.status_code}")
+        return
+
+
+def get_load_log():
+    """
+    Retrieves the races already loaded in the database.
+
+    Returns:
+    - (dict): Dictionary keyed by race_id with the race date, content hash and load timestamp of every loaded race.
+    """
+    result = sql_query("SELECT race_id, race_date, content_hash, loaded_at FROM load_log;", use_cache=False) or []
+    return {race_id: {'race_date': race_date, 'content_hash': content_hash, 'loaded_at': loaded_at}
+            for race_id, race_date, content_hash, loaded_at in result}
+
+
+def get_pending_races(df_schedule: pd.DataFrame, load_log: dict, today: date = None):
+    """
+    Selects the races of a calendar that have to be fetched.
+
+    A race is pending when it has already been held and it is either not loaded yet, or it was loaded less than `SETTLE_DAYS` days after being held, so its results may have changed since.
+
+    Parameters:
+    - df_schedule (pd.DataFrame): Season calendar as returned by `get_season_schedule`.
+    - load_log (dict): Loaded races as returned by `get_load_log`.
+    - today (date, optional): Reference date. Defaults to the current date.
+
+    Returns:
+    - (pd.DataFrame): The rows of the calendar that have to be fetched.
+    """
+    today = today or date.today()
+
+    def is_pending(race):
+        if race['date'] > today:
+            return False
+
+        loaded = load_log.get(race['race_id'])
+        if loaded is None:
+            return True
+
+        return loaded['loaded_at'].date() < race['date'] + timedelta(days=SETTLE_DAYS)
+
+    return df_schedule[df_schedule.apply(is_pending, axis=1)]
+
+
+def hash_race(df_result: pd.DataFrame, df_race: pd.Series):
+    """
+    Computes a hash of the content of a race, used to detect changes between loads.
+
+    Parameters:
+    - df_result (pd.DataFrame): Results of the race.
+    - df_race (pd.Series): Metadata of the race.
+
+    Returns:
+    - (str): Hexadecimal SHA-256 digest.
+    """
+    content = df_result.to_json(orient='values') + df_race.to_json()
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_existing_ids():
+    """
+    Retrieves the identifiers of the circuits, drivers and constructors already in the database.
+
+    Returns:
+    - (dict): Sets of identifiers keyed by table name.
+    """
+    queries = {
+        'circuits': "SELECT circuitid FROM circuits;",
+        'drivers': "SELECT driverid FROM drivers;",
+        'constructors': "SELECT constructorid FROM constructors;"
+    }
+    return {table: {row[0] for row in sql_query(query, use_cache=False) or []} for table, query in queries.items()}
+
+
+def sync_season(year: int, df_dotd: pd.DataFrame = None, refresh_entities: bool = False, base_url: str = ERGAST_URL):
+    """
+    Brings the database up to date with a Formula 1 season, fetching and writing only what is new or changed.
+
+    Only pending races (see `get_pending_races`) are fetched, skipping the ones whose content did not change since the last load. Circuits, drivers and constructors are only fetched when the new races reference some that are not in the database yet. Everything is written with upserts in a single transaction, so a weekly refresh after a race touches that race only, and then the standings tables are refreshed for the drivers and constructors of the written races.
+
+    Parameters:
+    - year (int): The season year.
+    - df_dotd (pd.DataFrame, optional): Driver of the day data as returned by `get_df_dotd`, used to fill the 'driver' column of races. Defaults to None.
+    - refresh_entities (bool, optional): Whether to also fetch every circuit, driver and constructor of the season to pick up changes in them. Defaults to False.
+    - base_url (str, optional): Root URL of the Ergast API. Defaults to `ERGAST_URL`.
+
+    Returns:
+    - (dict | None): Number of rows written per table, or `None` if nothing was written.
+    """
+    df_schedule = get_season_schedule(year, base_url=base_url)
+    if df_schedule is None:
+        return
+
+    load_log = get_load_log()
+    df_pending = get_pending_races(df_schedule, load_log)
+    race_dates = dict(zip(df_schedule['race_id'], df_schedule['date']))
+
+    results_list = []
+    races_list = []
+    hashes = []
+    statements = []
+
+    for rnd in tqdm(df_pending['round']):
+        race = fetch_race_results(year, rnd, base_url=base_url, use_cache=False)
+        if race is None:
+            continue
+
+        df_result, df_race = race
+        race_id = df_race['race_id']
+        content_hash = hash_race(df_result, df_race)
+
+        hashes.append((race_id, race_dates[race_id], content_hash))
+
+        if race_id in load_log:
+            # Unchanged since the last load
+            if load_log[race_id]['content_hash'] == content_hash:
+                continue
+
+            # Remove results of drivers no longer classified in the reloaded race
+            statements.append((query_delete_stale_results, (race_id, list(df_result['driver_id']))))
+
+        results_list.append(df_result)
+        races_list.append(df_race)
+
+    data = {}
+
+    if results_list:
+        df_results, df_races = build_df_races_results(results_list, races_list)
+
+        # Add driver of the day when available
+        if df_dotd is not None:
+            df_races = df_races.merge(df_dotd[['driver', 'race_id']], on='race_id', how='left')
+        else:
+            df_races['driver'] = None
+
+        # Fetch only the entities that are missing
+        existing = get_existing_ids()
+        missing_circuits = set(df_races['circuit_id']) - existing['circuits']
+        missing_drivers = set(df_results['driver_id']) - existing['drivers']
+        missing_constructors = set(df_results['constructor_id']) - existing['constructors']
+
+        if missing_circuits or refresh_entities:
+            df_circuits = get_df_circuit(year, circuit_ids=None if refresh_entities else list(missing_circuits))
+            if df_circuits is not None:
+                data['circuits'] = df_circuits
+
+        data['races'] = df_races
+
+        if missing_drivers or refresh_entities:
+            df_drivers = get_df_drivers(year)
+            if df_drivers is not None:
+                data['drivers'] = df_drivers if refresh_entities else df_drivers[df_drivers['driverId'].isin(missing_drivers)]
+
+        if missing_constructors or refresh_entities:
+            df_constructors = get_df_constructors(year)
+            if df_constructors is not None:
+                data['constructors'] = df_constructors if refresh_entities else df_constructors[df_constructors['constructorId'].isin(missing_constructors)]
+
+        data['results'] = df_results
+
+    if hashes:
+        data['load_log'] = hashes
+
+    if not data:
+        print(f"Season {year} is up to date.")
+        return
+
+    written = upsert_data(data, statements=statements)
+
+    # Keep the standings tables in step with the new results
+    if written and results_list:
+        refresh_standings([df_race['race_id'] for df_race in races_list])
+
+    return written
@@ -9,26 +9,124 @@ import fastf1.plotting
 # -----------------------------------------------------------------------
 import os
 
+# Shared session provider
+# -----------------------------------------------------------------------
+from src.support_sessions import get_session
+
+# Lap time aggregates
+# -----------------------------------------------------------------------
+from src.support_pace import ALL_COMPOUNDS, draw_pace_summary, get_pace_comparison, get_pace_summary
+
+# Race position matrix
+# -----------------------------------------------------------------------
+from src.support_positions import get_position_matrix
+
+
+# Default folder of the generated images, relative to the notebooks folder
+IMG_DIR = '../imgs'
+
+
+def get_figure_path(year, rnd, plot: str, img_dir: str = IMG_DIR):
+    """
+    Builds the path where a figure of a race is saved.
+
+    Parameters:
+    - year (int): The year of the race.
+    - rnd (int): The race round number.
+    - plot (str): Name of the plot, such as 'driver_pace' or 'position_changes'.
+    - img_dir (str, optional): Folder of the images. Defaults to `IMG_DIR`.
+
+    Returns:
+    - (str): The path of the image.
+    """
+    return os.path.join(img_dir, str(year), str(rnd), f'{plot}_{rnd}_{year}.png')
+
 
-def plot_drivers_pace(year, rnd, ev='R', save_file=False, number_of_drivers = 10):
+def save_figure(fig, path: str):
+    """
+    Saves a figure, creating its folder if needed.
+
+    Parameters:
+    - fig (matplotlib.figure.Figure): The figure.
+    - path (str): Path of the image.
+    """
+    folder = os.path.dirname(path)
+
+    # Create folder if does not exists
+    if not os.path.exists(folder):
+        os.makedirs(folder, exist_ok=True)
+
+    # Save file
+    fig.savefig(path)
+
+    print(f"Image saved in {path}")
+
+
+def finish_figure(fig, path: str = None, show: bool = True):
+    """
+    Saves a figure if a path is given, then shows it if requested and closes it so it does not stay in memory.
+
+    The figure is saved before being shown because some backends clear it when it is shown.
+
+    Parameters:
+    - fig (matplotlib.figure.Figure): The figure.
+    - path (str, optional): Path of the image. Defaults to None, which does not save it.
+    - show (bool, optional): Whether to show the figure. Defaults to True.
+    """
+    if path:
+        save_figure(fig, path)
+
+    if show:
+        plt.show()
+
+    plt.close(fig)
+
+
+def plot_drivers_pace(year, rnd, ev='R', save_file=False, number_of_drivers = 10, show=True, img_dir=IMG_DIR, fast=False, swarm_points=30):
     """
     Plots the lap time distribution of the top drivers in a race using violin and swarm plots.
 
+    The fast mode draws the violins from the lap time aggregates of the session (see `support_pace`), which are computed once per session, and only a sample of the laps instead of a full swarm plot.
+
     Parameters:
     - year (int): The year of the race.
     - rnd (int): The race round number.
     - ev (str, optional): The event type, such as 'R' for race. Defaults to 'R'.
     - save_file (bool, optional): Whether to save the plot as an image file. Defaults to False.
     - number_of_drivers (int, optional): Number of top drivers to include in the plot. Defaults to 10.
+    - show (bool, optional): Whether to show the plot. Defaults to True.
+    - img_dir (str, optional): Folder of the images. Defaults to `IMG_DIR`.
+    - fast (bool, optional): Whether to use the fast mode. Defaults to False.
+    - swarm_points (int, optional): Maximum laps drawn per driver in the fast mode. Defaults to 30.
+
+    Returns:
+    - (str | None): Path of the saved image, or `None` if it was not saved.
     """
 
     # Load FastF1's dark color scheme
     fastf1.plotting.setup_mpl(mpl_timedelta_support=False, misc_mpl_mods=False,
                             color_scheme='fastf1')
 
-    # Load data session
-    race = fastf1.get_session(year, rnd, ev)
-    race.load()
+    if fast:
+        summary = get_pace_summary(year, rnd, ev)
+
+        fig, ax = plt.subplots(figsize=(10, 5))
+        draw_pace_summary(summary, ax, summary['drivers'][:number_of_drivers], swarm_points)
+
+        ax.set_xlabel("Driver")
+        ax.set_ylabel("Lap Time (s)")
+        fig.suptitle(f"{year} {summary['event']} Lap Time Distributions")
+        sns.despine(ax=ax, left=True, bottom=True)
+
+        fig.tight_layout()
+
+        path = get_figure_path(year, rnd, 'driver_pace', img_dir) if save_file else None
+        finish_figure(fig, path, show)
+
+        return path
+
+    # Load data session, laps are the only data needed
+    race = get_session(year, rnd, ev)
 
     title = race.event.loc['EventName']
 
@@ -48,6 +146,7 @@ def plot_drivers_pace(year, rnd, ev='R', save_file=False, number_of_drivers = 10
     driver_laps["LapTime(s)"] = driver_laps["LapTime"].dt.total_seconds()
 
     sns.violinplot(data=driver_laps,
+                ax=ax,
                 x="Driver",
                 y="LapTime(s)",
                 hue="Driver",
@@ -58,6 +157,7 @@ def plot_drivers_pace(year, rnd, ev='R', save_file=False, number_of_drivers = 10
                 )
 
     sns.swarmplot(data=driver_laps,
+                ax=ax,
                 x="Driver",
                 y="LapTime(s)",
                 order=finishing_order,
@@ -70,28 +170,18 @@ def plot_drivers_pace(year, rnd, ev='R', save_file=False, number_of_drivers = 10
 
     ax.set_xlabel("Driver")
     ax.set_ylabel("Lap Time (s)")
-    plt.suptitle(f"{year} {title} Lap Time Distributions")
-    sns.despine(left=True, bottom=True)
-
-    plt.tight_layout()
-    plt.show()
-
-    if save_file:
-        folder = f'../imgs/{str(year)}/{str(rnd)}'
+    fig.suptitle(f"{year} {title} Lap Time Distributions")
+    sns.despine(ax=ax, left=True, bottom=True)
 
-        # Create folder if does not exists
-        if not os.path.exists(folder):
-            os.makedirs(folder)
+    fig.tight_layout()
 
-        # Save file
-        name_file = f'driver_pace_{rnd}_{year}.png'
-        complete_path = os.path.join(folder, name_file)
-        plt.savefig(complete_path)
+    path = get_figure_path(year, rnd, 'driver_pace', img_dir) if save_file else None
+    finish_figure(fig, path, show)
 
-        print(f"Image saved in {complete_path}")
+    return path
 
 
-def plot_position_changes(year, rnd, ev='R', save_file=False):
+def plot_position_changes(year, rnd, ev='R', save_file=False, show=True, img_dir=IMG_DIR):
     """
     Plots the position changes of drivers throughout a race.
 
@@ -100,34 +190,32 @@ def plot_position_changes(year, rnd, ev='R', save_file=False):
     - rnd (int): The race round number.
     - ev (str, optional): The event type, such as 'R' for race. Defaults to 'R'.
     - save_file (bool, optional): Whether to save the plot as an image file. Defaults to False.
+    - show (bool, optional): Whether to show the plot. Defaults to True.
+    - img_dir (str, optional): Folder of the images. Defaults to `IMG_DIR`.
+
+    Returns:
+    - (str | None): Path of the saved image, or `None` if it was not saved.
     """
 
     # Load FastF1's dark color scheme
     fastf1.plotting.setup_mpl(mpl_timedelta_support=False, misc_mpl_mods=False,
                             color_scheme='fastf1')
 
-    session = fastf1.get_session(year, rnd, ev)
-    session.load(telemetry=False, weather=False)
+    session = get_session(year, rnd, ev)
+    matrix = get_position_matrix(year, rnd, ev)
 
     title = session.event.loc['EventName']
 
     fig, ax = plt.subplots(figsize=(8.0, 4.9))
 
-    for drv in session.drivers:
-        drv_laps = session.laps.pick_drivers([drv])
-
-        try:
-            abb = drv_laps['Driver'].iloc[0]
-            style = fastf1.plotting.get_driver_style(identifier=abb,
-                                                    style=['color', 'linestyle'],
-                                                    session=session)
-
-            ax.plot(drv_laps['LapNumber'], drv_laps['Position'],
-                    label=abb, **style)
-            
-        except IndexError:
-            print('Driver not found. Probably DNS')
-        
+    # Retired laps are NaN, so the lines end at the last lap completed
+    for abb, positions in zip(matrix['drivers'], matrix['positions']):
+        style = fastf1.plotting.get_driver_style(identifier=abb,
+                                                style=['color', 'linestyle'],
+                                                session=session)
+
+        ax.plot(matrix['laps'], positions, label=abb, **style)
+
     ax.set_ylim([20.5, 0.5])
     ax.set_yticks([1, 5, 10, 15, 20])
     ax.set_xlabel('Lap')
@@ -135,18 +223,61 @@ def plot_position_changes(year, rnd, ev='R', save_file=False):
     ax.set_title(f'Position changes | {title}')
 
     ax.legend(bbox_to_anchor=(1.0, 1.02))
-    plt.tight_layout()
+    fig.tight_layout()
+
+    path = get_figure_path(year, rnd, 'position_changes', img_dir) if save_file else None
+    finish_figure(fig, path, show)
 
-    if save_file:
-        folder = f'../imgs/{str(year)}/{str(rnd)}'
+    return path
 
-        # Create folder if does not exists
-        if not os.path.exists(folder):
-            os.makedirs(folder)
 
-        # Save file
-        name_file = f'position_changes_{rnd}_{year}.png'
-        complete_path = os.path.join(folder, name_file)
-        plt.savefig(complete_path)
+def plot_pace_comparison(year, rounds, drivers, compound=ALL_COMPOUNDS, ev='R', save_file=False, show=True, img_dir=IMG_DIR):
+    """
+    Plots the median lap time and its interquartile range of some drivers across several races.
+
+    Only the aggregates of `support_pace` are used, so after the first call for a race the plot is drawn without loading it again.
+
+    Parameters:
+    - year (int): The season.
+    - rounds (list of int): The round numbers.
+    - drivers (list of str): Abbreviations of the drivers.
+    - compound (str, optional): Compound to compare. Defaults to `ALL_COMPOUNDS`.
+    - ev (str, optional): The event type, such as 'R' for race. Defaults to 'R'.
+    - save_file (bool, optional): Whether to save the plot as an image file. Defaults to False.
+    - show (bool, optional): Whether to show the plot. Defaults to True.
+    - img_dir (str, optional): Folder of the images. Defaults to `IMG_DIR`.
+
+    Returns:
+    - (pd.DataFrame): The plotted aggregates, see `get_pace_comparison`.
+    """
+    df = get_pace_comparison(year, rounds, drivers, compound, ev)
+
+    # Lap times of different circuits are not comparable, so plot the gap to the fastest median of the drivers in every race
+    df['gap'] = df['q50'] - df.groupby('round')['q50'].transform('min')
+    df['gap_q25'] = df['q25'] - df['q50'] + df['gap']
+    df['gap_q75'] = df['q75'] - df['q50'] + df['gap']
+
+    colors = {}
+    for rnd in rounds:
+        colors.update(get_pace_summary(year, rnd, ev)['driver_colors'])
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    x = {rnd: i for i, rnd in enumerate(rounds)}
+
+    for driver, df_driver in df.groupby('Driver', sort=False):
+        positions = df_driver['round'].map(x)
+        ax.plot(positions, df_driver['gap'], marker='o', label=driver, color=colors.get(driver))
+        ax.fill_between(positions, df_driver['gap_q25'], df_driver['gap_q75'], color=colors.get(driver), alpha=0.2)
+
+    ax.set_xticks(range(len(rounds)), [str(rnd) for rnd in rounds])
+    ax.set_xlabel("Round")
+    ax.set_ylabel("Gap to the fastest median lap time (s)")
+    ax.set_title(f"{year} Race Pace Comparison")
+    ax.legend(bbox_to_anchor=(1.0, 1.02))
+    fig.tight_layout()
+
+    # Several rounds, so the image goes in the folder of the season
+    path = os.path.join(img_dir, str(year), f'pace_comparison_{rounds[0]}-{rounds[-1]}_{year}.png') if save_file else None
+    finish_figure(fig, path, show)
 
-        print(f"Image saved in {complete_path}")
\ No newline at end of file
+    return df
@@ -0,0 +1,198 @@
+"""
+Extraction tests
+----------------
+
+Serves canned Ergast and Wikipedia pages from a local `http.server` and checks
+that the sequential, concurrent and bulk results extraction build the same
+frames, and that the circuits can be enriched again offline from a populated
+response cache.
+
+The pages are in `tests/fixtures`: one season with two rounds held and a third
+one without results yet, its circuits and their Wikipedia pages. Requests to the local server are not rate limited (see
+`support_http.DEFAULT_RATE_LIMITS`), so the tests run in a few seconds.
+
+Usage:
+    python -m pytest tests
+"""
+
+# Path configuration for custom module imports
+# -----------------------------------------------------------------------
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import pandas as pd
+import pytest
+
+import src.support_cache as support_cache
+import src.support_extraction as support_extraction
+from src.support_cache import ResponseCache
+from src.support_extraction import build_df_races_results, get_df_races_results, get_df_races_results_bulk, get_df_races_results_concurrent, fetch_race_results, transform_df_circuits, transform_race_content
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+YEAR = 2023
+
+# Results per page of the bulk endpoint, smaller than a race so races are split between pages
+PAGE_LIMIT = 3
+
+
+def get_bulk_page(year: int, limit: int, offset: int):
+    """
+    Builds a page of the bulk `/{year}/results.json` endpoint from the results of every round, cut by number of results like Ergast does.
+    """
+    with open(os.path.join(FIXTURES_DIR, 'ergast', f'{year}.json')) as f:
+        rounds = len(json.load(f)['MRData']['RaceTable']['Races'])
+
+    rows = []
+    for rnd in range(1, rounds + 1):
+        with open(os.path.join(FIXTURES_DIR, 'ergast', str(year), str(rnd), 'results.json')) as f:
+            races = json.load(f)['MRData']['RaceTable']['Races']
+        rows += [(race, result) for race in races for result in race.pop('Results')]
+
+    races = []
+    for race, result in rows[offset:offset + limit]:
+        if not races or races[-1]['round'] != race['round']:
+            races.append({**race, 'Results': []})
+        races[-1]['Results'].append(result)
+
+    return {'MRData': {'limit': str(limit), 'offset': str(offset), 'total': str(len(rows)), 'RaceTable': {'season': str(year), 'Races': races}}}
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """
+    Serves `/api/f1/...` from `fixtures/ergast` and `/wiki/...` from `fixtures/wikipedia`. The bulk season results are paginated from the results of every round.
+    """
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        year = parts.path[len('/api/f1/'):-len('/results.json')]
+
+        if parts.path.startswith('/api/f1/') and parts.path.endswith('/results.json') and year.isdigit():
+            query = parse_qs(parts.query)
+            page = get_bulk_page(int(year), int(query['limit'][0]), int(query['offset'][0]))
+            body = json.dumps(page).encode()
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        super().do_GET()
+
+    def translate_path(self, path):
+        path = path.split('?')[0]
+
+        if path.startswith('/api/f1/'):
+            return os.path.join(FIXTURES_DIR, 'ergast', path[len('/api/f1/'):])
+        if path.startswith('/wiki/'):
+            return os.path.join(FIXTURES_DIR, 'wikipedia', path[len('/wiki/'):] + '.html')
+        return os.path.join(FIXTURES_DIR, 'missing')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+
+    yield f'http://127.0.0.1:{srv.server_address[1]}'
+
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture(autouse=True)
+def http_cache(tmp_path, monkeypatch):
+    # Every request has to reach the server, and nothing is written to the cache of the notebooks
+    cache = ResponseCache(str(tmp_path / 'http'))
+    cache.enabled = False
+    monkeypatch.setattr(support_cache, 'http_cache', cache)
+    return cache
+
+
+def assert_frames_equal(expected, got):
+    for df_expected, df_got in zip(expected, got):
+        pd.testing.assert_frame_equal(df_expected, df_got)
+
+
+def test_concurrent_matches_sequential(server):
+    base_url = f'{server}/api/f1'
+
+    sequential = get_df_races_results(YEAR, base_url=base_url)
+    concurrent = get_df_races_results_concurrent(YEAR, max_workers=4, base_url=base_url)
+
+    # The third round has no results yet and is left out
+    assert len(sequential[0]) == 8
+    assert list(sequential[1]['race_id']) == ['2023_1', '2023_2']
+    assert_frames_equal(sequential, concurrent)
+
+
+def test_round_without_results(server):
+    assert fetch_race_results(YEAR, 3, base_url=f'{server}/api/f1') is None
+
+
+def test_bulk_matches_sequential(server):
+    base_url = f'{server}/api/f1'
+
+    sequential = get_df_races_results(YEAR, base_url=base_url)
+    bulk = get_df_races_results_bulk(YEAR, limit=PAGE_LIMIT, base_url=base_url)
+
+    assert_frames_equal(sequential, bulk)
+
+
+def test_circuits_offline_from_cache(server, tmp_path, monkeypatch):
+    with open(os.path.join(FIXTURES_DIR, 'ergast', str(YEAR), 'circuits.json')) as f:
+        df = pd.DataFrame(json.load(f)['MRData']['CircuitTable']['Circuits'])
+    df['url'] = df['url'].str.replace('http://en.wikipedia.org', server, regex=False)
+
+    # Resolved pages are also kept in memory, which would hide the response cache
+    monkeypatch.setattr(support_extraction, 'circuit_info_cache', {})
+
+    fixtures = ResponseCache(str(tmp_path / 'wikipedia'))
+    online = transform_df_circuits(df.copy(), cache=fixtures)
+
+    assert list(online['capacity']) == [10000, 60000]
+    assert list(online['architect']) == ['Hermann Tilke', 'Carsten Tilke']
+    assert fixtures.stats()['stores'] == 2
+
+    support_extraction.circuit_info_cache.clear()
+    offline = transform_df_circuits(df.copy(), cache=fixtures, offline=True)
+
+    pd.testing.assert_frame_equal(online, offline)
+    assert fixtures.stats()['hits'] == 2
+
+    # Pages missing from the cache are not requested
+    support_extraction.circuit_info_cache.clear()
+    missing = transform_df_circuits(df.copy(), cache=ResponseCache(str(tmp_path / 'empty')), offline=True)
+
+    assert missing['capacity'].isna().all()
+
+
+def test_shared_drives_are_merged():
+    with open(os.path.join(FIXTURES_DIR, 'ergast', str(YEAR), '1', 'results.json')) as f:
+        content = json.load(f)
+
+    # The winner also finishes fourth in a shared car
+    results = content['MRData']['RaceTable']['Races'][0]['Results']
+    shared = {**results[0], 'position': '4', 'positionText': '4', 'points': '1.5', 'grid': '7'}
+    results[3] = {**results[3], 'position': '5', 'positionText': '5'}
+    results.insert(3, shared)
+
+    df_result, df_race = transform_race_content(content, f'{YEAR}_1')
+    df_results, _ = build_df_races_results([df_result], [df_race])
+
+    assert not df_results.duplicated(['race_id', 'driver_id']).any()
+    assert list(df_results['position']) == [1, 2, 3, 5]
+
+    winner = df_results[df_results['driver_id'] == 'max_verstappen'].iloc[0]
+    assert (winner['grid'], winner['points']) == (1, 26.5)
@@ -0,0 +1,55 @@
+"""
+Data lake tests
+---------------
+
+Writes frames typed with `support_schema.apply_schema` to a temporary data lake
+and checks that `read_table` gives them back unchanged.
+
+Usage:
+    python -m pytest tests
+"""
+
+# Path configuration for custom module imports
+# -----------------------------------------------------------------------
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pandas as pd
+
+from src.support_schema import apply_schema
+from src.support_storage import read_table, write_table
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+def get_results(seasons: list):
+    """
+    Replicates the 2023 results over several seasons, with a status only found in the first one, and types them with the schema.
+    """
+    df_2023 = pd.read_csv(os.path.join(DATA_DIR, 'results.csv'))
+
+    frames = []
+    for season in seasons:
+        df = df_2023.copy()
+        df['race_id'] = df['race_id'].str.replace('2023_', f'{season}_')
+        frames.append(df)
+
+    frames[0].loc[:4, 'status'] = 'Spun off'
+
+    return apply_schema(pd.concat(frames, ignore_index=True), 'results')
+
+
+def test_schema_frame_round_trip(tmp_path):
+    df = get_results([2021, 2022, 2023])
+    write_table(df, 'results', root=str(tmp_path))
+
+    pd.testing.assert_frame_equal(read_table('results', root=str(tmp_path)), df)
+
+
+def test_schema_frame_round_trip_one_season(tmp_path):
+    df = get_results([2023])
+    write_table(df, 'results', root=str(tmp_path))
+
+    pd.testing.assert_frame_equal(read_table('results', root=str(tmp_path)), df)